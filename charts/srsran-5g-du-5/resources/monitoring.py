@@ -6,8 +6,16 @@ import argparse
 import re
 import struct
 import glob
+import stat
 import sys # For exit
-from collections import defaultdict
+import threading
+import queue
+import socket
+import shutil
+import subprocess
+import tempfile
+import json
+from collections import defaultdict, deque
 from datetime import datetime, timezone
 
 # --- MSR Addresses ---
@@ -17,15 +25,118 @@ MSR_IA32_APERF = 0xE8
 MSR_IA32_THERM_STATUS = 0x19C
 MSR_IA32_PACKAGE_THERM_STATUS = 0x1B1
 MSR_IA32_TEMPERATURE_TARGET = 0x1A2
+MSR_PLATFORM_INFO = 0xCE
+MSR_TURBO_RATIO_LIMIT = 0x1AD
+MSR_TURBO_RATIO_LIMIT_CORES = 0x1AE # Core counts per bucket on SKX+, TURBO_RATIO_LIMIT1 on older parts
+MSR_SMI_COUNT = 0x34 # Bits 31:0 count SMIs since reset
 # Fixed-Function Performance Counters
 MSR_IA32_FIXED_CTR0 = 0x309 # Instructions Retired
 # Performance Counter Control MSRs
 MSR_IA32_FIXED_CTR_CTRL = 0x38D
 MSR_IA32_PERF_GLOBAL_CTRL = 0x38F
+MSR_IA32_PQR_ASSOC = 0xC8F # Bits 63:32 hold the CLOS used by SST-CP
+# Uncore (package scope)
+MSR_UNCORE_RATIO_LIMIT = 0x620
+MSR_UNCORE_PERF_STATUS = 0x621
+# Package C-state residency (package scope, counts at TSC rate)
+MSR_PKG_C2_RESIDENCY = 0x60D
+MSR_PKG_C6_RESIDENCY = 0x3F9
 
 # --- Constants ---
 MAX_CPUIDLE_STATES = 10
 PSTATE_BASE_PATH = "/sys/devices/system/cpu/intel_pstate"
+UNCORE_BASE_PATH = "/sys/devices/system/cpu/intel_uncore_frequency"
+UNCORE_RATIO_MASK = 0x7F # Ratio fields in 0x620/0x621 are 7 bits wide
+BCLK_MHZ = 100 # Bus clock used to convert ratios to MHz
+CPUID_LEAF_TSC = 0x15 # TSC/crystal clock ratio
+CPUID_LEAF_FREQ = 0x16 # Base/max/bus frequency in MHz
+ACTIVE_CORE_BUSY_PCT = 50.0 # A physical core counts as active for turbo bins above this Busy%
+DEFAULT_GNB_CONFIGS = ['/gnb.yml', '/gnb-template.yml'] # First existing one is used when --gnb-config is not given
+GNB_AFFINITY_ROLES = ('low_priority_cpus', 'ru_timing_cpu', 'ru_txrx_cpus', 'l1_dl_cpus',
+                      'l1_ul_cpus', 'l2_cell_cpus', 'ru_cpus')
+GNB_DPDK_ROLE = 'eal_lcores' # CPUs of the DPDK lcores from hal.eal_args
+GNB_NON_RT_ROLES = {'low_priority_cpus'}
+SST_CP_HIGH_PRIO_CLOS = 0 # SST-CP ordered priority: CLOS 0 is the highest
+SST_TOOL = "intel-speed-select" # Looked up in PATH; reports the core-power (SST-CP) enable state
+RESCTRL_PATH = "/sys/fs/resctrl" # RDT also programs IA32_PQR_ASSOC CLOS
+RECOMMEND_HOUSEKEEPING_PCT = 20.0 # CPUs with more non-srsRAN load than this are left to the OS
+RECOMMEND_SIBLING_WEIGHT = 0.5 # Penalty per Busy% of load predicted on SMT siblings
+RECOMMEND_REMOTE_NODE_PENALTY = 1000.0 # Penalty for placing a DU role off its NIC's NUMA node
+RECOMMEND_RT_CAPACITY_PCT = 100.0 # An RT role gets a CPU to itself
+NODE_BASE_PATH = "/sys/devices/system/node"
+SMT_BUSY_PCT = 10.0 # A sibling of an RT CPU above this Busy% is flagged as SMT contention
+POWER_MODEL_WINDOW = 60 # Intervals kept for the rolling per-package power fit
+POWER_MODEL_MIN_SAMPLES = 8 # Intervals needed before per-core watts are estimated
+POWER_MODEL_RIDGE = 1e-3 # Ridge term on standardised features; keeps the fit stable when activity barely varies
+GROUP_BY_CHOICES = ('cpu', 'core', 'die', 'llc', 'node')
+PCI_DEVICES_PATH = "/sys/bus/pci/devices"
+PCI_BDF_PATTERN = re.compile(r'\b([0-9a-fA-F]{4}:[0-9a-fA-F]{2}:[0-9a-fA-F]{2}\.[0-7])\b')
+DU_PROCESS_NAMES = ('srsdu', 'gnb')
+SRSRAN_PROCESS_NAMES = DU_PROCESS_NAMES + ('srscu',)
+PID_REFRESH_INTERVALS = 12 # Rescan /proc for DU processes every N intervals
+CLK_TCK = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+PROC_READ_SIZE = 4096 # /proc/<pid>/task/<tid>/{stat,schedstat} fit comfortably in one page
+INTRUDERS_PER_CPU = 5 # Foreign threads listed per CPU and interval
+SOFTIRQ_TYPES = ('NET_RX', 'NET_TX', 'TIMER', 'SCHED', 'RCU') # Per-type columns; the rest is folded into 'Other'
+SOFTIRQ_CHOICES = ('types', 'total')
+PROC_STAT_FIELDS = ('user', 'nice', 'system', 'idle', 'iowait', 'irq', 'softirq', 'steal') # Leading per-CPU /proc/stat columns
+TRACEFS_PATHS = ('/sys/kernel/tracing', '/sys/kernel/debug/tracing')
+NOISE_TRACERS = ('osnoise', 'timerlat')
+# osnoise summary line: RUNTIME_US NOISE_US %AVAILABLE MAX_SINGLE_US HW NMI IRQ SIRQ THREAD
+OSNOISE_LINE = re.compile(r'\[(\d+)\].*?:\s+(\d+)\s+(\d+)\s+([\d.]+)\s+(\d+)\s+(\d+)\s+(\d+)\s+(\d+)\s+(\d+)\s+(\d+)\s*$')
+TIMERLAT_LINE = re.compile(r'\[(\d+)\].*context\s+(irq|thread)\s+timer_latency\s+(\d+)\s+ns')
+TRACE_INSTANCE = 'monitoring' # tracefs instance, so the top-level buffer is left alone
+TRACE_EVENTS = ('sched/sched_switch', 'sched/sched_wakeup', 'irq/irq_handler_entry')
+TRACE_BUFFER_KB = 4096 # Per-CPU ring buffer of the instance
+TRACE_PAGES_PER_INTERVAL = 256 # Read at most this many pages per CPU and interval; the rest waits
+TRACE_TOP_PREEMPTORS = 3
+RB_TYPE_PADDING, RB_TYPE_TIME_EXTEND, RB_TYPE_TIME_STAMP = 29, 30, 31
+RB_MISSED_EVENTS = 1 << 31 # Flag in a page's commit field
+TASK_SLEEP_STATE_MASK = 0x7F # prev_state bits of a task that blocked; none set means it was preempted
+BURST_DEFAULT_DIR = "/mnt/data/monitoring"
+BURST_DEFAULT_HOLDOFF_SEC = 10.0 # Minimum time between two captures, so a flapping condition cannot fill the disk
+BURST_METRICS = ('busy', 'bzy_mhz', 'ipc', 'throttle', 'smi')
+BURST_TRIGGER_PATTERN = re.compile(r'^(\w+)(?:@([\w,\-]+))?\s*(?:(>=|<=|>|<|==)\s*([\d.]+))?$')
+BURST_OPS = {'>': lambda a, b: a > b, '>=': lambda a, b: a >= b, '<': lambda a, b: a < b,
+             '<=': lambda a, b: a <= b, '==': lambda a, b: a == b}
+FAST_REGS = (MSR_IA32_TSC, MSR_IA32_APERF, MSR_IA32_MPERF, MSR_IA32_FIXED_CTR0)
+FAST_FREQ_BIN_MHZ = 100 # Width of the Bzy_MHz histogram bins
+FAST_LATE_FACTOR = 1.5 # Sample gaps above this multiple of the target period count as late
+FRAME_NS = 10_000_000 # One radio frame
+SFN_CYCLE = 1024 # Frames per SFN wrap
+GPS_EPOCH_TAI_NS = 315_964_819 * 1_000_000_000 # 1980-01-06T00:00:00 GPS expressed on the TAI (1970) timescale
+CLOCKFD = 3 # Dynamic POSIX clock id for a PHC fd: ((~fd) << 3) | CLOCKFD
+PTP_DEFAULT_SOCKET = "/var/run/ptp4lro" # ptp4l read-only management socket (uds_ro_address)
+PTP_MGMT_HEADER = struct.Struct('>BBHBBH8s4s8sHHBb') # PTPv2 common header, 34 bytes
+PTP_MGMT_BODY = struct.Struct('>8sHBBBB') # targetPortIdentity, boundary hops, action, reserved
+PTP_TLV = struct.Struct('>HHH') # tlvType, lengthField, managementId
+PTP_MSG_MANAGEMENT, PTP_TLV_MANAGEMENT = 0x0D, 0x0001
+PTP_ACTION_GET, PTP_ACTION_RESPONSE = 0, 2
+PTP_MID_CURRENT_DATA_SET, PTP_MID_PORT_DATA_SET, PTP_MID_TIME_STATUS_NP = 0x2001, 0x2004, 0xC000
+PTP_PORT_STATES = {1: 'INITIALIZING', 2: 'FAULTY', 3: 'DISABLED', 4: 'LISTENING', 5: 'PRE_MASTER',
+                   6: 'MASTER', 7: 'PASSIVE', 8: 'UNCALIBRATED', 9: 'SLAVE'}
+PTP_TIMEOUT_SEC = 0.1
+PTP_OFFSET_WARN_NS = 100 # |offset| above this is reported together with housekeeping CPU load
+# ptp4l/phc2sys/ts2phc servo lines: "... offset -12 s2 freq +3456 [path] delay 789"
+PTP_LOG_LINE = re.compile(r'(ptp4l|phc2sys|ts2phc)\[[\d.]+\]:.*?offset\s+(-?\d+)\s+(s\d)\s+freq\s+([+-]?\d+)(?:\s+(?:path\s+)?delay\s+(-?\d+))?')
+LOG_POLL_SEC = 0.005 # A short poll so log events can still start a burst capture within its pre-trigger window
+LOG_REOPEN_SEC = 1.0 # How often an idle log is checked for rotation, and a missing one retried
+METRICS_DEFAULT_LISTEN = "0.0.0.0:55555" # srsRAN metrics.addr/port point here when the monitor tees the stream
+METRICS_MAX_DATAGRAM = 65535
+SRS_LOG_EVENTS = { # Case-insensitive patterns for srsdu/srscu log warnings that are real-time failures
+    'late_dl': r'late downlink|downlink (?:data|request|grid)[^\n]*late|\blate dl\b',
+    'ul_underflow': r'real-time failure in r[fu]:[^\n]*(?:underflow|late uplink)', # RF/RU notifier only, not e.g. a MAC buffer underflow
+    'ofh_rx_window': r'reception window|\brx window|missed incoming',
+}
+SRS_LOG_COLUMNS = {'late_dl': "LateDL", 'ul_underflow': "ULUnd", 'ofh_rx_window': "OFHWin"}
+SRS_LOG_TIMESTAMP = re.compile(r'^(\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d(?:\.\d+)?)')
+CGROUP_ROOT = "/sys/fs/cgroup"
+CGROUP_POD_PROCESSES = (('du', DU_PROCESS_NAMES), ('cu', ('srscu',)), ('upf', ('open5gs-upfd',)))
+CGROUP_POD_PATTERN = re.compile(r'pod[0-9a-f_\-]{8,}') # kubepods-*-pod<uid>.slice or pod<uid>
+PRESSURE_PATH = "/proc/pressure"
+PSI_RESOURCES = ('cpu', 'memory', 'io')
+PSI_CGROUP_RESOURCES = ('cpu', 'memory')
+CGROUP_STAT_FIELDS = ('usage_usec', 'user_usec', 'system_usec', 'nr_periods', 'nr_throttled', 'throttled_usec')
 FIXED_CTR0_ENABLE_BIT = 1 << 32 # Bit 32 for MSR_IA32_PERF_GLOBAL_CTRL
 FIXED_CTR0_CONFIG_MASK = 0xF # Bits 0-3 for MSR_IA32_FIXED_CTR_CTRL
 FIXED_CTR0_CONFIG_VAL = 0x3 # Enable OS+USR counting for CTR0
@@ -67,6 +178,39 @@ def read_msr(cpu_id, reg):
         print(f"Error: Unexpected error reading MSR {hex(reg)} on CPU {cpu_id}: {e}", file=sys.stderr)
         return None
 
+class MsrSampler:
+    """Reads a fixed list of MSRs on a few CPUs with preadv on cached /dev/cpu/N/msr fds.
+
+    Every sample lands in the same preallocated buffer (CPU-major, 8 bytes per
+    register); values() unpacks it.
+    """
+    def __init__(self, cpus, regs):
+        self.cpus, self.regs = list(cpus), list(regs)
+        self.fds = {}
+        try:
+            for cpu in self.cpus: self.fds[cpu] = os.open(f'/dev/cpu/{cpu}/msr', os.O_RDONLY)
+        except OSError:
+            self.close(); raise
+        self.buf = bytearray(8 * len(self.cpus) * len(self.regs))
+        view = memoryview(self.buf)
+        self.reads = [(self.fds[cpu], [view[8 * (i * len(self.regs) + j):8 * (i * len(self.regs) + j + 1)]], reg)
+                      for i, cpu in enumerate(self.cpus) for j, reg in enumerate(self.regs)]
+        self.fmt = struct.Struct(f'<{len(self.cpus) * len(self.regs)}Q')
+
+    def sample(self):
+        for fd, target, reg in self.reads: os.preadv(fd, target, reg)
+        return self.buf
+
+    def values(self, buf=None):
+        """{cpu: [reg values]} from the last sample (or an earlier copy of the buffer)."""
+        flat = self.fmt.unpack_from(self.buf if buf is None else buf)
+        n = len(self.regs)
+        return {cpu: flat[i * n:(i + 1) * n] for i, cpu in enumerate(self.cpus)}
+
+    def close(self):
+        for fd in self.fds.values(): os.close(fd)
+        self.fds = {}
+
 def write_msr(cpu_id, reg, value):
     """Writes a 64-bit value to a specific MSR for a specific CPU."""
     try:
@@ -86,6 +230,20 @@ def write_msr(cpu_id, reg, value):
         print(f"Error: Unexpected error writing MSR {hex(reg)} on CPU {cpu_id}: {e}", file=sys.stderr)
         return False
 
+def read_cpuid(cpu_id, leaf, subleaf=0):
+    """Executes CPUID on a specific CPU via /dev/cpu/N/cpuid, returning (eax, ebx, ecx, edx)."""
+    try:
+        with open(f'/dev/cpu/{cpu_id}/cpuid', 'rb') as f:
+            f.seek(leaf | (subleaf << 32))
+            regs = f.read(16)
+            if len(regs) == 16:
+                return struct.unpack('<4I', regs)
+            return None
+    except OSError as e:
+        if e.errno != 2 and e.errno != 13:
+            print(f"Warning: Cannot read CPUID leaf {hex(leaf)} on CPU {cpu_id}: {e}", file=sys.stderr)
+        return None
+
 def enable_fixed_counter0(target_cpus):
     """Enables FIXED_CTR0 on target CPUs using Read-Modify-Write."""
     print("Attempting to enable FIXED_CTR0 (Instructions Retired) via MSR...")
@@ -191,15 +349,990 @@ def parse_interrupts():
     except Exception as e: print(f"Warning: Error parsing /proc/interrupts: {e}")
     return irq_counts
 
+class SoftirqReader:
+    """Reads /proc/softirqs with pread on a cached fd.
+
+    The CPU column positions are parsed from the header once and reused for as long
+    as the header line is unchanged (it only changes on CPU hotplug). Only the
+    target CPUs' columns are converted to ints.
+    """
+    def __init__(self, target_cpus):
+        self.target_cpus = target_cpus
+        self.fd = os.open('/proc/softirqs', os.O_RDONLY)
+        self.header = None
+        self.positions = [] # (cpu_id, column index after the name field)
+
+    def close(self):
+        if self.fd is not None: os.close(self.fd); self.fd = None
+
+    def sample(self):
+        """Returns (timestamp, {softirq name: {cpu: count}})."""
+        timestamp = time.monotonic()
+        raw = b''
+        while True: # /proc/softirqs grows with the CPU count; read until a short chunk
+            chunk = os.pread(self.fd, 65536, len(raw))
+            raw += chunk
+            if len(chunk) < 65536: break
+        lines = raw.decode().splitlines()
+        if lines[0] != self.header:
+            self.header = lines[0]
+            columns = {int(name[3:]): idx for idx, name in enumerate(lines[0].split()) if name.startswith('CPU')}
+            self.positions = [(cpu, columns[cpu]) for cpu in self.target_cpus if cpu in columns]
+        counts = {}
+        for line in lines[1:]:
+            parts = line.split()
+            if len(parts) < 2: continue
+            values = parts[1:]
+            counts[parts[0].rstrip(':')] = {cpu: int(values[idx]) for cpu, idx in self.positions if idx < len(values)}
+        return timestamp, counts
+
+def softirq_rates(current, prev):
+    """Per-CPU softirq rates ({cpu: {name: per second}}) between two SoftirqReader samples."""
+    (ts_now, now), (ts_prev, before) = current, prev
+    elapsed = ts_now - ts_prev
+    rates = defaultdict(dict)
+    if elapsed <= 0: return rates
+    for name, per_cpu in now.items():
+        for cpu, count in per_cpu.items():
+            rates[cpu][name] = max(0, count - before.get(name, {}).get(cpu, count)) / elapsed
+    return rates
+
+class KernelStatReader:
+    """Per-CPU kernel time accounting from /proc/stat and /proc/schedstat.
+
+    Both files are kept open and read in one pread each. /proc/schedstat is
+    optional (CONFIG_SCHEDSTATS); its per-CPU run time, run delay and timeslice
+    count are left out when missing.
+    """
+    def __init__(self):
+        self.stat_fd = os.open('/proc/stat', os.O_RDONLY)
+        try: self.schedstat_fd = os.open('/proc/schedstat', os.O_RDONLY)
+        except OSError: self.schedstat_fd = None
+
+    def close(self):
+        for fd in (self.stat_fd, self.schedstat_fd):
+            if fd is not None: os.close(fd)
+        self.stat_fd = self.schedstat_fd = None
+
+    @staticmethod
+    def _read(fd):
+        raw = b''
+        while True:
+            chunk = os.pread(fd, 65536, len(raw))
+            raw += chunk
+            if len(chunk) < 65536: return raw
+
+    def sample(self):
+        """Returns (timestamp, {cpu: stat ticks tuple}, {cpu: (run_ns, delay_ns, timeslices)})."""
+        timestamp = time.monotonic()
+        ticks, sched = {}, {}
+        for line in self._read(self.stat_fd).split(b'\n'):
+            if not line.startswith(b'cpu') or line.startswith(b'cpu '): continue
+            parts = line.split()
+            ticks[int(parts[0][3:])] = tuple(map(int, parts[1:1 + len(PROC_STAT_FIELDS)]))
+        if self.schedstat_fd is not None:
+            for line in self._read(self.schedstat_fd).split(b'\n'):
+                if not line.startswith(b'cpu'): continue
+                parts = line.split() # cpuN + 9 fields; the last three are run ns, wait ns, timeslices
+                if len(parts) >= 10: sched[int(parts[0][3:])] = tuple(map(int, parts[7:10]))
+        return timestamp, ticks, sched
+
+def kernel_time_stats(current, prev):
+    """Per-CPU % of ticks per /proc/stat class plus schedstat run time (% of the interval), run delay and timeslices."""
+    (ts_now, ticks_now, sched_now), (ts_prev, ticks_prev, sched_prev) = current, prev
+    elapsed = ts_now - ts_prev
+    stats = {}
+    for cpu, now in ticks_now.items():
+        before = ticks_prev.get(cpu)
+        if before is None: continue
+        diff = dict(zip(PROC_STAT_FIELDS, (max(0, n - b) for n, b in zip(now, before))))
+        total = sum(diff.values())
+        pct = {name: 100.0 * value / total if total > 0 else 0.0 for name, value in diff.items()}
+        cpu_stats = {'usr': pct['user'] + pct['nice'], 'sys': pct['system'], 'irq': pct['irq'], 'sirq': pct['softirq'],
+                     'steal': pct['steal'], 'iowait': pct['iowait'], 'busy': 100.0 - pct['idle'] - pct['iowait'] if total > 0 else 0.0}
+        if cpu in sched_now and cpu in sched_prev and elapsed > 0:
+            run, delay, slices = (max(0, n - b) for n, b in zip(sched_now[cpu], sched_prev[cpu]))
+            cpu_stats.update(run=100.0 * run / 1e9 / elapsed, runq_ms=delay / 1e6, slices=slices / elapsed)
+        stats[cpu] = cpu_stats
+    return stats
+
+def find_tracefs():
+    return next((path for path in TRACEFS_PATHS if os.path.exists(os.path.join(path, 'current_tracer'))), None)
+
+def percentile(values, pct):
+    """Nearest-rank percentile of an unsorted list (None when empty)."""
+    if not values: return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered))) - 1))]
+
+def parse_event_format(path):
+    """Parses a tracefs event format file into (id, {field: (offset, size, signed, kind)}).
+
+    kind is 'str' for fixed char arrays, 'loc' for __data_loc strings, else 'int'.
+    """
+    event_id, fields = None, {}
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if line.startswith('ID:'): event_id = int(line[3:])
+            if not line.startswith('field:'): continue
+            parts = dict(p.strip().split(':', 1) for p in line.split(';') if ':' in p)
+            decl = parts['field'].strip()
+            name = re.sub(r'\[.*\]', '', decl.split()[-1])
+            kind = 'loc' if decl.startswith('__data_loc') else 'str' if decl.startswith('char') and '[' in decl else 'int'
+            fields[name] = (int(parts['offset']), int(parts['size']), parts.get('signed', '0').strip() == '1', kind)
+    return event_id, fields
+
+def event_field(buf, base, spec):
+    offset, size, signed, kind = spec
+    if kind == 'str': return bytes(buf[base + offset:base + offset + size]).split(b'\0', 1)[0].decode(errors='replace')
+    if kind == 'loc':
+        loc = int.from_bytes(buf[base + offset:base + offset + 4], 'little')
+        start = base + (loc & 0xFFFF)
+        return bytes(buf[start:start + (loc >> 16)]).split(b'\0', 1)[0].decode(errors='replace')
+    return int.from_bytes(buf[base + offset:base + offset + size], 'little', signed=signed)
+
+class SchedTracer:
+    """Streams sched_switch/sched_wakeup/irq_handler_entry from a tracefs instance for selected CPUs.
+
+    Pages are read from per_cpu/cpuN/trace_pipe_raw with readv into one
+    preallocated buffer per CPU (at most TRACE_PAGES_PER_INTERVAL per interval), and
+    events are decoded from the ring-buffer page layout using the offsets in the
+    header_page and event format files.
+    """
+    def __init__(self, cpus):
+        tracefs = find_tracefs()
+        if tracefs is None: raise OSError("tracefs not mounted")
+        self.cpus = cpus
+        self.root = os.path.join(tracefs, 'instances', TRACE_INSTANCE)
+        if not os.path.isdir(self.root): os.mkdir(self.root)
+        self.fds = {}
+        try:
+            header = parse_event_format(os.path.join(tracefs, 'events', 'header_page'))[1]
+            self.commit_off, self.commit_size = header['commit'][0], header['commit'][1]
+            self.data_off = header['data'][0]
+            self.page_size = os.sysconf('SC_PAGE_SIZE')
+            self.formats = {}
+            for event in TRACE_EVENTS:
+                event_id, fields = parse_event_format(os.path.join(tracefs, 'events', event, 'format'))
+                self.formats[event_id] = (event.split('/')[1], fields)
+            mask = sum(1 << cpu for cpu in cpus)
+            self._write('tracing_cpumask', f"{mask:x}")
+            self._write('buffer_size_kb', str(TRACE_BUFFER_KB))
+            for event in TRACE_EVENTS: self._write(f'events/{event}/enable', '1')
+            self._write('tracing_on', '1')
+            for cpu in cpus:
+                self.fds[cpu] = os.open(os.path.join(self.root, 'per_cpu', f'cpu{cpu}', 'trace_pipe_raw'), os.O_RDONLY | os.O_NONBLOCK)
+        except (OSError, KeyError, ValueError):
+            self.close(); raise
+        self.buffers = {cpu: bytearray(self.page_size) for cpu in cpus}
+        self.switched_out = {} # tid -> (timestamp, preempted)
+
+    def _write(self, name, value):
+        with open(os.path.join(self.root, name), 'w') as f: f.write(value)
+
+    def close(self):
+        for fd in self.fds.values(): os.close(fd)
+        self.fds = {}
+        try:
+            for event in TRACE_EVENTS: self._write(f'events/{event}/enable', '0')
+            os.rmdir(self.root)
+        except OSError: pass
+
+    def _events(self, buf, length):
+        """Yields (timestamp ns, event name, base offset) for the data events in one page."""
+        ts = int.from_bytes(buf[0:8], 'little')
+        commit = int.from_bytes(buf[self.commit_off:self.commit_off + self.commit_size], 'little')
+        pos, end = self.data_off, min(self.data_off + (commit & 0xFFFFFFF), length)
+        while pos + 4 <= end:
+            hdr = int.from_bytes(buf[pos:pos + 4], 'little')
+            type_len, delta = hdr & 0x1F, hdr >> 5
+            if type_len == RB_TYPE_PADDING:
+                if delta == 0: break # Rest of the page is empty
+                pos += 4 + int.from_bytes(buf[pos + 4:pos + 8], 'little')
+            elif type_len == RB_TYPE_TIME_EXTEND:
+                ts += delta + (int.from_bytes(buf[pos + 4:pos + 8], 'little') << 27); pos += 8
+            elif type_len == RB_TYPE_TIME_STAMP:
+                ts = delta + (int.from_bytes(buf[pos + 4:pos + 8], 'little') << 27); pos += 8
+            else:
+                ts += delta
+                if type_len == 0: base, size = pos + 8, int.from_bytes(buf[pos + 4:pos + 8], 'little') - 4
+                else: base, size = pos + 4, type_len * 4
+                if base + size > end: break # Truncated event (short read)
+                pos = base + size
+                event = self.formats.get(int.from_bytes(buf[base:base + 2], 'little'))
+                if event: yield ts, event, base
+
+    def collect(self, srsran_tids):
+        """Per-CPU preemptions, IRQs, top preempting tasks and the longest preempted gap of an srsRAN thread."""
+        results = {}
+        for cpu in self.cpus:
+            s = {'switches': 0, 'wakeups': 0, 'irqs': 0, 'preempts': 0, 'preemptors': defaultdict(int),
+                 'max_gap_ns': 0, 'max_gap_task': None, 'lost_pages': 0, 'pages': 0}
+            buf = self.buffers[cpu]
+            for _ in range(TRACE_PAGES_PER_INTERVAL):
+                try: length = os.readv(self.fds[cpu], [buf])
+                except BlockingIOError: break
+                if length <= 0: break
+                s['pages'] += 1
+                if int.from_bytes(buf[self.commit_off:self.commit_off + self.commit_size], 'little') & RB_MISSED_EVENTS: s['lost_pages'] += 1
+                for ts, (name, fields), base in self._events(buf, length):
+                    if name == 'sched_switch':
+                        s['switches'] += 1
+                        prev_pid = event_field(buf, base, fields['prev_pid'])
+                        next_pid = event_field(buf, base, fields['next_pid'])
+                        if prev_pid in srsran_tids:
+                            preempted = event_field(buf, base, fields['prev_state']) & TASK_SLEEP_STATE_MASK == 0
+                            self.switched_out[prev_pid] = (ts, preempted)
+                            if preempted:
+                                s['preempts'] += 1
+                                s['preemptors'][event_field(buf, base, fields['next_comm'])] += 1
+                        if next_pid in srsran_tids and next_pid in self.switched_out:
+                            out_ts, preempted = self.switched_out.pop(next_pid)
+                            if preempted and ts - out_ts > s['max_gap_ns']:
+                                s['max_gap_ns'] = ts - out_ts
+                                s['max_gap_task'] = f"{event_field(buf, base, fields['next_comm'])}/{next_pid}"
+                    elif name == 'sched_wakeup': s['wakeups'] += 1
+                    else: s['irqs'] += 1
+            results[cpu] = s
+        return results
+
+def sched_trace_lines(results):
+    lines = []
+    for cpu, s in sorted(results.items()):
+        top = sorted(s['preemptors'].items(), key=lambda kv: -kv[1])[:TRACE_TOP_PREEMPTORS]
+        lines.append(format_summary(f"Sched CPU {cpu}", [
+            ("Switches", s['switches']), ("Wakeups", s['wakeups']), ("IRQs", s['irqs']),
+            ("Preempted", s['preempts']),
+            ("MaxGap_us", f"{s['max_gap_ns'] / 1000:.1f}" if s['max_gap_task'] else "-"),
+            ("GapTask", s['max_gap_task'] or "-"),
+            ("TopPreemptors", " ".join(f"{comm}:{count}" for comm, count in top) or "-"),
+            ("Pages", s['pages']), ("LostPages", s['lost_pages']),
+        ]))
+    return lines
+
+def srsran_thread_ids():
+    tids = set()
+    for pid in find_processes(SRSRAN_PROCESS_NAMES):
+        try: tids.update(int(t) for t in os.listdir(f'/proc/{pid}/task'))
+        except OSError: pass
+    return tids
+
+class NoiseTracer:
+    """Runs the kernel osnoise or timerlat tracer on selected CPUs and collects its output.
+
+    The tracer's workload threads are restricted to the given CPUs through
+    osnoise/cpus (osnoise occupies them for its whole runtime, so they must be
+    housekeeping or test cores). The per-CPU trace_pipe files are read without
+    blocking each interval. The previous tracer and CPU mask are restored on close.
+    """
+    def __init__(self, tracer, cpus):
+        self.tracer, self.cpus = tracer, cpus
+        self.tracefs = find_tracefs()
+        if self.tracefs is None: raise OSError("tracefs not mounted")
+        self.saved = {name: read_sysfs_str(self._path(name)) for name in ('current_tracer', 'osnoise/cpus')}
+        self.fds = {}
+        self.partial = {cpu: b'' for cpu in cpus}
+        try:
+            self._write('current_tracer', 'nop')
+            self._write('osnoise/cpus', ",".join(map(str, cpus)))
+            self._write('current_tracer', tracer)
+            self._write('tracing_on', '1')
+            for cpu in cpus: self.fds[cpu] = os.open(self._path(f'per_cpu/cpu{cpu}/trace_pipe'), os.O_RDONLY | os.O_NONBLOCK)
+        except OSError:
+            self.close(); raise
+
+    def _path(self, name): return os.path.join(self.tracefs, name)
+
+    def _write(self, name, value):
+        with open(self._path(name), 'w') as f: f.write(value)
+
+    def close(self):
+        for fd in self.fds.values(): os.close(fd)
+        self.fds = {}
+        try:
+            self._write('current_tracer', 'nop')
+            if self.saved['osnoise/cpus']: self._write('osnoise/cpus', self.saved['osnoise/cpus'])
+            if self.saved['current_tracer'] and self.saved['current_tracer'] != 'nop': self._write('current_tracer', self.saved['current_tracer'])
+        except OSError as e: print(f"Warning: Could not restore tracer state: {e}", file=sys.stderr)
+
+    def _drain(self, cpu):
+        data = self.partial[cpu]
+        while True:
+            try: chunk = os.read(self.fds[cpu], 65536)
+            except BlockingIOError: break
+            if not chunk: break
+            data += chunk
+        lines = data.split(b'\n')
+        self.partial[cpu] = lines.pop() # Keep an incomplete last line for the next interval
+        return [line.decode(errors='replace') for line in lines]
+
+    def collect(self):
+        """Returns {cpu: stats} for the lines traced since the last call."""
+        results = {}
+        for cpu in self.cpus:
+            lines = self._drain(cpu)
+            if self.tracer == 'osnoise':
+                s = {'samples': 0, 'runtime_us': 0, 'noise_us': 0, 'max_single_us': 0, 'hw': 0, 'nmi': 0, 'irq': 0, 'sirq': 0, 'thread': 0}
+                for line in lines:
+                    m = OSNOISE_LINE.search(line)
+                    if not m: continue
+                    runtime, noise, _, max_single, hw, nmi, irq, sirq, thread = m.groups()[1:]
+                    s['samples'] += 1; s['runtime_us'] += int(runtime); s['noise_us'] += int(noise)
+                    s['max_single_us'] = max(s['max_single_us'], int(max_single))
+                    for key, value in (('hw', hw), ('nmi', nmi), ('irq', irq), ('sirq', sirq), ('thread', thread)): s[key] += int(value)
+            else:
+                s = {'irq': [], 'thread': []}
+                for line in lines:
+                    m = TIMERLAT_LINE.search(line)
+                    if m: s[m.group(2)].append(int(m.group(3)) / 1000.0)
+            results[cpu] = s
+        return results
+
+def noise_lines(tracer, results):
+    lines = []
+    for cpu, s in sorted(results.items()):
+        if tracer == 'osnoise':
+            if not s['samples']: continue
+            lines.append(format_summary(f"OSNoise CPU {cpu}", [
+                ("Noise_us", s['noise_us']),
+                ("Avail%", f"{100.0 * (1 - s['noise_us'] / s['runtime_us']):.5f}" if s['runtime_us'] else "-"),
+                ("MaxSingle_us", s['max_single_us']),
+                ("HW", s['hw']), ("NMI", s['nmi']), ("IRQ", s['irq']), ("SIRQ", s['sirq']), ("Thread", s['thread']),
+            ]))
+        else:
+            fields = []
+            for ctx in ('irq', 'thread'):
+                values = s[ctx]
+                fields.append((f"{ctx}_n", len(values)))
+                for name, pct in (("p50", 50), ("p99", 99), ("p99.9", 99.9)):
+                    value = percentile(values, pct)
+                    fields.append((f"{ctx}_{name}_us", f"{value:.1f}" if value is not None else "-"))
+                fields.append((f"{ctx}_max_us", f"{max(values):.1f}" if values else "-"))
+            if s['irq'] or s['thread']: lines.append(format_summary(f"Timerlat CPU {cpu}", fields))
+    return lines
+
+def parse_burst_trigger(expr, cpu_roles, cpus):
+    """Parses 'METRIC[@ROLE|@CPUS][OP VALUE]', e.g. 'busy@l1_ul>95', 'throttle', 'smi>0'.
+
+    Returns (expr, metric, trigger CPUs, op, threshold); a bare metric means '> 0'.
+    """
+    m = BURST_TRIGGER_PATTERN.match(expr.replace(' ', ''))
+    if not m or m.group(1) not in BURST_METRICS:
+        raise ValueError(f"bad trigger '{expr}' (metrics: {', '.join(BURST_METRICS)})")
+    metric, target, op, value = m.groups()
+    if target is None: trigger_cpus = list(cpus)
+    elif re.match(r'^[\d,\-]+$', target): trigger_cpus = parse_cpu_list(target)
+    else:
+        trigger_cpus = sorted(c for c, assignments in cpu_roles.items()
+                              if any(gnb_role_name(r) == gnb_role_name(target) for _, r in assignments))
+    trigger_cpus = [c for c in trigger_cpus if c in cpus]
+    if not trigger_cpus: raise ValueError(f"trigger '{expr}' matches no sampled CPU")
+    return expr, metric, trigger_cpus, op or '>', float(value) if value is not None else 0.0
+
+class BurstCapture:
+    """High-rate MSR sampling of a few CPUs into a ring, dumped to CSV around trigger events.
+
+    A background thread samples TSC/APERF/MPERF/instructions/thermal status (and the
+    SMI count) every 1/rate seconds, keeping the last pre_ms of derived per-CPU
+    metrics. A trigger fires when its condition becomes true (a condition that stays
+    true does not fire again) and at least holdoff seconds after the previous
+    capture started. The ring plus the following post_ms are then written at full
+    resolution to out_dir by a separate writer thread, so sampling never stops for
+    file I/O; new triggers are ignored until that capture is complete.
+    """
+    REGS = (MSR_IA32_TSC, MSR_IA32_APERF, MSR_IA32_MPERF, MSR_IA32_FIXED_CTR0, MSR_IA32_THERM_STATUS, MSR_SMI_COUNT)
+
+    def __init__(self, cpus, rate_hz, window_ms, triggers, out_dir, holdoff_sec=BURST_DEFAULT_HOLDOFF_SEC):
+        if not cpus: raise ValueError("no CPUs to sample (use --burst-cpus or a --gnb-config with RT CPUs)")
+        self.cpus, self.triggers, self.out_dir, self.holdoff = cpus, triggers, out_dir, holdoff_sec
+        self.period = 1.0 / rate_hz
+        self.pre = deque(maxlen=max(1, int(window_ms / 1000.0 * rate_hz)))
+        self.post_samples = self.pre.maxlen
+        self.sampler = MsrSampler(cpus, self.REGS)
+        os.makedirs(out_dir, exist_ok=True)
+        self.stop_event = threading.Event()
+        self.dumps = [] # (trigger, path) written since the last report
+        self.pending = None # Trigger fired from outside the sampler, e.g. by a log event
+        self.lock = threading.Lock()
+        self.finished = queue.Queue() # Completed captures for the writer thread; None stops it
+        self.thread = threading.Thread(target=self._run, name="burst-capture", daemon=True)
+        self.writer = threading.Thread(target=self._write, name="burst-writer", daemon=True)
+        self.thread.start()
+        self.writer.start()
+
+    def _metrics(self, now, prev, elapsed):
+        tsc, aperf, mperf, instr, _, smi = (n - p for n, p in zip(now, prev)) # THERM_STATUS is a level, not a counter
+        busy = 100.0 * mperf / tsc if tsc > 0 else 0.0
+        return {'busy': busy, 'bzy_mhz': aperf / mperf * tsc / elapsed / 1e6 if mperf > 0 and elapsed > 0 else 0.0,
+                'ipc': instr / aperf if aperf > 0 else 0.0, 'throttle': now[4] & 0x1, 'smi': smi & 0xFFFFFFFF}
+
+    def _run(self):
+        prev = self.sampler.values(self.sampler.sample())
+        prev_t = next_t = time.perf_counter()
+        capture = None # (trigger expr, timestamp, samples, pre-trigger count) while collecting the post-trigger window
+        was_true = [False] * len(self.triggers) # Per trigger, so only rising edges fire
+        last_capture = float('-inf')
+        while not self.stop_event.is_set():
+            next_t += self.period
+            delay = next_t - time.perf_counter()
+            if delay > 0: time.sleep(delay)
+            else: next_t = time.perf_counter() # Fell behind; do not try to catch up in a burst
+            ts, sample_t = time.time(), time.perf_counter()
+            now = self.sampler.values(self.sampler.sample())
+            record = (ts, {cpu: self._metrics(now[cpu], prev[cpu], sample_t - prev_t) for cpu in self.cpus})
+            prev, prev_t = now, sample_t
+            self.pre.append(record) # Kept up during captures, so the next one has full history
+            fired = []
+            for i, (expr, metric, trigger_cpus, op, threshold) in enumerate(self.triggers):
+                is_true = any(BURST_OPS[op](record[1][c][metric], threshold) for c in trigger_cpus)
+                if is_true and not was_true[i]: fired.append(expr)
+                was_true[i] = is_true
+            with self.lock:
+                if self.pending: fired.append(self.pending); self.pending = None
+            if capture:
+                capture[2].append(record)
+                if len(capture[2]) >= capture[3] + self.post_samples: self.finished.put(capture[:3]); capture = None
+            elif fired and ts - last_capture >= self.holdoff:
+                capture = (fired[0], ts, list(self.pre), len(self.pre)); last_capture = ts
+
+    def _write(self):
+        for capture in iter(self.finished.get, None): self._dump(*capture)
+
+    def _dump(self, expr, trigger_ts, samples):
+        stamp = datetime.fromtimestamp(trigger_ts, timezone.utc).strftime('%Y%m%dT%H%M%S.%f')
+        path = os.path.join(self.out_dir, f"burst-{stamp}-{re.sub(r'[^A-Za-z0-9_.-]+', '_', expr)}.csv")
+        try:
+            with open(path, 'w') as f:
+                f.write(f"# trigger={expr} at {datetime.fromtimestamp(trigger_ts, timezone.utc).isoformat()}\n")
+                f.write("t_ms,cpu," + ",".join(BURST_METRICS) + "\n")
+                for ts, per_cpu in samples:
+                    for cpu in self.cpus:
+                        m = per_cpu[cpu]
+                        f.write(f"{(ts - trigger_ts) * 1000:.3f},{cpu},{m['busy']:.2f},{m['bzy_mhz']:.0f},{m['ipc']:.3f},{m['throttle']},{m['smi']}\n")
+        except OSError as e: path = f"failed: {e}"
+        with self.lock: self.dumps.append((expr, path))
+
+    def fire(self, expr):
+        """Starts a capture at the next sample, subject to the holdoff; ignored while another one is being collected."""
+        with self.lock: self.pending = expr
+
+    def report(self):
+        with self.lock:
+            dumps, self.dumps = self.dumps, []
+        return [f"Burst capture: trigger '{expr}' -> {path}" for expr, path in dumps]
+
+    def close(self):
+        self.stop_event.set()
+        self.thread.join(timeout=1.0)
+        self.finished.put(None)
+        self.writer.join(timeout=5.0) # Let a pending dump finish
+        self.sampler.close()
+
+class SampleClock:
+    """Frame-aligned sample scheduling on CLOCK_TAI or a PTP hardware clock.
+
+    Sample instants are multiples of the interval (rounded to whole 10 ms frames)
+    counted from the GPS epoch. Monitors on different DUs and nodes with the same
+    interval therefore sample at the same frame boundaries, and each instant maps to an SFN.
+    """
+    def __init__(self, spec, interval_sec):
+        self.fd = None
+        if spec == 'tai':
+            self.clock_id = time.CLOCK_TAI
+            if abs(time.clock_gettime_ns(time.CLOCK_TAI) - time.clock_gettime_ns(time.CLOCK_REALTIME)) < 1_000_000_000:
+                print("Warning: CLOCK_TAI equals CLOCK_REALTIME (kernel TAI offset not set by ptp4l/phc2sys); SFNs will be off by the leap seconds.", file=sys.stderr)
+        else:
+            self.fd = os.open(spec, os.O_RDONLY)
+            self.clock_id = ((~self.fd) << 3) | CLOCKFD
+            time.clock_gettime_ns(self.clock_id) # Fails early if the device is not a PHC
+        self.name = spec
+        self.interval_ns = max(1, round(interval_sec * 1e9 / FRAME_NS)) * FRAME_NS
+        self.next_ns = None
+
+    def now_ns(self):
+        return time.clock_gettime_ns(self.clock_id)
+
+    def wait_next(self):
+        """Sleeps until the next aligned instant; returns (target ns, actual ns)."""
+        now = self.now_ns()
+        if self.next_ns is None or self.next_ns <= now: # First call or overran: skip to the next boundary
+            self.next_ns = ((now - GPS_EPOCH_TAI_NS) // self.interval_ns + 1) * self.interval_ns + GPS_EPOCH_TAI_NS
+        target = self.next_ns
+        while True:
+            remaining = target - self.now_ns()
+            if remaining <= 0: break
+            time.sleep(remaining / 1e9 - 0.0005 if remaining > 1_000_000 else 0) # Coarse sleep, then yield until the edge
+        self.next_ns = target + self.interval_ns
+        return target, self.now_ns()
+
+    @staticmethod
+    def frame_and_sfn(tai_ns):
+        frame = (tai_ns - GPS_EPOCH_TAI_NS) // FRAME_NS
+        return frame, frame % SFN_CYCLE
+
+    def close(self):
+        if self.fd is not None: os.close(self.fd); self.fd = None
+
+def ptp_mgmt_message(action, mgmt_id, sequence, domain, source, data=b''):
+    """Builds a PTP management message with one MANAGEMENT TLV (as pmc sends over UDS)."""
+    length = PTP_MGMT_HEADER.size + PTP_MGMT_BODY.size + PTP_TLV.size + len(data)
+    header = PTP_MGMT_HEADER.pack(PTP_MSG_MANAGEMENT, 0x02, length, domain, 0, 0, bytes(8), bytes(4),
+                                  source[:8], int.from_bytes(source[8:10], 'big'), sequence, 0x04, 0x7F)
+    body = PTP_MGMT_BODY.pack(b'\xff' * 8, 0xFFFF, 0, 0, action, 0)
+    return header + body + PTP_TLV.pack(PTP_TLV_MANAGEMENT, 2 + len(data), mgmt_id) + data
+
+def parse_ptp_mgmt(msg):
+    """Returns (sequence, action, managementId, data) of a management message, or None."""
+    if len(msg) < PTP_MGMT_HEADER.size + PTP_MGMT_BODY.size + PTP_TLV.size or msg[0] & 0x0F != PTP_MSG_MANAGEMENT: return None
+    sequence = PTP_MGMT_HEADER.unpack_from(msg)[10]
+    action = PTP_MGMT_BODY.unpack_from(msg, PTP_MGMT_HEADER.size)[4] & 0x0F
+    tlv_type, tlv_len, mgmt_id = PTP_TLV.unpack_from(msg, PTP_MGMT_HEADER.size + PTP_MGMT_BODY.size)
+    if tlv_type != PTP_TLV_MANAGEMENT: return None
+    start = PTP_MGMT_HEADER.size + PTP_MGMT_BODY.size + PTP_TLV.size
+    return sequence, action, mgmt_id, msg[start:start + tlv_len - 2]
+
+class PmcClient:
+    """Minimal pmc: GETs CURRENT_DATA_SET, PORT_DATA_SET and TIME_STATUS_NP from ptp4l over its UNIX socket."""
+    def __init__(self, server_path, domain=0):
+        self.server_path, self.domain = server_path, domain
+        self.local_path = os.path.join(tempfile.gettempdir(), f"monitoring-pmc.{os.getpid()}")
+        if os.path.exists(self.local_path): os.unlink(self.local_path)
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self.sock.bind(self.local_path)
+        self.sock.settimeout(PTP_TIMEOUT_SEC)
+        self.source = bytes(6) + os.getpid().to_bytes(4, 'big')
+        self.sequence = 0
+
+    def get(self, mgmt_id):
+        self.sequence = (self.sequence + 1) & 0xFFFF
+        try:
+            self.sock.sendto(ptp_mgmt_message(PTP_ACTION_GET, mgmt_id, self.sequence, self.domain, self.source), self.server_path)
+            while True:
+                reply = parse_ptp_mgmt(self.sock.recv(1500))
+                if reply and reply[0] == self.sequence and reply[1] == PTP_ACTION_RESPONSE and reply[2] == mgmt_id: return reply[3]
+        except OSError: return None # Includes socket.timeout: ptp4l not running or not reachable
+
+    def poll(self):
+        """Returns a dict with whatever ptp4l answered (empty when it is unreachable)."""
+        status = {}
+        data = self.get(PTP_MID_CURRENT_DATA_SET)
+        if data and len(data) >= 18:
+            steps, offset, delay = struct.unpack_from('>Hqq', data)
+            status.update(steps_removed=steps, offset_ns=offset / 65536.0, path_delay_ns=delay / 65536.0)
+        data = self.get(PTP_MID_PORT_DATA_SET)
+        if data and len(data) >= 11: status['port_state'] = PTP_PORT_STATES.get(data[10], str(data[10]))
+        data = self.get(PTP_MID_TIME_STATUS_NP)
+        if data and len(data) >= 42: # master_offset, ingress_time, rate, phase, gmTimeBaseIndicator, lastGmPhaseChange, gmPresent
+            status['master_offset_ns'] = struct.unpack_from('>q', data)[0]
+            status['gm_present'] = bool(struct.unpack_from('>i', data, 38)[0])
+        return status
+
+    def close(self):
+        self.sock.close()
+        try: os.unlink(self.local_path)
+        except OSError: pass
+
+class PmcStandIn:
+    """Local stand-in for ptp4l's management socket, answering the GETs PmcClient sends.
+
+    Serves a slowly drifting offset and path delay so the collector can be tried
+    (and its parsing checked) on hosts without ptp4l. Without a path it binds in a
+    fresh temporary directory; an existing path is never replaced, so a running
+    ptp4l's socket cannot be taken over.
+    """
+    def __init__(self, path=None):
+        self.tmp_dir = None if path else tempfile.mkdtemp(prefix="monitoring-ptp4l-")
+        self.path = path or os.path.join(self.tmp_dir, "ptp4l")
+        if os.path.exists(self.path): raise FileExistsError(f"{self.path} already exists (is ptp4l running?)")
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        try: self.sock.bind(self.path)
+        except OSError:
+            self.sock.close()
+            if self.tmp_dir: os.rmdir(self.tmp_dir)
+            raise
+        self.sock.settimeout(0.2)
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="pmc-standin", daemon=True)
+        self.thread.start()
+
+    def _reply(self, mgmt_id):
+        phase = time.monotonic()
+        offset_ns = int(40 * ((phase % 8) - 4))
+        if mgmt_id == PTP_MID_CURRENT_DATA_SET: return struct.pack('>Hqq', 1, offset_ns << 16, 750 << 16)
+        if mgmt_id == PTP_MID_PORT_DATA_SET: return bytes(10) + bytes([9]) + bytes(15)
+        if mgmt_id == PTP_MID_TIME_STATUS_NP: return struct.pack('>qqiiH12si8s', offset_ns, 0, 0, 0, 0, bytes(12), 1, bytes(8))
+        return None
+
+    def _run(self):
+        while not self.stop_event.is_set():
+            try: msg, peer = self.sock.recvfrom(1500)
+            except OSError: continue
+            request = parse_ptp_mgmt(msg)
+            if not request or request[1] != PTP_ACTION_GET: continue
+            data = self._reply(request[2])
+            if data is None: continue
+            source = PTP_MGMT_HEADER.unpack_from(msg)[8] + PTP_MGMT_HEADER.unpack_from(msg)[9].to_bytes(2, 'big')
+            try: self.sock.sendto(ptp_mgmt_message(PTP_ACTION_RESPONSE, request[2], request[0], 0, source, data), peer)
+            except OSError: pass
+
+    def close(self):
+        self.stop_event.set()
+        self.thread.join(timeout=1.0)
+        self.sock.close()
+        try:
+            os.unlink(self.path)
+            if self.tmp_dir: os.rmdir(self.tmp_dir)
+        except OSError: pass
+
+class LogFollower:
+    """Follows log files or FIFOs in background threads and passes each complete line to on_line(line, source).
+
+    One thread per path, so opening a FIFO only blocks its own thread until a
+    writer appears. A FIFO is reopened when its writer goes away (e.g. a DU or
+    ptp4l restart); a file is reopened from the start when it is rotated and
+    rewound when it is truncated. A partly written last line is held back until
+    its newline arrives.
+    """
+    def __init__(self, paths, on_line, kind, name):
+        self.on_line, self.kind = on_line, kind
+        self.stop_event = threading.Event()
+        self.threads = [threading.Thread(target=self._follow, args=(path,), name=f"{name}-{i}", daemon=True) for i, path in enumerate(paths)]
+        for thread in self.threads: thread.start()
+
+    def _follow(self, path):
+        at_end, warned = True, False # Only the file present at startup is skipped to its end
+        while not self.stop_event.is_set():
+            try:
+                is_fifo = stat.S_ISFIFO(os.stat(path).st_mode)
+                f = open(path, 'rb') # Blocks until a writer opens a FIFO, which only holds up this thread
+            except OSError as e:
+                if not warned: print(f"Warning: Cannot follow {self.kind} {path}: {e}; retrying", file=sys.stderr); warned = True
+                self.stop_event.wait(LOG_REOPEN_SEC); continue
+            warned = False
+            with f:
+                if at_end and not is_fifo: f.seek(0, os.SEEK_END)
+                at_end = False
+                self._read(f, path, is_fifo)
+
+    def _read(self, f, path, is_fifo):
+        """Passes on lines until the FIFO writer closes or the file is rotated."""
+        partial, checked, source = b"", time.monotonic(), os.path.basename(path)
+        while not self.stop_event.is_set():
+            line = f.readline()
+            if not line:
+                if is_fifo: return # Writer closed the pipe
+                if time.monotonic() - checked >= LOG_REOPEN_SEC:
+                    checked = time.monotonic()
+                    try:
+                        if os.stat(path).st_ino != os.fstat(f.fileno()).st_ino: return # Rotated: reopen the new file
+                    except OSError: return
+                    if os.fstat(f.fileno()).st_size < f.tell(): f.seek(0); partial = b"" # Truncated (copytruncate)
+                time.sleep(LOG_POLL_SEC); continue
+            if not line.endswith(b'\n'): partial += line; continue
+            line, partial = (partial + line).decode('utf-8', 'replace'), b""
+            self.on_line(line.rstrip('\n'), source)
+
+    def close(self):
+        self.stop_event.set()
+        for thread in self.threads: thread.join(timeout=0.1) # FIFO readers may be blocked in open; they are daemons
+
+class PtpLogTail:
+    """Follows ptp4l/phc2sys/ts2phc stdout logs and summarises their servo lines per interval.
+
+    Lines are read by a LogFollower; the main loop takes and resets the stats.
+    """
+    def __init__(self, paths):
+        self.lock = threading.Lock()
+        self.stats = {}
+        self.follower = LogFollower(paths, self._line, "PTP log", "ptp-log")
+
+    def _line(self, line, source):
+        m = PTP_LOG_LINE.search(line)
+        if not m: return
+        daemon, offset, servo, freq, delay = m.groups()
+        with self.lock:
+            s = self.stats.setdefault(daemon, {'n': 0, 'max_abs_ns': 0})
+            s['n'] += 1; s['offset_ns'] = int(offset); s['servo'] = servo; s['freq_ppb'] = int(freq)
+            s['max_abs_ns'] = max(s['max_abs_ns'], abs(int(offset)))
+            if delay is not None: s['delay_ns'] = int(delay)
+
+    def collect(self):
+        """{daemon: {'n', 'offset_ns' (last), 'max_abs_ns', 'servo', 'freq_ppb', 'delay_ns'}} for lines since the last call."""
+        with self.lock:
+            stats, self.stats = self.stats, {}
+        return stats
+
+    def close(self):
+        self.follower.close()
+
+def ptp_lines(pmc_status, log_stats, hk_busy):
+    """PTP health per source, each with the busiest non-RT CPU of the interval for correlation."""
+    lines, warnings = [], []
+    hk = f"{hk_busy[1]:.1f}@{hk_busy[0]}" if hk_busy else "-"
+    if pmc_status is not None:
+        offset = pmc_status.get('master_offset_ns', pmc_status.get('offset_ns'))
+        lines.append(format_summary("PTP ptp4l", [
+            ("Port", pmc_status.get('port_state', "-")),
+            ("Offset_ns", f"{offset:.0f}" if offset is not None else "-"),
+            ("PathDelay_ns", f"{pmc_status['path_delay_ns']:.0f}" if 'path_delay_ns' in pmc_status else "-"),
+            ("GM", ("present" if pmc_status['gm_present'] else "absent") if 'gm_present' in pmc_status else "-"),
+            ("HK_MaxBusy%", hk),
+        ]))
+        if offset is not None and abs(offset) > PTP_OFFSET_WARN_NS: warnings.append(("ptp4l", offset))
+        if not pmc_status: warnings.append(("ptp4l", None))
+    for daemon, s in sorted(log_stats.items()):
+        lines.append(format_summary(f"PTP {daemon}", [
+            ("Offset_ns", s['offset_ns']), ("MaxAbs_ns", s['max_abs_ns']), ("Servo", s['servo']),
+            ("Freq_ppb", s['freq_ppb']), ("Delay_ns", s.get('delay_ns', "-")), ("Lines", s['n']), ("HK_MaxBusy%", hk),
+        ]))
+        if s['max_abs_ns'] > PTP_OFFSET_WARN_NS: warnings.append((daemon, s['max_abs_ns']))
+    messages = [f"Warning: {daemon} not answering on its management socket" if offset is None else
+                f"Warning: {daemon} offset {offset:.0f} ns exceeds {PTP_OFFSET_WARN_NS} ns (busiest housekeeping CPU {hk})"
+                for daemon, offset in warnings]
+    return lines, messages
+
+def parse_host_port(spec):
+    host, _, port = spec.rpartition(':')
+    return host or '0.0.0.0', int(port)
+
+def walk_srsran_metrics(node, acc, pci=None):
+    """Accumulates one srsRAN JSON report into acc, whatever the layout version.
+
+    Per-UE dicts carrying dl_brate/ul_brate are summed per cell (pci), numeric
+    *prb* fields are kept per cell, and RLC tx/rx SDU byte counts are summed.
+    """
+    if isinstance(node, list):
+        for item in node: walk_srsran_metrics(item, acc, pci)
+        return
+    if not isinstance(node, dict): return
+    pci = node.get('pci', pci)
+    cell = acc['cells'].setdefault(pci, {'dl_bps': 0.0, 'ul_bps': 0.0, 'ues': 0, 'prb': defaultdict(float)}) if pci is not None else None
+    if 'dl_brate' in node or 'ul_brate' in node:
+        target = cell if cell is not None else acc['cells'].setdefault(None, {'dl_bps': 0.0, 'ul_bps': 0.0, 'ues': 0, 'prb': defaultdict(float)})
+        target['dl_bps'] += float(node.get('dl_brate') or 0); target['ul_bps'] += float(node.get('ul_brate') or 0); target['ues'] += 1
+    for key, value in node.items():
+        if cell is not None and 'prb' in key and isinstance(value, (int, float)): cell['prb'][key] += value
+        elif key in ('tx', 'rx') and isinstance(value, dict) and 'num_sdu_bytes' in value:
+            acc['rlc_bytes'][key] += float(value['num_sdu_bytes'])
+        elif isinstance(value, (dict, list)): walk_srsran_metrics(value, acc, pci)
+
+class MetricsIngest:
+    """Receives (and optionally forwards) srsRAN's JSON metrics UDP stream.
+
+    A background thread forwards every datagram unchanged to the metrics server
+    when tee-ing, then folds it into a per-sender accumulator. The main loop takes
+    and resets the accumulators each interval, so nothing is kept across intervals.
+    """
+    def __init__(self, listen, forward):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind(parse_host_port(listen))
+        self.sock.settimeout(0.5)
+        self.forward = None
+        if forward:
+            host, port = parse_host_port(forward)
+            self.forward = (socket.gethostbyname(host), port)
+        self.lock = threading.Lock()
+        self.acc = {}
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="metrics-ingest", daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        buf = bytearray(METRICS_MAX_DATAGRAM)
+        while not self.stop_event.is_set():
+            try: length, sender = self.sock.recvfrom_into(buf)
+            except OSError: continue
+            data = bytes(buf[:length])
+            if self.forward:
+                try: self.sock.sendto(data, self.forward)
+                except OSError: pass
+            try: report = json.loads(data)
+            except ValueError: continue
+            reports = {'cells': {}, 'rlc_bytes': defaultdict(float)}
+            walk_srsran_metrics(report, reports)
+            with self.lock:
+                acc = self.acc.setdefault(sender[0], {'reports': 0, 'cells': {}, 'rlc_bytes': defaultdict(float)})
+                acc['reports'] += 1
+                for pci, cell in reports['cells'].items():
+                    total = acc['cells'].setdefault(pci, {'dl_bps': 0.0, 'ul_bps': 0.0, 'ues': 0, 'prb': defaultdict(float), 'n': 0})
+                    total['dl_bps'] += cell['dl_bps']; total['ul_bps'] += cell['ul_bps']; total['ues'] += cell['ues']; total['n'] += 1
+                    for key, value in cell['prb'].items(): total['prb'][key] += value
+                for key, value in reports['rlc_bytes'].items(): acc['rlc_bytes'][key] += value
+
+    def take(self):
+        """Returns and resets {sender: accumulator} for the reports received since the last call."""
+        with self.lock:
+            acc, self.acc = self.acc, {}
+        return acc
+
+    def close(self):
+        self.stop_event.set()
+        self.thread.join(timeout=1.0)
+        self.sock.close()
+
+class SrsLogTail:
+    """Follows srsdu/srscu log files or FIFOs and counts real-time failure warnings.
+
+    Lines are read by a LogFollower and matched with a single combined regex.
+    Each event is stamped with the srsRAN log timestamp, which srslog writes in
+    UTC (tz=None reads it as local time), or else the read time. Events are
+    optionally appended to a CSV for alignment with burst captures and can fire a
+    burst capture. The main loop takes and resets the per-interval counts.
+    """
+    def __init__(self, paths, events, csv_path=None, burst_capture=None, trigger_events=(), tz=timezone.utc):
+        self.events, self.tz = list(events), tz
+        self.pattern = re.compile("|".join(f"(?P<{name}>{regex})" for name, regex in events.items()), re.IGNORECASE)
+        self.burst_capture, self.trigger_events = burst_capture, set(trigger_events)
+        self.csv = open(csv_path, 'a', buffering=1) if csv_path else None
+        if self.csv and self.csv.tell() == 0: self.csv.write("time,read_time,event,source,line\n")
+        self.lock = threading.Lock()
+        self.stats = {}
+        self.follower = LogFollower(paths, self._line, "srsRAN log", "srs-log")
+
+    def _line(self, line, source):
+        m = self.pattern.search(line)
+        if m: self._event(m.lastgroup, line, source)
+
+    def _event(self, name, line, source):
+        read_ts = time.time()
+        m = SRS_LOG_TIMESTAMP.match(line)
+        try: ts = datetime.fromisoformat(m.group(1)).replace(tzinfo=self.tz).timestamp() if m else read_ts
+        except ValueError: ts = read_ts
+        if name in self.trigger_events and self.burst_capture: self.burst_capture.fire(f"log:{name}")
+        quoted = '"' + line.replace('"', '""') + '"'
+        with self.lock:
+            s = self.stats.setdefault(name, {'n': 0, 'first': ts, 'max_delay': 0.0})
+            s['n'] += 1; s['last'] = ts; s['max_delay'] = max(s['max_delay'], read_ts - ts)
+            if self.csv: self.csv.write(f"{ts:.6f},{read_ts:.6f},{name},{source},{quoted}\n")
+
+    def take(self):
+        """Returns and resets {event: {'n', 'first', 'last', 'max_delay'}} for events since the last call."""
+        with self.lock:
+            stats, self.stats = self.stats, {}
+        return stats
+
+    def close(self):
+        self.follower.close()
+        if self.csv: self.csv.close()
+
+def srs_log_lines(stats, sample_ts):
+    """Per-event counts with the first/last event time relative to this interval's sample."""
+    if not stats: return []
+    return [format_summary(f"srsRAN {name}", [
+        ("Count", s['n']), ("First_ms", f"{(s['first'] - sample_ts) * 1000:.1f}"),
+        ("Last_ms", f"{(s['last'] - sample_ts) * 1000:.1f}"), ("LogDelay_ms", f"{s['max_delay'] * 1000:.1f}"),
+    ]) for name, s in sorted(stats.items())]
+
+def metrics_join_lines(ingested, row_metrics, topology, cpu_roles, report_period_sec):
+    """Cell load next to CPU and energy: Mbps, UEs, PRB fields, RLC SDU rate, nJ/bit, busy CPUs per Mbps, per-role Busy%/Mbps."""
+    lines = []
+    if not ingested or not row_metrics: return lines
+    pkg_rows = {topology[c]['pkg_id']: m for c, m in row_metrics.items()}
+    watts = sum(m['pkg_watt'] + m['ram_watt'] for m in pkg_rows.values())
+    busy_cpus = sum(m['busy'] for m in row_metrics.values()) / 100.0
+    role_cpus = defaultdict(set)
+    for cpu, assignments in cpu_roles.items():
+        if cpu in row_metrics:
+            for _, role in assignments: role_cpus[role].add(cpu)
+    total_mbps = 0.0
+    for sender, acc in sorted(ingested.items()):
+        for pci, cell in sorted(acc['cells'].items(), key=lambda kv: str(kv[0])):
+            n = max(cell['n'], 1) # Each report is already an average over du_report_period
+            dl, ul = cell['dl_bps'] / n / 1e6, cell['ul_bps'] / n / 1e6
+            total_mbps += dl + ul
+            lines.append(format_summary(f"Cell {sender} pci={pci}", [
+                ("DL_Mbps", f"{dl:.2f}"), ("UL_Mbps", f"{ul:.2f}"), ("UEs", f"{cell['ues'] / n:.0f}"), ("Reports", cell['n']),
+                *[(key, f"{value / n:.1f}") for key, value in sorted(cell['prb'].items())],
+            ]))
+        if acc['rlc_bytes']:
+            span = acc['reports'] * report_period_sec
+            lines.append(format_summary(f"RLC {sender}", [(f"{key.upper()}_SDU_Mbps", f"{8 * value / span / 1e6:.2f}") for key, value in sorted(acc['rlc_bytes'].items())]))
+    fields = [("Mbps", f"{total_mbps:.2f}"),
+              ("nJ/bit", f"{watts / (total_mbps * 1e6) * 1e9:.2f}" if total_mbps > 0 else "-"),
+              ("BusyCPUs/Gbps", f"{busy_cpus / total_mbps * 1000:.2f}" if total_mbps > 0 else "-")]
+    fields += [(f"{role}_Busy%/Mbps", f"{sum(row_metrics[c]['busy'] for c in cpus) / len(cpus) / total_mbps:.3f}" if total_mbps > 0 else "-")
+               for role, cpus in sorted(role_cpus.items())]
+    lines.append(format_summary("Load", fields))
+    return lines
+
+def get_numa_node_map():
+    """Maps each CPU to its NUMA node from /sys/devices/system/node/nodeN/cpulist."""
+    node_map = {}
+    for path in glob.glob(os.path.join(NODE_BASE_PATH, 'node[0-9]*')):
+        cpulist = read_sysfs_str(os.path.join(path, 'cpulist'))
+        if not cpulist: continue
+        try:
+            node_id = int(os.path.basename(path)[4:])
+            for cpu_id in parse_cpu_list(cpulist): node_map[cpu_id] = node_id
+        except ValueError: continue
+    return node_map
+
+def get_llc_info(cpu_id):
+    """Returns (llc_id, shared CPUs) of the highest-level cache of a CPU."""
+    best_level, llc_id, shared = -1, -1, []
+    for index_dir in glob.glob(f'/sys/devices/system/cpu/cpu{cpu_id}/cache/index[0-9]*'):
+        level = read_sysfs_int(os.path.join(index_dir, 'level'))
+        cache_type = read_sysfs_str(os.path.join(index_dir, 'type'))
+        if level is None or level <= best_level or cache_type == 'Instruction': continue
+        shared_str = read_sysfs_str(os.path.join(index_dir, 'shared_cpu_list'))
+        try: shared_cpus = parse_cpu_list(shared_str) if shared_str else [cpu_id]
+        except ValueError: shared_cpus = [cpu_id]
+        cache_id = read_sysfs_int(os.path.join(index_dir, 'id'))
+        best_level, shared = level, shared_cpus
+        llc_id = cache_id if cache_id is not None else min(shared_cpus)
+    return llc_id, shared
+
 def get_cpu_topology(target_cpus):
+    """Builds the per-CPU topology: package/die/cluster/core ids, SMT siblings, LLC domain and NUMA node."""
     topology = {}
+    node_map = get_numa_node_map()
     for cpu_id in target_cpus:
-        core_id = read_sysfs_int(f'/sys/devices/system/cpu/cpu{cpu_id}/topology/core_id')
-        pkg_id = read_sysfs_int(f'/sys/devices/system/cpu/cpu{cpu_id}/topology/physical_package_id')
+        base = f'/sys/devices/system/cpu/cpu{cpu_id}/topology'
+        core_id = read_sysfs_int(f'{base}/core_id')
+        pkg_id = read_sysfs_int(f'{base}/physical_package_id')
+        die_id = read_sysfs_int(f'{base}/die_id')
+        cluster_id = read_sysfs_int(f'{base}/cluster_id')
+        siblings_str = read_sysfs_str(f'{base}/thread_siblings_list')
+        try: siblings = parse_cpu_list(siblings_str) if siblings_str else [cpu_id]
+        except ValueError: siblings = [cpu_id]
+        llc_id, llc_cpus = get_llc_info(cpu_id)
         topology[cpu_id] = {'core_id': core_id if core_id is not None else -1,
-                            'pkg_id': pkg_id if pkg_id is not None else -1}
+                            'pkg_id': pkg_id if pkg_id is not None else -1,
+                            'die_id': die_id if die_id is not None else 0,
+                            'cluster_id': cluster_id if cluster_id is not None else -1,
+                            'siblings': siblings,
+                            'llc_id': llc_id,
+                            'llc_cpus': llc_cpus,
+                            'node_id': node_map.get(cpu_id, -1)}
     return topology
 
+def topology_groups(target_cpus, topology, group_by):
+    """Orders CPUs by a topology level, returning [(label, [cpus])]; 'cpu' keeps one group per CPU."""
+    if group_by == 'cpu': return [(str(cpu_id), [cpu_id]) for cpu_id in target_cpus]
+    keys = {
+        'core': lambda t: ((t['pkg_id'], t['die_id'], t['core_id']), f"Core P{t['pkg_id']}/D{t['die_id']}/C{t['core_id']}"),
+        'die': lambda t: ((t['pkg_id'], t['die_id']), f"Die P{t['pkg_id']}/D{t['die_id']}"),
+        'llc': lambda t: ((t['pkg_id'], t['llc_id']), f"LLC P{t['pkg_id']}/L{t['llc_id']}"),
+        'node': lambda t: ((t['node_id'],), f"Node {t['node_id']}"),
+    }[group_by]
+    groups = {}
+    for cpu_id in target_cpus:
+        key, label = keys(topology[cpu_id])
+        groups.setdefault(key, (label, []))[1].append(cpu_id)
+    return [groups[key] for key in sorted(groups)]
+
+def smt_contention(delta_cpu_data, topology, rt_cpus):
+    """Returns the CPUs above SMT_BUSY_PCT that share a physical core with an RT CPU."""
+    flagged = set()
+    for cpu_id, delta in delta_cpu_data.items():
+        busy_pct = 100.0 * delta.mperf / delta.tsc if delta.tsc > 0 else 0.0
+        if busy_pct <= SMT_BUSY_PCT: continue
+        if any(sib in rt_cpus for sib in topology[cpu_id]['siblings'] if sib != cpu_id):
+            flagged.add(cpu_id)
+    return flagged
+
 def get_tjmax(cpu_id):
     tjmax = 100; msr_val = read_msr(cpu_id, MSR_IA32_TEMPERATURE_TARGET)
     if msr_val is not None:
@@ -265,6 +1398,50 @@ def find_rapl_domains():
     except Exception as e: print(f"Warning: Error finding RAPL domains: {e}")
     return domains
 
+def find_uncore_domains(target_cpus, topology, use_msr):
+    """Locates uncore frequency controls per package/die.
+
+    Prefers the intel_uncore_frequency sysfs driver (package_XX_die_YY or, on
+    TPMI systems, uncoreNN directories). Packages without a sysfs entry fall back
+    to MSR_UNCORE_PERF_STATUS/MSR_UNCORE_RATIO_LIMIT read from a representative CPU,
+    but only if a probe read succeeds, so unsupported parts don't spam warnings.
+    """
+    uncore = {'sysfs': defaultdict(list), 'msr': {}}
+    die_pattern = re.compile(r'^package_(\d+)_die_(\d+)$')
+    try:
+        if os.path.isdir(UNCORE_BASE_PATH):
+            entries = sorted(os.listdir(UNCORE_BASE_PATH))
+            for entry in entries:
+                match = die_pattern.match(entry)
+                if not match: continue
+                path = os.path.join(UNCORE_BASE_PATH, entry)
+                uncore['sysfs'][int(match.group(1))].append({
+                    'die': int(match.group(2)),
+                    'cur': os.path.join(path, 'current_freq_khz'),
+                    'min': os.path.join(path, 'min_freq_khz'),
+                    'max': os.path.join(path, 'max_freq_khz')})
+            if not uncore['sysfs']:
+                # TPMI driver: uncoreNN directories carry their own package/domain ids
+                for entry in entries:
+                    if not entry.startswith('uncore'): continue
+                    path = os.path.join(UNCORE_BASE_PATH, entry)
+                    pkg_id = read_sysfs_int(os.path.join(path, 'package_id'))
+                    domain_id = read_sysfs_int(os.path.join(path, 'domain_id'))
+                    if pkg_id is None: continue
+                    uncore['sysfs'][pkg_id].append({
+                        'die': domain_id if domain_id is not None else 0,
+                        'cur': os.path.join(path, 'current_freq_khz'),
+                        'min': os.path.join(path, 'min_freq_khz'),
+                        'max': os.path.join(path, 'max_freq_khz')})
+    except Exception as e: print(f"Warning: Error probing uncore frequency sysfs: {e}")
+    if use_msr:
+        for cpu_id in target_cpus:
+            pkg_id = topology[cpu_id]['pkg_id']
+            if pkg_id == -1 or pkg_id in uncore['sysfs'] or pkg_id in uncore['msr']: continue
+            if read_msr(cpu_id, MSR_UNCORE_PERF_STATUS) is not None:
+                uncore['msr'][pkg_id] = cpu_id
+    return uncore
+
 def get_cpuidle_state_info(cpu_id):
     state_info = {}; base_path = f'/sys/devices/system/cpu/cpu{cpu_id}/cpuidle'
     try:
@@ -307,6 +1484,246 @@ def get_effective_cpus():
         except ValueError: print(f"Warning: Could not parse CPU part '{part}' in effective CPU string '{cpu_str}' from {path_read}")
     return sorted(list(cpus))
 
+def positive_float(value):
+    """argparse type for options that must be > 0."""
+    number = float(value)
+    if not number > 0: raise argparse.ArgumentTypeError(f"must be > 0, got {value}")
+    return number
+
+def positive_int(value):
+    """argparse type for counts that must be > 0."""
+    number = int(value)
+    if number <= 0: raise argparse.ArgumentTypeError(f"must be > 0, got {value}")
+    return number
+
+def parse_cpu_list(cpu_str):
+    """Parses a Linux CPU list string such as '0,2,4-7' into a sorted list of ints."""
+    cpus = set()
+    for part in cpu_str.split(','):
+        part = part.strip().strip('"\'')
+        if not part: continue
+        if '-' in part:
+            start, end = map(int, part.split('-'))
+            cpus.update(range(start, end + 1))
+        else:
+            cpus.add(int(part))
+    return sorted(cpus)
+
+def parse_eal_lcores(eal_args):
+    """Returns the physical CPUs used by DPDK from an EAL argument string (--lcores or -l)."""
+    cpus = set()
+    match = re.search(r'--lcores[\s=]+"?([^"\s]+)', eal_args)
+    if match:
+        lcores = match.group(1)
+        mappings = re.findall(r'@(?:\(([\d,\-]+)\)|(\d+))', lcores)
+        if mappings:
+            for group, single in mappings: cpus.update(parse_cpu_list(group or single))
+        else:
+            cpus.update(parse_cpu_list(lcores.replace('(', '').replace(')', '')))
+    else:
+        match = re.search(r'(?:^|\s)-l\s*([\d,\-]+)', eal_args)
+        if match: cpus.update(parse_cpu_list(match.group(1)))
+    return sorted(cpus)
+
+def parse_gnb_config(path):
+    """Extracts the expert_execution CPU affinities and hal.eal_args lcores from a gnb config.
+
+    A line-based parse is used so the monitor does not depend on PyYAML being
+    present in the srsRAN image. Returns {'roles': {role: [cpus]}, 'nics': [pci
+    addresses]}; roles that appear several times (e.g. one ru_txrx_cpus per OFH
+    cell) are merged.
+    """
+    config = {'roles': defaultdict(list), 'nics': [], 'eal_args': None}
+    key_pattern = re.compile(r'^\s*-?\s*([A-Za-z0-9_]+)\s*:\s*(.*?)\s*$')
+    with open(path, 'r') as f:
+        for line in f:
+            if line.lstrip().startswith('#'): continue
+            match = key_pattern.match(line.split(' #')[0])
+            if not match: continue
+            key, value = match.group(1), match.group(2)
+            try:
+                if key in GNB_AFFINITY_ROLES and value:
+                    cpus = parse_cpu_list(value) # Before touching roles, so a bad value leaves no empty role behind
+                    config['roles'][key] = sorted(set(config['roles'][key]) | set(cpus))
+                elif key == 'eal_args' and value:
+                    config['eal_args'] = value.strip('"\'')
+                    lcores = parse_eal_lcores(value.strip('"\''))
+                    if lcores: config['roles'][GNB_DPDK_ROLE] = sorted(set(config['roles'][GNB_DPDK_ROLE]) | set(lcores))
+                    for bdf in re.findall(r'(?:-a|--allow|-w)\s+' + PCI_BDF_PATTERN.pattern, value):
+                        if bdf.lower() not in config['nics']: config['nics'].append(bdf.lower())
+                elif key == 'network_interface' and PCI_BDF_PATTERN.search(value):
+                    bdf = PCI_BDF_PATTERN.search(value).group(1).lower()
+                    if bdf not in config['nics']: config['nics'].append(bdf)
+            except ValueError:
+                print(f"Warning: Could not parse '{key}: {value}' in {path}", file=sys.stderr)
+    return config
+
+def gnb_tenant_name(path):
+    """Derives a tenant label from a gnb config path (e.g. charts/srsran-5g-du-3/... -> du-3)."""
+    match = re.search(r'srsran-5g-(du(?:-\d+)?|cu)', path)
+    if match: return match.group(1)
+    return os.path.splitext(os.path.basename(path))[0]
+
+def load_gnb_configs(specs):
+    """Loads gnb configs given as [TENANT=]PATH, defaulting to the local DU config if present.
+
+    PATH may be a glob (e.g. 'charts/srsran-5g-du*/resources/gnb-template.yml') to
+    load every DU at once; tenants are then named after each matching path.
+    """
+    if not specs:
+        specs = [path for path in DEFAULT_GNB_CONFIGS if os.path.exists(path)][:1]
+    configs = {}
+    for spec in specs:
+        tenant, _, pattern = spec.rpartition('=')
+        paths = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        for path in paths:
+            name = tenant if tenant and len(paths) == 1 else gnb_tenant_name(path)
+            try:
+                configs[name] = parse_gnb_config(path)
+                configs[name]['path'] = path
+            except OSError as e:
+                print(f"Warning: Cannot read gnb config {path}: {e}", file=sys.stderr)
+    return configs
+
+def gnb_role_name(role):
+    """Short role label for the report (l1_dl_cpus -> l1_dl)."""
+    return re.sub(r'_cpus?$', '', role)
+
+def gnb_cpu_roles(gnb_configs):
+    """Maps each configured CPU to its [(tenant, role)] assignments."""
+    cpu_roles = defaultdict(list)
+    for tenant, config in sorted(gnb_configs.items()):
+        for role, cpus in sorted(config['roles'].items()):
+            for cpu in cpus: cpu_roles[cpu].append((tenant, gnb_role_name(role)))
+    return cpu_roles
+
+def gnb_overlaps(cpu_roles):
+    """Returns {cpu: assignments} for CPUs claimed by more than one tenant, or by several RT roles."""
+    overlaps = {}
+    for cpu, assignments in cpu_roles.items():
+        tenants = {tenant for tenant, _ in assignments}
+        rt_roles = [(t, r) for t, r in assignments if r not in {gnb_role_name(x) for x in GNB_NON_RT_ROLES}]
+        if len(tenants) > 1 or len(rt_roles) > 1: overlaps[cpu] = assignments
+    return overlaps
+
+def print_affinity_audit(gnb_configs, cpu_roles, overlaps):
+    print("--- srsRAN Affinity Audit ---", flush=True)
+    for tenant, config in sorted(gnb_configs.items()):
+        roles = ", ".join(f"{gnb_role_name(role)}={','.join(map(str, cpus))}" for role, cpus in sorted(config['roles'].items()))
+        print(f" {tenant}:\t{roles or 'no affinities'}", flush=True)
+    for cpu, assignments in sorted(overlaps.items()):
+        print(f" Warning: CPU {cpu} is shared by " + ", ".join(f"{t}/{r}" for t, r in assignments), flush=True)
+    if not overlaps: print(" No overlapping CPU assignments.", flush=True)
+    print("-----------------------------", flush=True)
+
+def gnb_rt_cpus(gnb_configs):
+    """Returns the set of CPUs that host real-time srsRAN threads in any loaded config."""
+    rt_cpus = set()
+    for config in gnb_configs.values():
+        for role, cpus in config['roles'].items():
+            if role not in GNB_NON_RT_ROLES: rt_cpus.update(cpus)
+    return rt_cpus
+
+def gnb_tenant_cpus(config):
+    """Returns all CPUs named in a tenant's gnb config."""
+    return set(cpu for cpus in config['roles'].values() for cpu in cpus)
+
+def find_processes(names):
+    """Scans /proc/*/comm for processes whose name is in names, returning {pid: comm}."""
+    found = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit(): continue
+        comm = read_sysfs_str(f'/proc/{entry}/comm')
+        if comm in names: found[int(entry)] = comm
+    return found
+
+def match_pid_tenant(pid, gnb_configs):
+    """Attributes a process to the tenant whose configured CPUs overlap its affinity the most."""
+    try: affinity = os.sched_getaffinity(pid)
+    except OSError: return None
+    best, best_overlap = None, 0
+    for tenant, config in gnb_configs.items():
+        overlap = len(affinity & gnb_tenant_cpus(config))
+        if overlap > best_overlap: best, best_overlap = tenant, overlap
+    return best
+
+def get_pci_numa_node(bdf):
+    """NUMA node of a PCI device (VFs inherit it from their PF), or -1 if unknown."""
+    node = read_sysfs_int(os.path.join(PCI_DEVICES_PATH, bdf, 'numa_node'))
+    return node if node is not None else -1
+
+def read_hugepages_numa(pid):
+    """Sums hugepage-backed pages per node from /proc/<pid>/numa_maps."""
+    pages = defaultdict(int)
+    try:
+        with open(f'/proc/{pid}/numa_maps', 'r') as f:
+            for line in f:
+                if ' huge ' not in line: continue
+                for node, count in re.findall(r'\bN(\d+)=(\d+)', line):
+                    pages[int(node)] += int(count)
+    except OSError: pass
+    return pages
+
+def sst_cp_state(cpu_id):
+    """Asks intel-speed-select whether SST-CP (core-power) is enabled: True/False, or None when unknown."""
+    tool = shutil.which(SST_TOOL)
+    if not tool: return None
+    try:
+        out = subprocess.run([tool, '-c', str(cpu_id), 'core-power', 'info'], stdout=subprocess.PIPE,
+                             stderr=subprocess.STDOUT, text=True, timeout=5).stdout
+    except (OSError, subprocess.SubprocessError): return None
+    states = re.findall(r'^\s*enable-status:\s*(\w+)', out, re.MULTILINE) # Not clos-enable-status
+    return 'enabled' in states if states else None
+
+def get_sst_info(target_cpus, use_msr):
+    """Discovers Intel Speed Select state per CPU.
+
+    SST-BF shows up as a higher cpufreq base_frequency on the high-priority cores;
+    SST-CP (and SST-TF, which builds on it) assigns each CPU a CLOS through
+    IA32_PQR_ASSOC. RDT/resctrl uses the same register, so CLOS values only make
+    classes when intel-speed-select reports core-power as enabled. Each CPU gets a
+    'class' of HP/LP, or None when neither feature is visible.
+    """
+    sst = {'bf_enabled': False, 'cp_enabled': False, 'cp_state': None, 'cpus': {}}
+    base_khz = {cpu: read_sysfs_int(f'/sys/devices/system/cpu/cpu{cpu}/cpufreq/base_frequency') for cpu in target_cpus}
+    known_bases = {v for v in base_khz.values() if v}
+    sst['bf_enabled'] = len(known_bases) > 1
+    low_base = min(known_bases) if known_bases else None
+    for cpu in target_cpus:
+        clos = None
+        if use_msr:
+            pqr = read_msr(cpu, MSR_IA32_PQR_ASSOC)
+            if pqr is not None: clos = (pqr >> 32) & 0xFFFFFFFF
+        sst['cpus'][cpu] = {'base_mhz': base_khz[cpu] / 1000 if base_khz[cpu] else None, 'clos': clos,
+                            'bf_high': sst['bf_enabled'] and base_khz[cpu] is not None and base_khz[cpu] > low_base}
+    sst['cp_state'] = sst_cp_state(target_cpus[0]) if use_msr else None
+    sst['cp_enabled'] = sst['cp_state'] is True
+    sst['resctrl'] = os.path.exists(os.path.join(RESCTRL_PATH, 'schemata'))
+    for info in sst['cpus'].values():
+        if sst['bf_enabled']: info['class'] = 'HP' if info['bf_high'] else 'LP'
+        elif sst['cp_enabled'] and info['clos'] is not None: info['class'] = 'HP' if info['clos'] == SST_CP_HIGH_PRIO_CLOS else 'LP'
+        else: info['class'] = None
+    return sst
+
+def print_sst_info(sst, rt_cpus):
+    print("--- Intel Speed Select Info ---", flush=True)
+    print(f" SST-BF:\t{'enabled' if sst['bf_enabled'] else 'not detected'}", flush=True)
+    cp_status = {True: 'enabled', False: 'disabled'}.get(sst['cp_state'], f"unknown (needs root and {SST_TOOL})")
+    print(f" SST-CP:\t{cp_status}", flush=True)
+    if not sst['cp_enabled'] and any(info['clos'] for info in sst['cpus'].values()):
+        print(f" CLOS:\tnon-zero CLOS in use{' by RDT/resctrl' if sst['resctrl'] else ''}; not treated as SST-CP priority", flush=True)
+    hp_cpus = sorted(cpu for cpu, info in sst['cpus'].items() if info['class'] == 'HP')
+    if hp_cpus: print(f" HP CPUs:\t{','.join(map(str, hp_cpus))}", flush=True)
+    if hp_cpus and rt_cpus:
+        misplaced = sorted(cpu for cpu in rt_cpus if cpu in sst['cpus'] and sst['cpus'][cpu]['class'] != 'HP')
+        if misplaced: print(f" Warning: srsRAN RT CPUs not on high-priority cores: {','.join(map(str, misplaced))}", flush=True)
+        else: print(" All srsRAN RT CPUs are on high-priority cores.", flush=True)
+    print("-------------------------------", flush=True)
+
+def format_summary(label, fields):
+    """Formats a summary line as 'label: key=value ...' for printing after the CPU rows."""
+    return f"{label}:\t" + "\t".join(f"{key}={value}" for key, value in fields)
+
 def print_pstate_info():
     info = {'min_perf_pct_path': None, 'max_perf_pct_path': None, 'status': None, 'no_turbo': None, 'hwp_boost': None}
     if not os.path.exists(PSTATE_BASE_PATH):
@@ -324,6 +1741,85 @@ def print_pstate_info():
     print("--------------------------", flush=True)
     return info
 
+def probe_platform(cpu_id):
+    """One-time probe of frequency-related platform MSRs and CPUID leaves.
+
+    Gives the exact TSC frequency (CPUID 0x15, else the base ratio from
+    MSR_PLATFORM_INFO), the base/efficiency/min frequencies and the turbo-bin table
+    as a list of (max active cores, MHz) sorted by core count.
+    """
+    info = {'tsc_hz': None, 'tsc_source': None, 'base_mhz': None, 'max_eff_mhz': None,
+            'min_mhz': None, 'max_turbo_mhz': None, 'bus_mhz': None, 'turbo_bins': []}
+    if cpu_id is None: return info # No MSR/CPUID access
+    platform_info = read_msr(cpu_id, MSR_PLATFORM_INFO)
+    if platform_info is not None:
+        info['base_mhz'] = ((platform_info >> 8) & 0xFF) * BCLK_MHZ
+        info['max_eff_mhz'] = ((platform_info >> 40) & 0xFF) * BCLK_MHZ
+        info['min_mhz'] = ((platform_info >> 48) & 0xFF) * BCLK_MHZ
+    max_leaf = read_cpuid(cpu_id, 0)
+    freq_leaf = read_cpuid(cpu_id, CPUID_LEAF_FREQ) if max_leaf and max_leaf[0] >= CPUID_LEAF_FREQ else None
+    if freq_leaf and freq_leaf[0]:
+        info['base_mhz'] = info['base_mhz'] or (freq_leaf[0] & 0xFFFF)
+        info['max_turbo_mhz'] = (freq_leaf[1] & 0xFFFF) or None
+        info['bus_mhz'] = (freq_leaf[2] & 0xFFFF) or None
+    tsc_leaf = read_cpuid(cpu_id, CPUID_LEAF_TSC) if max_leaf and max_leaf[0] >= CPUID_LEAF_TSC else None
+    if tsc_leaf and tsc_leaf[0] and tsc_leaf[1]:
+        denominator, numerator, crystal_hz = tsc_leaf[0], tsc_leaf[1], tsc_leaf[2]
+        if crystal_hz == 0 and freq_leaf and freq_leaf[0]:
+            # SDM: crystal = CPUID.16H.EAX * 10^6 * CPUID.15H.EAX / CPUID.15H.EBX when ECX is not enumerated
+            crystal_hz = (freq_leaf[0] & 0xFFFF) * 1_000_000 * denominator / numerator
+        if crystal_hz:
+            info['tsc_hz'] = crystal_hz * numerator / denominator
+            info['tsc_source'] = 'CPUID 0x15'
+    if info['tsc_hz'] is None and platform_info is not None and info['base_mhz']:
+        info['tsc_hz'] = info['base_mhz'] * 1_000_000
+        info['tsc_source'] = 'MSR_PLATFORM_INFO'
+    ratios = read_msr(cpu_id, MSR_TURBO_RATIO_LIMIT)
+    if ratios is not None:
+        ratio_bytes = [(ratios >> (8 * i)) & 0xFF for i in range(8)]
+        cores_msr = read_msr(cpu_id, MSR_TURBO_RATIO_LIMIT_CORES)
+        core_bytes = [(cores_msr >> (8 * i)) & 0xFF for i in range(8)] if cores_msr is not None else []
+        used = [c for c in core_bytes if c]
+        if used and all(a < b for a, b in zip(used, used[1:])):
+            # SKX+: 0x1AE holds the active-core count each ratio byte applies to
+            buckets = list(zip(core_bytes, ratio_bytes))
+        else:
+            # Legacy layout: byte i of 0x1AD is the ratio for i+1 active cores (0x1AE extends to 9-16)
+            buckets = [(i + 1, r) for i, r in enumerate(ratio_bytes)]
+            buckets += [(i + 9, r) for i, r in enumerate(core_bytes)]
+        info['turbo_bins'] = sorted((cores, ratio * BCLK_MHZ) for cores, ratio in buckets if cores and ratio)
+    if info['max_turbo_mhz'] is None and info['turbo_bins']:
+        info['max_turbo_mhz'] = info['turbo_bins'][0][1]
+    return info
+
+def print_platform_info(info):
+    print("--- Platform Frequency Info ---", flush=True)
+    print(f" TSC:\t\t{info['tsc_hz'] / 1e6:.3f} MHz ({info['tsc_source']})" if info['tsc_hz'] else " TSC:\t\tN/A (using measured TSC delta)", flush=True)
+    print(f" Base:\t\t{info['base_mhz'] if info['base_mhz'] else 'N/A'} MHz", flush=True)
+    print(f" Max Eff:\t{info['max_eff_mhz'] if info['max_eff_mhz'] else 'N/A'} MHz, Min: {info['min_mhz'] if info['min_mhz'] else 'N/A'} MHz", flush=True)
+    print(f" Max Turbo:\t{info['max_turbo_mhz'] if info['max_turbo_mhz'] else 'N/A'} MHz", flush=True)
+    if info['turbo_bins']:
+        print(" Turbo bins:\t" + ", ".join(f"{cores}C={mhz}" for cores, mhz in info['turbo_bins']), flush=True)
+    print("-------------------------------", flush=True)
+
+def turbo_limit_mhz(platform, active_cores):
+    """Returns the turbo ratio limit (MHz) that applies with the given number of active cores."""
+    for cores, mhz in platform['turbo_bins']:
+        if active_cores <= cores: return mhz
+    return platform['turbo_bins'][-1][1] if platform['turbo_bins'] else None
+
+def count_active_cores(delta_cpu_data, topology):
+    """Counts physical cores per package whose busiest sibling exceeds ACTIVE_CORE_BUSY_PCT."""
+    core_busy = {}
+    for cpu_id, delta in delta_cpu_data.items():
+        busy_pct = 100.0 * delta.mperf / delta.tsc if delta.tsc > 0 else 0.0
+        key = (topology[cpu_id]['pkg_id'], topology[cpu_id]['die_id'], topology[cpu_id]['core_id'])
+        core_busy[key] = max(core_busy.get(key, 0.0), busy_pct)
+    active = defaultdict(int)
+    for (pkg_id, _, _), busy_pct in core_busy.items():
+        if busy_pct > ACTIVE_CORE_BUSY_PCT: active[pkg_id] += 1
+    return active
+
 # --- Data Structures ---
 # (CPUData, PkgData, calculate_delta_energy remain the same)
 class CPUData:
@@ -334,6 +1830,7 @@ class CPUData:
         self.mperf = 0
         self.instr_retired = 0
         self.irq_count = 0
+        self.smi_count = None
         self.core_temp = None
         self.core_throttled = False
         self.actual_mhz = None
@@ -357,6 +1854,8 @@ class CPUData:
         d.mperf = self.mperf - prev.mperf if self.mperf >= prev.mperf else (2**64 - prev.mperf) + self.mperf
         d.instr_retired = self.instr_retired - prev.instr_retired if self.instr_retired >= prev.instr_retired else (2**64 - prev.instr_retired) + self.instr_retired
         d.irq_count = self.irq_count - prev.irq_count
+        if self.smi_count is not None and prev.smi_count is not None:
+            d.smi_count = (self.smi_count - prev.smi_count) & 0xFFFFFFFF
         d.core_temp = self.core_temp
         d.core_throttled = self.core_throttled
         d.actual_mhz = self.actual_mhz
@@ -371,6 +1870,480 @@ class CPUData:
             d.cstate_time[name] = time_now - time_prev if time_now >= time_prev else (2**64 - time_prev) + time_now
         return d
 
+class NumaData:
+    def __init__(self):
+        self.timestamp = 0.0
+        self.numastat = {} # node -> {field: count}
+        self.hugepages = {} # node -> {size_kb: (total, free)}
+
+    def delta(self, prev):
+        if not isinstance(prev, NumaData) or self.timestamp <= prev.timestamp: return None
+        d = NumaData(); d.timestamp = self.timestamp - prev.timestamp
+        for node, fields in self.numastat.items():
+            prev_fields = prev.numastat.get(node, {})
+            d.numastat[node] = {name: max(0, value - prev_fields.get(name, value)) for name, value in fields.items()}
+        d.hugepages = self.hugepages
+        return d
+
+    def cross_node_pct(self):
+        """Share of page allocations served from a node other than the allocating CPU's."""
+        local = sum(fields.get('local_node', 0) for fields in self.numastat.values())
+        other = sum(fields.get('other_node', 0) for fields in self.numastat.values())
+        return 100.0 * other / (local + other) if local + other > 0 else 0.0
+
+def get_numa_counters():
+    """Reads per-node numastat counters and hugepage pools."""
+    data = NumaData(); data.timestamp = time.monotonic()
+    for path in glob.glob(os.path.join(NODE_BASE_PATH, 'node[0-9]*')):
+        try: node_id = int(os.path.basename(path)[4:])
+        except ValueError: continue
+        fields = {}
+        try:
+            with open(os.path.join(path, 'numastat'), 'r') as f:
+                for line in f:
+                    parts = line.split()
+                    if len(parts) == 2: fields[parts[0]] = int(parts[1])
+        except (OSError, ValueError): pass
+        data.numastat[node_id] = fields
+        pools = {}
+        for pool in glob.glob(os.path.join(path, 'hugepages', 'hugepages-*kB')):
+            size_kb = int(re.search(r'hugepages-(\d+)kB', pool).group(1))
+            total = read_sysfs_int(os.path.join(pool, 'nr_hugepages'))
+            free = read_sysfs_int(os.path.join(pool, 'free_hugepages'))
+            if total: pools[size_kb] = (total, free or 0)
+        data.hugepages[node_id] = pools
+    return data
+
+def du_locality(gnb_configs, node_map, numa_data, du_pids):
+    """Scores how well each DU's threads, hugepages and fronthaul NIC share a NUMA node.
+
+    The score is the mean of the fraction of the DU's CPUs on the NIC node and the
+    fraction of its hugepages there (from the srsdu process numa_maps when it can
+    be attributed, else the node's share of all in-use hugepages).
+    """
+    results = {}
+    for tenant, config in gnb_configs.items():
+        nic_nodes = {bdf: get_pci_numa_node(bdf) for bdf in config['nics']}
+        nic_node = next((node for node in nic_nodes.values() if node != -1), -1)
+        cpus = sorted(gnb_tenant_cpus(config))
+        cpu_nodes = [node_map.get(c, -1) for c in cpus]
+        known_cpu_nodes = [n for n in cpu_nodes if n != -1]
+        pages = defaultdict(int)
+        for pid, pid_tenant in du_pids.items():
+            if pid_tenant == tenant:
+                for node, count in read_hugepages_numa(pid).items(): pages[node] += count
+        huge_source = 'process'
+        if not pages:
+            huge_source = 'system'
+            for node, pools in numa_data.hugepages.items():
+                pages[node] = sum(total - free for total, free in pools.values())
+        components = []
+        if nic_node != -1 and known_cpu_nodes:
+            components.append(sum(1 for n in known_cpu_nodes if n == nic_node) / len(known_cpu_nodes))
+        if nic_node != -1 and sum(pages.values()) > 0:
+            components.append(pages.get(nic_node, 0) / sum(pages.values()))
+        results[tenant] = {'nic_nodes': nic_nodes, 'nic_node': nic_node,
+                           'cpu_nodes': dict(zip(cpus, cpu_nodes)), 'hugepages': dict(pages),
+                           'huge_source': huge_source,
+                           'score': 100.0 * sum(components) / len(components) if components else None}
+    return results
+
+def numa_summaries(numa_delta, locality):
+    """Cross-node allocation indicator for the interval plus one locality line per DU."""
+    lines = []
+    misses = sum(fields.get('numa_miss', 0) for fields in numa_delta.numastat.values())
+    foreign = sum(fields.get('numa_foreign', 0) for fields in numa_delta.numastat.values())
+    lines.append(format_summary("NUMA", [
+        ("XNode%", f"{numa_delta.cross_node_pct():.2f}"),
+        ("numa_miss", misses), ("numa_foreign", foreign),
+        ("Huge(used/total)", " ".join(
+            f"N{node}:{sum(t - f for t, f in pools.values())}/{sum(t for t, _ in pools.values())}"
+            for node, pools in sorted(numa_delta.hugepages.items())) or "-"),
+    ]))
+    for tenant, info in sorted(locality.items()):
+        cpu_nodes = defaultdict(int)
+        for node in info['cpu_nodes'].values(): cpu_nodes[node] += 1
+        lines.append(format_summary(f"Locality {tenant}", [
+            ("Score%", f"{info['score']:.0f}" if info['score'] is not None else "-"),
+            ("NIC", " ".join(f"{bdf}@N{node}" for bdf, node in info['nic_nodes'].items()) or "-"),
+            ("CPUs", " ".join(f"N{node}:{count}" for node, count in sorted(cpu_nodes.items())) or "-"),
+            (f"Huge({info['huge_source']})", " ".join(f"N{node}:{count}" for node, count in sorted(info['hugepages'].items())) or "-"),
+        ]))
+    return lines
+
+# --- cgroup v2 CPU Accounting ---
+def find_pod_cgroup(pid):
+    """cgroup v2 directory of the pod running pid (or of the process itself outside Kubernetes)."""
+    try:
+        with open(f'/proc/{pid}/cgroup', 'r') as f:
+            rel = next((line.strip()[3:] for line in f if line.startswith('0::')), None)
+    except OSError: return None
+    if rel is None: return None
+    parts = [p for p in rel.split('/') if p]
+    for i in range(len(parts), 0, -1):
+        if CGROUP_POD_PATTERN.search(parts[i - 1]): parts = parts[:i]; break
+    path = os.path.join(CGROUP_ROOT, *parts)
+    return path if os.path.exists(os.path.join(path, 'cpu.stat')) else None
+
+def find_pod_cgroups(gnb_configs):
+    """Maps DU/CU/UPF pods to their cgroup, labelling DUs by tenant when known."""
+    cgroups = {}
+    for kind, names in CGROUP_POD_PROCESSES:
+        for pid in sorted(find_processes(names)):
+            path = find_pod_cgroup(pid)
+            if path is None or path in cgroups.values(): continue
+            tenant = match_pid_tenant(pid, gnb_configs) if kind == 'du' and gnb_configs else None
+            label = tenant or f"{kind}-{pid}"
+            cgroups[label] = path
+    return cgroups
+
+class CgroupData:
+    def __init__(self):
+        self.timestamp = 0.0
+        self.stat = {} # cpu.stat field -> value
+        self.cpu_max = None # Raw cpu.max ("max 100000" when the quota is disabled)
+
+    def delta(self, prev):
+        if not isinstance(prev, CgroupData) or self.timestamp <= prev.timestamp: return None
+        d = CgroupData(); d.timestamp = self.timestamp - prev.timestamp; d.cpu_max = self.cpu_max
+        d.stat = {name: max(0, value - prev.stat.get(name, value)) for name, value in self.stat.items()}
+        return d
+
+def get_cgroup_counters(pod_cgroups):
+    """Reads cpu.stat and cpu.max for each pod cgroup."""
+    data = {}
+    for label, path in pod_cgroups.items():
+        c = CgroupData(); c.timestamp = time.monotonic()
+        try:
+            with open(os.path.join(path, 'cpu.stat'), 'r') as f:
+                for line in f:
+                    parts = line.split()
+                    if len(parts) == 2 and parts[0] in CGROUP_STAT_FIELDS: c.stat[parts[0]] = int(parts[1])
+        except (OSError, ValueError): continue # Pod went away; dropped until the next refresh
+        c.cpu_max = read_sysfs_str(os.path.join(path, 'cpu.max'))
+        data[label] = c
+    return data
+
+def cgroup_summaries(current, prev):
+    """One line per pod with CPU usage over the interval, plus throttling warnings."""
+    lines, warnings = [], []
+    for label in sorted(current):
+        d = current[label].delta(prev.get(label))
+        if d is None: continue
+        interval_us = d.timestamp * 1_000_000
+        usage = d.stat.get('usage_usec', 0)
+        lines.append(format_summary(f"Cgroup {label}", [
+            ("CPUs", f"{usage / interval_us:.2f}" if interval_us > 0 else "-"),
+            ("User%", f"{100.0 * d.stat.get('user_usec', 0) / usage:.1f}" if usage else "-"),
+            ("Sys%", f"{100.0 * d.stat.get('system_usec', 0) / usage:.1f}" if usage else "-"),
+            ("nr_throttled", d.stat.get('nr_throttled', 0)),
+            ("Thrtl_ms", f"{d.stat.get('throttled_usec', 0) / 1000:.1f}"),
+            ("cpu.max", (d.cpu_max or "-").replace(' ', '/')),
+        ]))
+        if d.stat.get('nr_throttled', 0) > 0:
+            warnings.append(f"Warning: cgroup {label} was CFS-throttled {d.stat['nr_throttled']} times "
+                            f"({d.stat.get('throttled_usec', 0) / 1000:.1f} ms); cpu.max is '{d.cpu_max}', "
+                            f"check the cpu-quota.crio.io annotation")
+    return lines, warnings
+
+# --- Pressure Stall Information ---
+def pressure_sources(pod_cgroups):
+    """PSI files to watch: system-wide ones plus cpu/memory.pressure of each pod cgroup."""
+    sources = {'system': {r: os.path.join(PRESSURE_PATH, r) for r in PSI_RESOURCES}}
+    for label, path in pod_cgroups.items():
+        sources[label] = {r: os.path.join(path, f'{r}.pressure') for r in PSI_CGROUP_RESOURCES}
+    return sources
+
+class PressureData:
+    def __init__(self):
+        self.timestamp = 0.0
+        self.totals = {} # label -> {resource: {'some'|'full': stall usec}}
+
+    def delta(self, prev):
+        if not isinstance(prev, PressureData) or self.timestamp <= prev.timestamp: return None
+        d = PressureData(); d.timestamp = self.timestamp - prev.timestamp
+        for label, resources in self.totals.items():
+            if label not in prev.totals: continue
+            d.totals[label] = {}
+            for resource, kinds in resources.items():
+                prev_kinds = prev.totals[label].get(resource, {})
+                d.totals[label][resource] = {k: max(0, v - prev_kinds.get(k, v)) for k, v in kinds.items()}
+        return d
+
+class PressureReader:
+    """Keeps PSI files open and rereads the cumulative stall totals with pread."""
+    def __init__(self):
+        self.fds = {} # (label, resource) -> fd
+
+    def set_sources(self, sources):
+        wanted = {(label, r): path for label, resources in sources.items() for r, path in resources.items()}
+        for key in list(self.fds):
+            if key not in wanted: os.close(self.fds.pop(key))
+        for key, path in wanted.items():
+            if key in self.fds: continue
+            try: self.fds[key] = os.open(path, os.O_RDONLY)
+            except OSError: pass # No PSI (kernel without CONFIG_PSI or psi=0) or pod gone
+
+    def close(self):
+        for fd in self.fds.values(): os.close(fd)
+        self.fds = {}
+
+    def sample(self):
+        data = PressureData(); data.timestamp = time.monotonic()
+        for (label, resource), fd in list(self.fds.items()):
+            try: raw = os.pread(fd, PROC_READ_SIZE, 0)
+            except OSError: os.close(self.fds.pop((label, resource))); continue
+            kinds = {}
+            for line in raw.splitlines():
+                kind, _, rest = line.partition(b' ')
+                idx = rest.find(b'total=')
+                if idx != -1: kinds[kind.decode()] = int(rest[idx + 6:])
+            data.totals.setdefault(label, {})[resource] = kinds
+        return data
+
+def pressure_summaries(pressure_delta):
+    """Stall time over the interval per source, as % of wall time and in ms."""
+    lines = []
+    interval_us = pressure_delta.timestamp * 1_000_000
+    for label in sorted(pressure_delta.totals, key=lambda l: (l != 'system', l)):
+        fields = []
+        for resource in PSI_RESOURCES:
+            for kind, stall_us in sorted(pressure_delta.totals[label].get(resource, {}).items(), key=lambda kv: kv[0] != 'some'):
+                if resource == 'cpu' and kind == 'full' and label == 'system': continue # Always 0 system-wide
+                fields.append((f"{resource}_{kind}%", f"{100.0 * stall_us / interval_us:.2f}" if interval_us > 0 else "-"))
+                fields.append((f"{resource}_{kind}_ms", f"{stall_us / 1000:.1f}"))
+        if fields: lines.append(format_summary(f"PSI {label}", fields))
+    return lines
+
+class TaskData:
+    def __init__(self):
+        self.timestamp = 0.0
+        self.pid = 0
+        self.tid = 0
+        self.comm = None
+        self.cpu = -1 # CPU the task last ran on
+        self.ticks = 0 # utime + stime
+        self.run_ns = 0
+        self.wait_ns = 0 # Run-queue delay
+        self.timeslices = 0
+        self.vcsw = 0
+        self.nvcsw = 0
+
+    def delta(self, prev):
+        if not isinstance(prev, TaskData) or self.timestamp <= prev.timestamp: return None
+        d = TaskData(); d.timestamp = self.timestamp - prev.timestamp
+        d.pid, d.tid, d.comm, d.cpu = self.pid, self.tid, self.comm, self.cpu
+        d.ticks = max(0, self.ticks - prev.ticks)
+        d.run_ns = max(0, self.run_ns - prev.run_ns)
+        d.wait_ns = max(0, self.wait_ns - prev.wait_ns)
+        d.timeslices = max(0, self.timeslices - prev.timeslices)
+        d.vcsw = max(0, self.vcsw - prev.vcsw)
+        d.nvcsw = max(0, self.nvcsw - prev.nvcsw)
+        return d
+
+    def cpu_ns(self):
+        """On-CPU time, from schedstat when available, else from utime+stime ticks."""
+        return self.run_ns if self.run_ns else self.ticks * 1_000_000_000 // CLK_TCK
+
+def parse_task_stat(raw):
+    """Returns (comm, utime+stime ticks, last CPU) from a /proc/.../stat line."""
+    text = raw.decode('ascii', 'replace')
+    comm_start, comm_end = text.find('('), text.rfind(')')
+    fields = text[comm_end + 2:].split()
+    # fields[0] is field 3 (state): utime=14, stime=15, processor=39
+    return text[comm_start + 1:comm_end], int(fields[11]) + int(fields[12]), int(fields[36])
+
+class TaskReader:
+    """Incremental reader of per-thread stats for a set of processes.
+
+    Keeps /proc/<pid>/task/<tid>/{stat,schedstat,status} open between intervals
+    and rereads them with pread, only listing task directories to pick up new
+    threads. Dead threads are dropped when their files stop reading.
+    """
+    def __init__(self):
+        self.pids = {} # pid -> tenant label (or None)
+        self.fds = {} # tid -> (pid, stat_fd, schedstat_fd, status_fd)
+
+    def set_pids(self, pids):
+        for pid in list(self.pids):
+            if pid not in pids: del self.pids[pid]
+        self.pids.update(pids)
+        for tid, (pid, *_) in list(self.fds.items()):
+            if pid not in self.pids: self._close(tid)
+
+    def _open(self, pid, tid):
+        base = f'/proc/{pid}/task/{tid}'
+        fds = []
+        for name in ('stat', 'schedstat', 'status'):
+            try: fds.append(os.open(f'{base}/{name}', os.O_RDONLY))
+            except OSError: fds.append(None)
+        if fds[0] is None:
+            for fd in fds:
+                if fd is not None: os.close(fd)
+            return
+        self.fds[tid] = (pid, *fds)
+
+    def _close(self, tid):
+        for fd in self.fds.pop(tid, (None,))[1:]:
+            if fd is not None: os.close(fd)
+
+    def close(self):
+        for tid in list(self.fds): self._close(tid)
+
+    def sample(self):
+        timestamp = time.monotonic()
+        for pid in list(self.pids):
+            try: tids = os.listdir(f'/proc/{pid}/task')
+            except OSError: del self.pids[pid]; continue
+            for tid_str in tids:
+                tid = int(tid_str)
+                if tid not in self.fds: self._open(pid, tid)
+        tasks = {}
+        for tid, (pid, stat_fd, schedstat_fd, status_fd) in list(self.fds.items()):
+            try:
+                raw = os.pread(stat_fd, PROC_READ_SIZE, 0)
+                if not raw: raise ProcessLookupError
+                data = TaskData(); data.timestamp = timestamp; data.pid = pid; data.tid = tid
+                data.comm, data.ticks, data.cpu = parse_task_stat(raw)
+                if schedstat_fd is not None:
+                    run_ns, wait_ns, slices = os.pread(schedstat_fd, PROC_READ_SIZE, 0).split()[:3]
+                    data.run_ns, data.wait_ns, data.timeslices = int(run_ns), int(wait_ns), int(slices)
+                if status_fd is not None:
+                    status = os.pread(status_fd, 2 * PROC_READ_SIZE, 0)
+                    idx = status.find(b'voluntary_ctxt_switches:')
+                    if idx != -1: data.vcsw = int(status[idx + 24:status.find(b'\n', idx)])
+                    idx = status.find(b'nonvoluntary_ctxt_switches:')
+                    if idx != -1: data.nvcsw = int(status[idx + 27:status.find(b'\n', idx)])
+                tasks[tid] = data
+            except (OSError, ValueError, IndexError):
+                self._close(tid)
+        return tasks
+
+class IntrusionScanner:
+    """Finds non-allowlisted threads that ran on the watched CPUs during each interval.
+
+    Each scan opens, reads and closes every process's /proc/<pid>/stat (and
+    schedstat), so no descriptors are held between intervals. A single-threaded
+    process, which covers most kernel threads, is fully described by those two
+    files. The task directory of a multi-threaded process is only walked when its
+    group utime+stime moved, so idle processes cost one read.
+    Run time is charged to the CPU the thread last ran on; this is exact for
+    per-CPU kthreads and pinned threads and approximate for migrating ones.
+    """
+    def __init__(self, cpus, allow_patterns):
+        self.cpus = set(cpus)
+        self.allow = [re.compile(p) for p in allow_patterns]
+        self.group_ticks = {} # pid -> utime+stime of the whole thread group
+        self.run_ns = {} # tid -> last seen run time (ns)
+        self.pid_tids = {} # pid -> tids tracked in run_ns
+        self.primed = False
+
+    def _allowed(self, comm, pid, allowed_pids):
+        return pid in allowed_pids or pid == os.getpid() or any(p.search(comm) for p in self.allow)
+
+    def _read_task(self, pid, tid):
+        """Reads (comm, cpu, run_ns) of one thread with a one-off open."""
+        base = f'/proc/{pid}/task/{tid}'
+        with open(f'{base}/stat', 'rb') as f: comm, ticks, cpu = parse_task_stat(f.read())
+        try:
+            with open(f'{base}/schedstat', 'rb') as f: run_ns = int(f.read().split()[0])
+        except (OSError, ValueError, IndexError): run_ns = ticks * 1_000_000_000 // CLK_TCK
+        return comm, cpu, run_ns
+
+    def _charge(self, intruders, comm, pid, tid, cpu, run_ns, allowed_pids):
+        prev = self.run_ns.get(tid, 0 if self.primed else run_ns) # Threads born mid-interval count from zero
+        self.run_ns[tid] = run_ns
+        ran = run_ns - prev
+        if ran > 0 and cpu in self.cpus and not self._allowed(comm, pid, allowed_pids):
+            intruders[cpu].append((ran, comm, pid, tid))
+
+    def scan(self, allowed_pids):
+        intruders = defaultdict(list)
+        live_pids = set()
+        for entry in os.listdir('/proc'):
+            if not entry.isdigit(): continue
+            pid = int(entry)
+            live_pids.add(pid)
+            try:
+                with open(f'/proc/{pid}/stat', 'rb') as f: raw = f.read(PROC_READ_SIZE)
+                if not raw: raise ProcessLookupError
+                comm, ticks, cpu = parse_task_stat(raw)
+                num_threads = int(raw[raw.rfind(b')') + 2:].split()[17]) # Field 20
+                if num_threads == 1:
+                    try:
+                        with open(f'/proc/{pid}/schedstat', 'rb') as f: run_ns = int(f.read(PROC_READ_SIZE).split()[0])
+                    except (OSError, ValueError, IndexError): run_ns = ticks * 1_000_000_000 // CLK_TCK
+                    self._charge(intruders, comm, pid, pid, cpu, run_ns, allowed_pids)
+                    self._set_tids(pid, {pid})
+                elif self.group_ticks.get(pid) != ticks:
+                    tids = set()
+                    for tid_str in os.listdir(f'/proc/{pid}/task'):
+                        try:
+                            t_comm, t_cpu, t_run_ns = self._read_task(pid, int(tid_str))
+                            self._charge(intruders, t_comm, pid, int(tid_str), t_cpu, t_run_ns, allowed_pids)
+                            tids.add(int(tid_str))
+                        except (OSError, ValueError, IndexError): continue
+                    self._set_tids(pid, tids)
+                self.group_ticks[pid] = ticks
+            except (OSError, ValueError, IndexError):
+                self._forget(pid)
+        for pid in list(self.group_ticks):
+            if pid not in live_pids: self._forget(pid)
+        self.primed = True
+        for entries in intruders.values(): entries.sort(reverse=True)
+        return intruders
+
+    def _set_tids(self, pid, tids):
+        for tid in self.pid_tids.get(pid, set()) - tids: self.run_ns.pop(tid, None)
+        self.pid_tids[pid] = tids
+
+    def _forget(self, pid):
+        self.group_ticks.pop(pid, None)
+        self._set_tids(pid, set())
+        self.pid_tids.pop(pid, None)
+
+    def close(self):
+        for pid in list(self.group_ticks): self._forget(pid)
+
+def intrusion_lines(intruders, target_cpus, limit=INTRUDERS_PER_CPU):
+    lines = []
+    for cpu_id in target_cpus:
+        for ran_ns, comm, pid, tid in intruders.get(cpu_id, [])[:limit]:
+            lines.append(format_summary(f"Intruder {cpu_id}", [
+                ("comm", comm), ("pid/tid", f"{pid}/{tid}"), ("runtime_ms", f"{ran_ns / 1e6:.3f}")]))
+    return lines
+
+def task_deltas(current_tasks, prev_tasks):
+    deltas = {}
+    for tid, task in current_tasks.items():
+        if tid in prev_tasks:
+            d = task.delta(prev_tasks[tid])
+            if d is not None: deltas[tid] = d
+    return deltas
+
+def attribute_tasks(delta_tasks):
+    """Groups thread deltas by last-run CPU, busiest first: {cpu: [(cpu%, task)]}."""
+    per_cpu = defaultdict(list)
+    for task in delta_tasks.values():
+        share = 100.0 * task.cpu_ns() / (task.timestamp * 1e9) if task.timestamp > 0 else 0.0
+        per_cpu[task.cpu].append((share, task))
+    for entries in per_cpu.values(): entries.sort(key=lambda x: -x[0])
+    return per_cpu
+
+def thread_table(per_cpu_tasks, pid_tenants, target_cpus):
+    """Per-thread lines for the monitored CPUs: CPU share, context switches and run-queue delay."""
+    lines = []
+    for cpu_id in target_cpus:
+        for share, task in per_cpu_tasks.get(cpu_id, []):
+            if share < 0.01 and not task.nvcsw: continue
+            lines.append(format_summary(f"Thread {cpu_id}", [
+                ("comm", task.comm), ("pid/tid", f"{task.pid}/{task.tid}"),
+                ("tenant", pid_tenants.get(task.pid) or "-"),
+                ("CPU%", f"{share:.2f}"), ("vcsw", task.vcsw), ("nvcsw", task.nvcsw),
+                ("RunDly_ms", f"{task.wait_ns / 1e6:.3f}"),
+            ]))
+    return lines
+
 def calculate_delta_energy(current_uj, prev_uj, max_range_uj):
     if max_range_uj is None or max_range_uj <= 0: max_range_uj = 2**63
     if current_uj >= prev_uj: delta = current_uj - prev_uj
@@ -386,6 +2359,20 @@ class PkgData:
         self.energy_dram_uj = 0
         self.max_energy_pkg_uj = 0
         self.max_energy_dram_uj = 0
+        self.tsc = 0 # From the representative CPU, to turn package C-state residency into %
+        self.pkg_c2 = None
+        self.pkg_c6 = None
+        # Uncore frequency per die (die_id -> MHz)
+        self.uncore_cur_mhz = {}
+        self.uncore_min_mhz = {}
+        self.uncore_max_mhz = {}
+
+     def uncore_for_die(self, die_id):
+        """Returns (cur, min, max) uncore MHz for a die, falling back to the first die reported."""
+        if die_id not in self.uncore_cur_mhz:
+            if not self.uncore_cur_mhz: return None, None, None
+            die_id = min(self.uncore_cur_mhz)
+        return self.uncore_cur_mhz.get(die_id), self.uncore_min_mhz.get(die_id), self.uncore_max_mhz.get(die_id)
 
      def delta(self, prev):
         if not isinstance(prev, PkgData) or self.timestamp <= prev.timestamp: return None
@@ -396,12 +2383,36 @@ class PkgData:
         d.energy_dram_uj = calculate_delta_energy(self.energy_dram_uj, prev.energy_dram_uj, self.max_energy_dram_uj)
         d.max_energy_pkg_uj = self.max_energy_pkg_uj
         d.max_energy_dram_uj = self.max_energy_dram_uj
+        d.tsc = self.tsc - prev.tsc
+        d.pkg_c2 = self.pkg_c2 - prev.pkg_c2 if self.pkg_c2 is not None and prev.pkg_c2 is not None else None
+        d.pkg_c6 = self.pkg_c6 - prev.pkg_c6 if self.pkg_c6 is not None and prev.pkg_c6 is not None else None
+        d.uncore_cur_mhz = self.uncore_cur_mhz
+        d.uncore_min_mhz = self.uncore_min_mhz
+        d.uncore_max_mhz = self.uncore_max_mhz
         return d
 
 
 # --- Data Collection ---
 # (get_all_counters remains largely the same, reads MSR 0x309)
-def get_all_counters(target_cpus, topology, tjmax, rapl_domains_info, cpuidle_state_info, pstate_paths):
+def read_uncore_freqs(p_data, pkg_id, uncore_info):
+    """Fills the uncore cur/min/max MHz of one package from sysfs or, failing that, MSRs."""
+    for domain in uncore_info['sysfs'].get(pkg_id, []):
+        cur_khz = read_sysfs_int(domain['cur'])
+        min_khz = read_sysfs_int(domain['min'])
+        max_khz = read_sysfs_int(domain['max'])
+        p_data.uncore_cur_mhz[domain['die']] = cur_khz / 1000 if cur_khz is not None else None
+        p_data.uncore_min_mhz[domain['die']] = min_khz / 1000 if min_khz is not None else None
+        p_data.uncore_max_mhz[domain['die']] = max_khz / 1000 if max_khz is not None else None
+    rep_cpu = uncore_info['msr'].get(pkg_id)
+    if rep_cpu is not None:
+        perf_status = read_msr(rep_cpu, MSR_UNCORE_PERF_STATUS)
+        ratio_limit = read_msr(rep_cpu, MSR_UNCORE_RATIO_LIMIT)
+        # 0x621 bits 6:0 = current ratio; 0x620 bits 6:0 = max ratio, bits 14:8 = min ratio
+        p_data.uncore_cur_mhz[0] = (perf_status & UNCORE_RATIO_MASK) * BCLK_MHZ if perf_status is not None else None
+        p_data.uncore_max_mhz[0] = (ratio_limit & UNCORE_RATIO_MASK) * BCLK_MHZ if ratio_limit is not None else None
+        p_data.uncore_min_mhz[0] = ((ratio_limit >> 8) & UNCORE_RATIO_MASK) * BCLK_MHZ if ratio_limit is not None else None
+
+def get_all_counters(target_cpus, topology, tjmax, rapl_domains_info, cpuidle_state_info, pstate_paths, uncore_info, pkg_cstates=False, smi=False):
     current_irqs = parse_interrupts()
     timestamp = time.monotonic()
     cpu_data = {cpu: CPUData() for cpu in target_cpus}
@@ -424,6 +2435,10 @@ def get_all_counters(target_cpus, topology, tjmax, rapl_domains_info, cpuidle_st
             if pkg_therm_stat is not None:
                 p_data.pkg_temp = tjmax - ((pkg_therm_stat >> 16) & 0x7F)
             pkgs_visited_for_temps.add(pkg_id)
+        if pkg_cstates:
+            p_data.tsc = read_msr(rep_cpu, MSR_IA32_TSC) or 0
+            p_data.pkg_c2 = read_msr(rep_cpu, MSR_PKG_C2_RESIDENCY)
+            p_data.pkg_c6 = read_msr(rep_cpu, MSR_PKG_C6_RESIDENCY)
         if pkg_id not in pkgs_visited_for_rapl:
             pkg_rapl_info, dram_rapl_info = None, None
             for domain in rapl_domains_info.get('pkg', []):
@@ -441,6 +2456,7 @@ def get_all_counters(target_cpus, topology, tjmax, rapl_domains_info, cpuidle_st
                 p_data.max_energy_dram_uj = read_sysfs_int(dram_rapl_info['max_path'])
                 p_data.energy_dram_uj = read_sysfs_int(dram_rapl_info['path']) or 0
             pkgs_visited_for_rapl.add(pkg_id)
+        read_uncore_freqs(p_data, pkg_id, uncore_info)
     cores_visited_for_temps = set()
     for cpu_id in target_cpus:
         data = cpu_data[cpu_id]; data.timestamp = timestamp
@@ -449,6 +2465,8 @@ def get_all_counters(target_cpus, topology, tjmax, rapl_domains_info, cpuidle_st
         data.mperf = read_msr(cpu_id, MSR_IA32_MPERF) or 0
         data.instr_retired = read_msr(cpu_id, MSR_IA32_FIXED_CTR0) or 0 # Read Inst Retired MSR
         data.irq_count = current_irqs.get(cpu_id, 0)
+        smi_count = read_msr(cpu_id, MSR_SMI_COUNT) if smi else None
+        data.smi_count = smi_count & 0xFFFFFFFF if smi_count is not None else None
         act_mhz_khz = read_sysfs_int(f'/sys/devices/system/cpu/cpu{cpu_id}/cpufreq/scaling_cur_freq')
         data.actual_mhz = act_mhz_khz / 1000 if act_mhz_khz is not None else None
         data.governor = read_sysfs_str(f'/sys/devices/system/cpu/cpu{cpu_id}/cpufreq/scaling_governor')
@@ -477,14 +2495,513 @@ def get_all_counters(target_cpus, topology, tjmax, rapl_domains_info, cpuidle_st
     return cpu_data, pkg_data
 
 
+# --- Summaries ---
+def estimate_cpu_watts(row_metrics, topology):
+    """Splits each package's PkgWatt across its CPUs in proportion to their APERF (C0 cycles) delta."""
+    pkg_aperf = defaultdict(int)
+    for cpu_id, metrics in row_metrics.items(): pkg_aperf[topology[cpu_id]['pkg_id']] += metrics['aperf']
+    watts = {}
+    for cpu_id, metrics in row_metrics.items():
+        total = pkg_aperf[topology[cpu_id]['pkg_id']]
+        watts[cpu_id] = metrics['pkg_watt'] * metrics['aperf'] / total if total > 0 else 0.0
+    return watts
+
+class EnergyAttributor:
+    """Splits package and DRAM energy across tenants and roles each interval.
+
+    Each package's energy above its idle floor (the lowest power seen in earlier
+    intervals) is shared by CPU activity: the APERF delta (C0 residency x frequency),
+    averaged with the instruction share when the fixed counter runs. A CPU claimed by
+    several roles splits its share evenly; unassigned CPUs go to 'other' and the
+    floor to 'idle'. Joules are also accumulated since start.
+    """
+    def __init__(self, cpu_roles):
+        self.cpu_roles = cpu_roles
+        self.floor_watts = {} # pkg -> (pkg W, RAM W)
+        self.total_j = defaultdict(float)
+
+    def _weights(self, cpus, row_metrics):
+        aperf = sum(row_metrics[c]['aperf'] for c in cpus)
+        instr = sum(row_metrics[c]['instr'] for c in cpus)
+        weights = {}
+        for c in cpus:
+            w = row_metrics[c]['aperf'] / aperf if aperf > 0 else 1.0 / len(cpus)
+            if instr > 0: w = (w + row_metrics[c]['instr'] / instr) / 2
+            weights[c] = w
+        return weights
+
+    def attribute(self, row_metrics, topology):
+        """Returns (interval seconds, {label: (pkg J, RAM J)}) with tenant, tenant/role, 'other' and 'idle' labels."""
+        pkgs = defaultdict(list)
+        for cpu_id in row_metrics: pkgs[topology[cpu_id]['pkg_id']].append(cpu_id)
+        shares = defaultdict(lambda: [0.0, 0.0])
+        interval = 0.0
+        for pkg_id, cpus in pkgs.items():
+            first = row_metrics[cpus[0]]
+            interval = max(interval, first['interval'])
+            pkg_w, ram_w = first['pkg_watt'], first['ram_watt']
+            floor_pkg, floor_ram = self.floor_watts.get(pkg_id, (0.0, 0.0))
+            floor_pkg, floor_ram = min(floor_pkg, pkg_w), min(floor_ram, ram_w)
+            shares['idle'][0] += floor_pkg * first['interval']; shares['idle'][1] += floor_ram * first['interval']
+            active_pkg_j, active_ram_j = (pkg_w - floor_pkg) * first['interval'], (ram_w - floor_ram) * first['interval']
+            for cpu_id, w in self._weights(cpus, row_metrics).items():
+                assignments = self.cpu_roles.get(cpu_id) or [('other', None)]
+                for tenant, role in assignments:
+                    labels = [tenant] + ([f"{tenant}/{gnb_role_name(role)}"] if role else [])
+                    for label in labels:
+                        shares[label][0] += active_pkg_j * w / len(assignments)
+                        shares[label][1] += active_ram_j * w / len(assignments)
+            prev_floor = self.floor_watts.get(pkg_id)
+            self.floor_watts[pkg_id] = (pkg_w, ram_w) if prev_floor is None else (min(prev_floor[0], pkg_w), min(prev_floor[1], ram_w))
+        for label, (pkg_j, ram_j) in shares.items(): self.total_j[label] += pkg_j + ram_j
+        return interval, {label: tuple(v) for label, v in shares.items()}
+
+def energy_summaries(attributor, energy):
+    """Per-tenant lines (each followed by its roles), then 'other' and 'idle'."""
+    interval, shares = energy
+    total = sum(pkg_j + ram_j for label, (pkg_j, ram_j) in shares.items() if '/' not in label)
+    lines = []
+    for label in sorted(shares, key=lambda l: (l in ('other', 'idle'), l == 'idle', l)):
+        pkg_j, ram_j = shares[label]
+        lines.append(format_summary(f"Energy {label}", [
+            ("Pkg_J", f"{pkg_j:.2f}"), ("RAM_J", f"{ram_j:.2f}"),
+            ("Watt", f"{(pkg_j + ram_j) / interval:.2f}" if interval > 0 else "-"),
+            ("Share%", f"{100.0 * (pkg_j + ram_j) / total:.1f}" if total > 0 else "-"),
+            ("Total_J", f"{attributor.total_j[label]:.0f}"),
+        ]))
+    return lines
+
+def solve_linear(a, b):
+    """Solves a x = b by Gaussian elimination with partial pivoting (a is small and dense)."""
+    n = len(b)
+    m = [list(row) + [b[i]] for i, row in enumerate(a)]
+    for col in range(n):
+        pivot = max(range(col, n), key=lambda r: abs(m[r][col]))
+        if abs(m[pivot][col]) < 1e-12: return None
+        m[col], m[pivot] = m[pivot], m[col]
+        for r in range(col + 1, n):
+            f = m[r][col] / m[col][col]
+            for k in range(col, n + 1): m[r][k] -= f * m[col][k]
+    x = [0.0] * n
+    for r in range(n - 1, -1, -1):
+        x[r] = (m[r][n] - sum(m[r][k] * x[k] for k in range(r + 1, n))) / m[r][r]
+    return x
+
+class PowerModel:
+    """Rolling least-squares fit of package power against summed per-core activity.
+
+    Per package: PkgWatt = w0 + w1*sum(APERF GHz) + w2*sum(instructions G/s) + w3*sum(C6 fraction)
+    over the last POWER_MODEL_WINDOW intervals. Features are standardised and ridge
+    regularised before solving the normal equations. A core's watts are its own
+    activity through the same weights plus an even share of w0. R^2 of the fit
+    says how far the estimate can be trusted.
+    """
+    FEATURES = ('aperf_ghz', 'instr_gps', 'c6')
+
+    def __init__(self):
+        self.samples = defaultdict(lambda: deque(maxlen=POWER_MODEL_WINDOW)) # pkg -> [(features, watts)]
+        self.fits = {} # pkg -> (intercept, weights, r2)
+
+    @staticmethod
+    def features(metrics):
+        interval = metrics['interval'] or 1.0
+        return (metrics['aperf'] / interval / 1e9, metrics['instr'] / interval / 1e9, metrics['c6'])
+
+    def _fit(self, samples):
+        xs = [f for f, _ in samples]; ys = [w for _, w in samples]
+        n, k = len(samples), len(self.FEATURES)
+        y_mean = sum(ys) / n
+        means = [sum(x[j] for x in xs) / n for j in range(k)]
+        stds = [(sum((x[j] - means[j]) ** 2 for x in xs) / n) ** 0.5 for j in range(k)]
+        used = [j for j in range(k) if stds[j] > 1e-9] # Constant features carry no information
+        weights = [0.0] * k
+        if used:
+            z = [[(x[j] - means[j]) / stds[j] for j in used] for x in xs]
+            ata = [[sum(r[i] * r[j] for r in z) + (POWER_MODEL_RIDGE * n if i == j else 0.0) for j in range(len(used))] for i in range(len(used))]
+            aty = [sum(r[i] * (y - y_mean) for r, y in zip(z, ys)) for i in range(len(used))]
+            beta = solve_linear(ata, aty)
+            if beta is None: return None
+            for i, j in enumerate(used): weights[j] = beta[i] / stds[j]
+        intercept = y_mean - sum(w * m for w, m in zip(weights, means))
+        ss_tot = sum((y - y_mean) ** 2 for y in ys)
+        ss_res = sum((y - intercept - sum(w * v for w, v in zip(weights, x))) ** 2 for x, y in zip(xs, ys))
+        r2 = 1.0 - ss_res / ss_tot if ss_tot > 1e-12 else 0.0
+        return intercept, weights, r2
+
+    def update(self, row_metrics, topology):
+        pkgs = defaultdict(list)
+        for cpu_id in row_metrics: pkgs[topology[cpu_id]['pkg_id']].append(cpu_id)
+        for pkg_id, cpus in pkgs.items():
+            sums = [sum(col) for col in zip(*(self.features(row_metrics[c]) for c in cpus))]
+            self.samples[pkg_id].append((sums, row_metrics[cpus[0]]['pkg_watt']))
+            if len(self.samples[pkg_id]) >= POWER_MODEL_MIN_SAMPLES:
+                fit = self._fit(self.samples[pkg_id])
+                if fit: self.fits[pkg_id] = fit + (len(cpus),)
+
+    def estimate(self, cpu_id, metrics, topology):
+        """(watts, nJ per instruction or None, R^2) for one CPU, or None until the package has a fit."""
+        fit = self.fits.get(topology[cpu_id]['pkg_id'])
+        if fit is None: return None
+        intercept, weights, r2, ncpus = fit
+        feats = self.features(metrics)
+        watts = max(0.0, intercept / ncpus + sum(w * v for w, v in zip(weights, feats)))
+        return watts, (watts / feats[1] if feats[1] > 0 else None), r2
+
+def summary_row(header_fmt, label, cpus, row_metrics, topology, n_extra, tail=()):
+    """turbostat-style summary row in the CPU row layout: means, summed IRQs and each package's watts once."""
+    metrics = [row_metrics[c] for c in cpus]
+    busy = [m for m in metrics if m['busy'] > 0.01]
+    act = [m['act_mhz'] for m in metrics if m['act_mhz'] is not None]
+    temps = [m['core_temp'] for m in metrics if m['core_temp'] is not None]
+    pkg_rows = {topology[c]['pkg_id']: row_metrics[c] for c in cpus}
+    mean = lambda key: sum(m[key] for m in metrics) / len(metrics)
+    return header_fmt.format(
+        label, "-",
+        f"{sum(act) / len(act):.1f}" if act else "-",
+        f"{mean('avg_mhz'):.1f}", f"{mean('busy'):.2f}",
+        f"{sum(m['bzy_mhz'] for m in busy) / len(busy):.1f}" if busy else "0.0",
+        f"{mean('tsc_mhz'):.1f}",
+        sum(m['irq'] or 0 for m in metrics),
+        f"{mean('poll'):.2f}", f"{mean('c1'):.2f}", f"{mean('c1e'):.2f}", f"{100.0 * mean('c6'):.2f}",
+        max(temps) if temps else "-",
+        "Y" if any(m['core_thr'] for m in metrics) else "N",
+        max((m['pkg_temp'] for m in pkg_rows.values() if m['pkg_temp'] is not None), default="-"),
+        "-", "-", "-", "-",
+        f"{sum(m['pkg_watt'] for m in pkg_rows.values()):.2f}",
+        f"{sum(m['ram_watt'] for m in pkg_rows.values()):.2f}",
+        *(["-"] * (n_extra - len(tail))), *tail
+    )
+
+def summary_stats(label, cpus, row_metrics, pkg_deltas):
+    """Maxima, effective busy CPUs and package C-state residency for a summary row."""
+    metrics = [row_metrics[c] for c in cpus]
+    pc2 = [100.0 * d.pkg_c2 / d.tsc for d in pkg_deltas if d.pkg_c2 is not None and d.tsc > 0]
+    pc6 = [100.0 * d.pkg_c6 / d.tsc for d in pkg_deltas if d.pkg_c6 is not None and d.tsc > 0]
+    return format_summary(label, [
+        ("MaxBusy%", f"{max(m['busy'] for m in metrics):.2f}"),
+        ("MaxBzy_MHz", f"{max(m['bzy_mhz'] for m in metrics):.1f}"),
+        ("MaxIPC", f"{max(m['ipc'] for m in metrics):.2f}"),
+        ("BusyCPUs", f"{sum(m['busy'] for m in metrics) / 100.0:.2f}"),
+        ("Pkg%pc2", f"{sum(pc2) / len(pc2):.2f}" if pc2 else "-"),
+        ("Pkg%pc6", f"{sum(pc6) / len(pc6):.2f}" if pc6 else "-"),
+    ])
+
+def group_summary(label, cpus, row_metrics):
+    """Summary line for a topology group: mean/max Busy%, mean frequencies and IPC, summed IRQs."""
+    metrics = [row_metrics[c] for c in cpus]
+    busy = [m for m in metrics if m['busy'] > 0.01]
+    return format_summary(label, [
+        ("CPUs", ",".join(map(str, cpus))),
+        ("Busy%", f"{sum(m['busy'] for m in metrics) / len(metrics):.2f}"),
+        ("MaxBusy%", f"{max(m['busy'] for m in metrics):.2f}"),
+        ("Avg_MHz", f"{sum(m['avg_mhz'] for m in metrics) / len(metrics):.1f}"),
+        ("Bzy_MHz", f"{sum(m['bzy_mhz'] for m in busy) / len(busy):.1f}" if busy else "-"),
+        ("IPC", f"{sum(m['ipc'] for m in metrics) / len(metrics):.2f}"),
+        ("IRQ", sum(m['irq'] or 0 for m in metrics)),
+    ])
+
+def role_summaries(cpu_roles, row_metrics):
+    """One summary per srsRAN role across all tenants, then one per tenant."""
+    by_role, by_tenant = defaultdict(set), defaultdict(set)
+    for cpu, assignments in cpu_roles.items():
+        if cpu not in row_metrics: continue
+        for tenant, role in assignments:
+            by_role[role].add(cpu); by_tenant[tenant].add(cpu)
+    lines = [group_summary(f"Role {role}", sorted(cpus), row_metrics) for role, cpus in sorted(by_role.items())]
+    lines += [group_summary(f"Tenant {tenant}", sorted(cpus), row_metrics) for tenant, cpus in sorted(by_tenant.items())]
+    return lines
+
+def sst_class_summaries(sst_info, row_metrics, topology):
+    """Per SST priority class: mean Busy%/Bzy_MHz/Avg_MHz and an APERF-weighted share of PkgWatt."""
+    classes = defaultdict(list)
+    for cpu_id in row_metrics:
+        cls = sst_info['cpus'][cpu_id]['class']
+        if cls: classes[cls].append(cpu_id)
+    if not classes: return []
+    watts = estimate_cpu_watts(row_metrics, topology)
+    lines = []
+    for cls in sorted(classes):
+        cpus = classes[cls]
+        busy_cpus = [c for c in cpus if row_metrics[c]['busy'] > 0.01]
+        lines.append(format_summary(f"SST {cls}", [
+            ("CPUs", len(cpus)),
+            ("Busy%", f"{sum(row_metrics[c]['busy'] for c in cpus) / len(cpus):.2f}"),
+            ("Avg_MHz", f"{sum(row_metrics[c]['avg_mhz'] for c in cpus) / len(cpus):.1f}"),
+            ("Bzy_MHz", f"{sum(row_metrics[c]['bzy_mhz'] for c in busy_cpus) / len(busy_cpus):.1f}" if busy_cpus else "-"),
+            ("Watt~", f"{sum(watts[c] for c in cpus):.2f}"),
+        ]))
+    return lines
+
+
+# --- Sub-millisecond Sampling ---
+def fast_sample(cpus, period_us, duration_s):
+    """Tight MSR sampling loop: returns (CLOCK_REALTIME ns array, raw sample buffer, sampler).
+
+    Everything is allocated up front; each iteration only busy-waits for its
+    deadline, preadv()s the MSRs into the sampler buffer and copies that into the
+    preallocated ring. Sleeping would overshoot sub-ms deadlines, so the loop spins.
+    """
+    sampler = MsrSampler(cpus, FAST_REGS)
+    count = int(duration_s * 1e6 / period_us) + 1
+    stride = len(sampler.buf)
+    times = [0] * count
+    ring = bytearray(stride * count)
+    period_ns = int(period_us * 1000)
+    clock, realtime = time.clock_gettime_ns, time.CLOCK_REALTIME
+    deadline = clock(realtime)
+    for i in range(count):
+        while clock(realtime) < deadline: pass
+        times[i] = clock(realtime)
+        ring[i * stride:(i + 1) * stride] = sampler.sample()
+        deadline += period_ns
+        if deadline <= times[i]: deadline = times[i] + period_ns # Overran: skip ahead rather than sample back-to-back
+    return times, ring, sampler
+
+def fast_sample_report(cpus, period_us, times, ring, sampler, tdd_period_ms, slots):
+    """Achieved rate and gap jitter, per-slot-phase Busy%/IPC and a Bzy_MHz histogram per CPU.
+
+    The phase is CLOCK_REALTIME modulo the TDD period. With a PTP-disciplined clock
+    this lines up with the radio frame boundaries (GPS-UTC differs by whole seconds).
+    """
+    stride = len(sampler.buf)
+    values = [sampler.values(ring[i * stride:(i + 1) * stride]) for i in range(len(times))]
+    gaps = [(b - a) / 1000.0 for a, b in zip(times, times[1:])]
+    span_s = (times[-1] - times[0]) / 1e9
+    lines = [format_summary("FastSample", [
+        ("CPUs", ",".join(map(str, cpus))), ("Target_us", f"{period_us:.0f}"), ("Samples", len(times)),
+        ("Rate_Hz", f"{len(gaps) / span_s:.0f}" if span_s > 0 else "-"),
+        ("Gap_p50_us", f"{percentile(gaps, 50):.1f}" if gaps else "-"),
+        ("Gap_p99_us", f"{percentile(gaps, 99):.1f}" if gaps else "-"),
+        ("Gap_max_us", f"{max(gaps):.1f}" if gaps else "-"),
+        ("Late%", f"{100.0 * sum(1 for g in gaps if g > FAST_LATE_FACTOR * period_us) / len(gaps):.2f}" if gaps else "-"),
+    ])]
+    tdd_ns, slot_ns = int(tdd_period_ms * 1e6), tdd_period_ms * 1e6 / slots
+    for cpu in cpus:
+        busy_sum, ipc_sum, n = [0.0] * slots, [0.0] * slots, [0] * slots
+        freq_hist = defaultdict(int)
+        for i in range(1, len(times)):
+            tsc, aperf, mperf, instr = (now - prev for now, prev in zip(values[i][cpu], values[i - 1][cpu]))
+            if tsc <= 0: continue
+            slot = min(slots - 1, int(((times[i] + times[i - 1]) // 2 % tdd_ns) / slot_ns))
+            busy_sum[slot] += 100.0 * mperf / tsc; ipc_sum[slot] += instr / aperf if aperf > 0 else 0.0; n[slot] += 1
+            if mperf > 0:
+                dt_s = (times[i] - times[i - 1]) / 1e9
+                freq_hist[int(aperf / mperf * tsc / dt_s / 1e6 // FAST_FREQ_BIN_MHZ * FAST_FREQ_BIN_MHZ)] += 1
+        lines.append(format_summary(f"Phase Busy% CPU {cpu}", [(f"S{s}", f"{busy_sum[s] / n[s]:.1f}" if n[s] else "-") for s in range(slots)]))
+        lines.append(format_summary(f"Phase IPC CPU {cpu}", [(f"S{s}", f"{ipc_sum[s] / n[s]:.2f}" if n[s] else "-") for s in range(slots)]))
+        total = sum(freq_hist.values())
+        lines.append(format_summary(f"Bzy_MHz hist CPU {cpu}", [(str(mhz), f"{100.0 * c / total:.1f}%") for mhz, c in sorted(freq_hist.items())] or [("samples", 0)]))
+    return lines
+
+def run_fast_sampling(args):
+    cpus = parse_cpu_list(args.fast_sample)
+    if args.fast_pin is not None:
+        if args.fast_pin in cpus: print("Warning: --fast-pin CPU is also sampled; its load will include the sampler.", file=sys.stderr)
+        os.sched_setaffinity(0, {args.fast_pin})
+    print(f"Sampling CPUs {','.join(map(str, cpus))} every {args.fast_period_us:.0f} us for {args.fast_duration:.1f} s"
+          f"{f' on CPU {args.fast_pin}' if args.fast_pin is not None else ''}...", flush=True)
+    try: times, ring, sampler = fast_sample(cpus, args.fast_period_us, args.fast_duration)
+    except OSError as e: print(f"Error: Cannot read MSRs: {e}", file=sys.stderr); return 1
+    sampler.close()
+    for line in fast_sample_report(cpus, args.fast_period_us, times, ring, sampler, args.tdd_period_ms, args.tdd_slots):
+        print(line)
+    return 0
+
+
+# --- Placement Recommender ---
+def parse_recorded_run(paths):
+    """Reads monitor logs and returns per-CPU averages plus per-(CPU, tenant) thread load.
+
+    Rows are matched against the most recent header so logs from any column set
+    (with or without IPC, Tenant, Thread...) can be mixed. Thread lines written by
+    --threads give srsRAN load per tenant on each CPU.
+    """
+    sums, counts = defaultdict(lambda: defaultdict(float)), defaultdict(int)
+    thread_load = defaultdict(float) # (cpu, tenant) -> summed CPU%
+    columns = None
+    for path in paths:
+        with open(path, 'r', errors='replace') as f:
+            for line in f:
+                fields = [x.strip() for x in line.rstrip('\n').split('\t')]
+                if fields[0] == 'Core' and len(fields) > 1 and fields[1] == 'CPU':
+                    columns = fields; continue
+                if fields[0].startswith('Thread ') and fields[0].endswith(':'):
+                    values = dict(x.split('=', 1) for x in fields[1:] if '=' in x)
+                    try: thread_load[(int(fields[0][7:-1]), values.get('tenant', '-'))] += float(values.get('CPU%', 0))
+                    except ValueError: pass
+                    continue
+                if not columns or len(fields) != len(columns) or not fields[1].isdigit(): continue
+                cpu_id = int(fields[1]); counts[cpu_id] += 1
+                for name in ('Busy%', 'IPC', 'IRQ', 'C6%'):
+                    if name in columns:
+                        try: sums[cpu_id][name] += float(fields[columns.index(name)])
+                        except ValueError: pass
+    stats = {cpu: {name: total / counts[cpu] for name, total in values.items()} for cpu, values in sums.items()}
+    threads = {key: total / counts[key[0]] for key, total in thread_load.items() if counts[key[0]]}
+    return stats, threads
+
+def role_demands(gnb_configs, cpu_roles, stats, threads):
+    """Estimates the Busy% each (tenant, role, slot) needs, from its current CPU's recorded load.
+
+    With thread attribution the CPU's srsRAN load is split by tenant first; otherwise
+    the CPU's Busy% is shared evenly among the roles pinned to it.
+    """
+    demands = []
+    for tenant, config in sorted(gnb_configs.items()):
+        for role, cpus in sorted(config['roles'].items()):
+            for slot, cpu in enumerate(cpus):
+                busy = stats.get(cpu, {}).get('Busy%', 0.0)
+                sharers = [r for t, r in cpu_roles[cpu] if t == tenant]
+                if (cpu, tenant) in threads: busy = min(busy or 100.0, threads[(cpu, tenant)])
+                elif len(cpu_roles[cpu]) > 1: busy /= len(cpu_roles[cpu])
+                if len(sharers) > 1 and (cpu, tenant) in threads: busy /= len(sharers)
+                demands.append({'tenant': tenant, 'role': role, 'slot': slot, 'cpu': cpu, 'demand': busy,
+                                'rt': role not in GNB_NON_RT_ROLES})
+    return demands
+
+def recommend_placement(gnb_configs, stats, threads, topology, pool):
+    """Greedy placement of srsRAN roles onto CPUs.
+
+    Background (non-srsRAN) load stays where it was recorded. RT roles, heaviest
+    first, each take a CPU of their own on the NIC's NUMA node, preferring CPUs whose
+    SMT siblings carry the least predicted load; low-priority roles may share.
+    Returns ({(tenant, role): [cpus]}, predicted Busy% per CPU).
+    """
+    cpu_roles = gnb_cpu_roles(gnb_configs)
+    demands = role_demands(gnb_configs, cpu_roles, stats, threads)
+    srsran_load = defaultdict(float)
+    for d in demands: srsran_load[d['cpu']] += d['demand']
+    predicted = {cpu: max(0.0, stats.get(cpu, {}).get('Busy%', 0.0) - srsran_load[cpu]) for cpu in pool}
+    candidates = [cpu for cpu in pool if predicted[cpu] <= RECOMMEND_HOUSEKEEPING_PCT]
+    nic_node = {tenant: next((n for n in map(get_pci_numa_node, config['nics']) if n != -1), -1)
+                for tenant, config in gnb_configs.items()}
+    exclusive = set()
+    placement = defaultdict(list)
+    for d in sorted(demands, key=lambda d: (not d['rt'], -d['demand'])):
+        best, best_score = None, None
+        for cpu in candidates:
+            if cpu in exclusive: continue
+            if d['rt'] and predicted[cpu] + d['demand'] > RECOMMEND_RT_CAPACITY_PCT and predicted[cpu] > 0: continue
+            siblings = [s for s in topology[cpu]['siblings'] if s != cpu]
+            score = predicted[cpu] + RECOMMEND_SIBLING_WEIGHT * sum(predicted.get(s, 0.0) for s in siblings)
+            if d['rt']: score += RECOMMEND_SIBLING_WEIGHT * d['demand'] * sum(1 for s in siblings if s in exclusive)
+            if nic_node[d['tenant']] != -1 and topology[cpu]['node_id'] != nic_node[d['tenant']]:
+                score += RECOMMEND_REMOTE_NODE_PENALTY
+            if best_score is None or score < best_score or (score == best_score and cpu == d['cpu']):
+                best, best_score = cpu, score
+        if best is None: best = d['cpu'] # Nothing fits: keep the current pinning
+        placement[(d['tenant'], d['role'])].append(best)
+        predicted[best] = predicted.get(best, 0.0) + d['demand']
+        if d['rt']: exclusive.add(best)
+    return placement, predicted
+
+def format_expert_execution(tenant, config, placement, predicted):
+    """Renders a ready-to-apply hal/expert_execution block for one tenant."""
+    def cpus_for(role):
+        cpus = placement.get((tenant, role), [])
+        return ",".join(map(str, cpus)), " ".join(f"{c}:{predicted[c]:.0f}%" for c in cpus)
+    lines = [f"# {tenant}: recommended pinning (predicted Busy% per core after the move)"]
+    if config['eal_args'] and (tenant, GNB_DPDK_ROLE) in placement:
+        value, note = cpus_for(GNB_DPDK_ROLE)
+        eal = re.sub(r'@\(?[\d,\-]+\)?', f"@({value})", config['eal_args'], count=1)
+        lines += ["hal:", f'   eal_args: "{eal}"   # {note}']
+    lines += ["expert_execution:", "  affinities:"]
+    for role in ('low_priority_cpus', 'ru_timing_cpu'):
+        if (tenant, role) in placement:
+            value, note = cpus_for(role); lines.append(f"    {role}: {value}   # {note}")
+    if (tenant, 'ru_txrx_cpus') in placement:
+        value, note = cpus_for('ru_txrx_cpus'); lines += ["    ofh:", f"      - ru_txrx_cpus: {value}   # {note}"]
+    cell_roles = [r for r in ('l1_dl_cpus', 'l1_ul_cpus', 'l2_cell_cpus', 'ru_cpus') if (tenant, r) in placement]
+    if cell_roles:
+        lines += ["  cell_affinities:", "    -"]
+        for role in cell_roles:
+            value, note = cpus_for(role); lines.append(f"       {role}: {value}   # {note}")
+    return "\n".join(lines)
+
+def run_recommender(args):
+    gnb_configs = load_gnb_configs(args.gnb_config)
+    if not gnb_configs:
+        print("Error: --recommend needs at least one --gnb-config.", file=sys.stderr); return 1
+    stats, threads = parse_recorded_run(args.recommend)
+    if not stats:
+        print("Error: No per-CPU rows found in the recorded run.", file=sys.stderr); return 1
+    pool = parse_cpu_list(args.cpu) if args.cpu else sorted(stats)
+    topology = get_cpu_topology(pool)
+    placement, predicted = recommend_placement(gnb_configs, stats, threads, topology, pool)
+    print(f"# Recorded run: {len(stats)} CPUs, thread attribution {'available' if threads else 'not available'}")
+    for tenant, config in sorted(gnb_configs.items()):
+        print(format_expert_execution(tenant, config, placement, predicted))
+        print()
+    moved = [f"{t}/{gnb_role_name(r)}" for (t, r), cpus in sorted(placement.items()) if cpus != gnb_configs[t]['roles'][r]]
+    print(f"# Changed roles: {', '.join(moved) if moved else 'none'}")
+    print("# Predicted per-core Busy%: " + " ".join(f"{c}:{predicted[c]:.0f}" for c in sorted(predicted) if predicted[c] >= 1.0))
+    return 0
+
+
 # --- Main Loop ---
 def main():
     parser = argparse.ArgumentParser(description="Python Turbostat-like tool using MSR/Sysfs")
     parser.add_argument("-i", "--interval", type=float, default=5.0, help="Measurement interval (sec)")
     parser.add_argument("-c", "--cpu", type=str, default=None, help="CPUs to monitor (comma-separated, ranges allowed, e.g., 0,2,4-7)")
     parser.add_argument("-N", "--header-interval", type=int, default=22, help="Reprint header every N measurement intervals")
+    parser.add_argument("--uncore", action="store_true", help="Add uncore frequency columns (UncMHz/UncMin/UncMax) per package/die")
+    parser.add_argument("--turbo", action="store_true", help="Add active-core count and turbo-bin limit columns (ActCor/TrbMHz/TrbCap)")
+    parser.add_argument("--sst", action="store_true", help="Add Intel Speed Select SST/CLOS columns and a per-class summary each interval")
+    parser.add_argument("--topology", action="store_true", help="Add NUMA node, LLC and SMT-contention (Node/LLC/SMTCon) columns")
+    parser.add_argument("--smi", action="store_true", help="Add an SMI column (MSR 0x34) and warn when SMIs hit busy RT CPUs")
+    parser.add_argument("--group-by", choices=GROUP_BY_CHOICES, default='cpu', help="Sort CPU rows by topology level and print a summary row per group")
+    parser.add_argument("--threads", action="store_true", help="Attribute srsdu/srscu thread CPU time to the CPU rows and print a per-thread table")
+    parser.add_argument("--intrusions", action="store_true", help="Report non-srsRAN threads that ran on the RT CPUs (or --intrusion-cpus)")
+    parser.add_argument("--intrusion-cpus", type=str, default=None, help="CPUs to watch for foreign threads (default: srsRAN RT CPUs from the gnb configs)")
+    parser.add_argument("--intrusion-allow", action="append", default=[], metavar="REGEX", help="Thread name pattern that is not reported as an intruder (repeatable)")
+    parser.add_argument("--gnb-config", action="append", default=[], metavar="[TENANT=]PATH", help="srsRAN gnb config (or glob of configs) to read expert_execution affinities from (repeatable; default: /gnb.yml)")
+    parser.add_argument("--numa", action="store_true", help="Print NUMA allocation counters, hugepages per node and a locality score per DU each interval")
+    parser.add_argument("--cgroups", action="store_true", help="Report cgroup v2 cpu.stat usage and CFS throttling of the DU, CU and UPF pods")
+    parser.add_argument("--psi", action="store_true", help="Report pressure stall time (cpu/memory/io) system-wide and per pod cgroup")
+    parser.add_argument("--energy", action="store_true", help="Attribute package and DRAM energy to tenants and roles (needs --gnb-config)")
+    parser.add_argument("--power-model", action="store_true", help="Fit a rolling per-package power model and estimate watts and energy per instruction per core")
+    parser.add_argument("--busy-threshold", type=float, default=None, metavar="PCT", help="Only print CPU rows at or above this Busy%% (--summary rows are always printed)")
+    parser.add_argument("--summary", action="store_true", help="Print turbostat-like Sys/Pkg summary rows and a stats line with package C2/C6 residency each interval")
+    parser.add_argument("--softirqs", nargs='?', const='types', choices=SOFTIRQ_CHOICES, default=None, help="Add per-CPU softirq rates from /proc/softirqs: one column per type (default) or a single SoftIRQ/s total")
+    parser.add_argument("--kernel-time", action="store_true", help="Add /proc/stat user/system/irq/softirq/steal/iowait shares and /proc/schedstat run delay per CPU")
+    parser.add_argument("--noise-tracer", choices=NOISE_TRACERS, default=None, help="Run the kernel osnoise or timerlat tracer on --noise-cpus and report its noise/latency each interval")
+    parser.add_argument("--noise-cpus", type=str, default=None, help="CPUs for --noise-tracer (housekeeping or test cores; srsRAN RT CPUs are refused)")
+    parser.add_argument("--noise-allow-rt", action="store_true", help="Allow --noise-cpus to include srsRAN RT CPUs")
+    parser.add_argument("--sched-trace", type=str, default=None, metavar="CPUS", help="Trace sched_switch/sched_wakeup/irq_handler_entry on these CPUs and report preemptions of srsRAN threads")
+    parser.add_argument("--burst-trigger", action="append", default=[], metavar="EXPR", help="Dump high-rate samples around events, e.g. 'busy@l1_ul>95', 'throttle', 'smi>0' (repeatable)")
+    parser.add_argument("--burst-cpus", type=str, default=None, help="CPUs sampled for --burst-trigger (default: srsRAN RT CPUs)")
+    parser.add_argument("--burst-rate", type=positive_float, default=1000.0, help="Burst sampling rate in Hz")
+    parser.add_argument("--burst-window", type=positive_float, default=200.0, metavar="MS", help="History kept before and captured after a trigger (ms)")
+    parser.add_argument("--burst-holdoff", type=positive_float, default=BURST_DEFAULT_HOLDOFF_SEC, metavar="SEC", help="Minimum time between two burst captures (sec)")
+    parser.add_argument("--burst-dir", type=str, default=BURST_DEFAULT_DIR, help="Directory for burst capture CSV files")
+    parser.add_argument("--fast-sample", type=str, default=None, metavar="CPUS", help="Sample APERF/MPERF/instructions of a few CPUs every --fast-period-us, print slot-phase profiles and exit")
+    parser.add_argument("--fast-period-us", type=positive_float, default=250.0, help="Target sample period for --fast-sample (us)")
+    parser.add_argument("--fast-duration", type=positive_float, default=10.0, help="Duration of --fast-sample (sec)")
+    parser.add_argument("--fast-pin", type=int, default=None, metavar="CPU", help="Housekeeping CPU to run the --fast-sample loop on")
+    parser.add_argument("--tdd-period-ms", type=positive_float, default=5.0, help="TDD pattern period used for --fast-sample phase bins (ms)")
+    parser.add_argument("--tdd-slots", type=positive_int, default=10, help="Slots per TDD period (phase bins)")
+    parser.add_argument("--sample-clock", type=str, default=None, metavar="tai|/dev/ptpN", help="Align sample instants to 10 ms frame boundaries on CLOCK_TAI or a PHC and report frame/SFN per interval")
+    parser.add_argument("--ptp", action="store_true", help="Query ptp4l over its management socket each interval (offset, path delay, port state)")
+    parser.add_argument("--ptp-socket", type=str, default=PTP_DEFAULT_SOCKET, help="ptp4l UNIX management socket")
+    parser.add_argument("--ptp-domain", type=int, default=0, help="PTP domain number for management requests")
+    parser.add_argument("--ptp-standin", action="store_true", help="Query a local stand-in ptp4l on a temporary socket instead of --ptp-socket (for trying --ptp without ptp4l)")
+    parser.add_argument("--ptp-log", action="append", default=[], metavar="PATH", help="Follow a ptp4l/phc2sys/ts2phc stdout log for servo state and frequency (repeatable)")
+    parser.add_argument("--metrics-listen", type=str, default=None, nargs='?', const=METRICS_DEFAULT_LISTEN, metavar="HOST:PORT", help="Receive srsRAN JSON metrics on this UDP address and join them with the CPU data")
+    parser.add_argument("--metrics-forward", type=str, default=None, metavar="HOST:PORT", help="Forward every received metrics datagram here (tee to the metrics server)")
+    parser.add_argument("--metrics-period", type=positive_float, default=5.0, help="srsRAN du_report_period in seconds (for RLC rates)")
+    parser.add_argument("--srs-log", action="append", default=[], metavar="PATH", help="Follow an srsdu/srscu log file or FIFO and count late DL, UL underflow and OFH reception window events (repeatable)")
+    parser.add_argument("--srs-log-event", action="append", default=[], metavar="NAME=REGEX", help="Additional event to count in --srs-log (repeatable)")
+    parser.add_argument("--srs-log-csv", type=str, default=None, metavar="FILE", help="Append every matched --srs-log event with its timestamp to this CSV")
+    parser.add_argument("--srs-log-local-time", action="store_true", help="Read --srs-log timestamps as local time instead of UTC (srslog's default)")
+    parser.add_argument("--srs-log-trigger", action="append", default=[], metavar="EVENT", help="Start a burst capture when this --srs-log event occurs (repeatable)")
+    parser.add_argument("--recommend", nargs='+', metavar="LOGFILE", help="Analyse recorded monitor logs and print a recommended expert_execution block per DU, then exit")
     args = parser.parse_args()
 
+    if args.recommend:
+        exit(run_recommender(args))
+    if args.fast_sample:
+        exit(run_fast_sampling(args))
+
     if args.interval <= 0:
         print("Error: Interval must be positive.", file=sys.stderr)
         exit(1)
@@ -536,10 +3053,33 @@ def main():
     rapl_domains_info = find_rapl_domains()
     cpuidle_state_info = {cpu: get_cpuidle_state_info(cpu) for cpu in target_cpus}
     pstate_info = print_pstate_info()
+    uncore_info = find_uncore_domains(target_cpus, topology, is_root) if args.uncore else {'sysfs': {}, 'msr': {}}
+    platform_info = probe_platform(first_cpu_for_tjmax if is_root else None)
+    print_platform_info(platform_info)
+    gnb_configs = load_gnb_configs(args.gnb_config)
+    rt_cpus = gnb_rt_cpus(gnb_configs)
+    if gnb_configs: print(f"srsRAN RT CPUs ({','.join(gnb_configs)}): {','.join(map(str, sorted(rt_cpus))) or 'none'}", flush=True)
+    sst_info = None
+    if args.sst: # Runs intel-speed-select and reads IA32_PQR_ASSOC on every CPU, so only on request
+        sst_info = get_sst_info(target_cpus, is_root)
+        print_sst_info(sst_info, rt_cpus)
+    du_pids = {pid: match_pid_tenant(pid, gnb_configs) for pid in find_processes(DU_PROCESS_NAMES)} if gnb_configs and args.numa else {}
+    cpu_roles = gnb_cpu_roles(gnb_configs)
+    if gnb_configs: print_affinity_audit(gnb_configs, cpu_roles, gnb_overlaps(cpu_roles))
+    numa_node_map = get_numa_node_map() # DU CPUs may lie outside the monitored set
+    energy_attributor = EnergyAttributor(cpu_roles) if args.energy else None
+    power_model = PowerModel() if args.power_model else None
+    task_reader = TaskReader() if args.threads else None
+    if task_reader:
+        task_reader.set_pids({pid: match_pid_tenant(pid, gnb_configs) for pid in find_processes(SRSRAN_PROCESS_NAMES)})
 
     print(f"Using TjMax: {tjmax}°C (from CPU {first_cpu_for_tjmax})", flush=True)
     if not rapl_domains_info['pkg']: print("Warning: No package RAPL domain found via powercap.", flush=True)
     if not rapl_domains_info['dram']: print("Warning: No DRAM RAPL domain found via powercap.", flush=True)
+    if args.uncore:
+        if uncore_info['sysfs']: print(f"Uncore frequency: intel_uncore_frequency sysfs ({sum(len(v) for v in uncore_info['sysfs'].values())} dies)", flush=True)
+        elif uncore_info['msr']: print(f"Uncore frequency: MSR 0x620/0x621 (packages {','.join(map(str, sorted(uncore_info['msr'])))})", flush=True)
+        else: print("Warning: No uncore frequency source found (sysfs or MSR).", flush=True)
 
     # --- Attempt to enable counters if root ---
     counters_enabled_by_script = False
@@ -553,7 +3093,94 @@ def main():
 
     # --- Initial Measurement ---
     print("Taking initial measurement...", flush=True)
-    prev_cpu_data, prev_pkg_data = get_all_counters(target_cpus, topology, tjmax, rapl_domains_info, cpuidle_state_info, pstate_info)
+    prev_cpu_data, prev_pkg_data = get_all_counters(target_cpus, topology, tjmax, rapl_domains_info, cpuidle_state_info, pstate_info, uncore_info, args.summary, args.smi)
+    prev_numa_data = get_numa_counters() if args.numa else None
+    prev_task_data = task_reader.sample() if task_reader else {}
+    softirq_reader = SoftirqReader(target_cpus) if args.softirqs else None
+    prev_softirq_data = softirq_reader.sample() if softirq_reader else None
+    srs_log_events = dict(SRS_LOG_EVENTS)
+    for spec in args.srs_log_event:
+        name, sep, regex = spec.partition('=')
+        try:
+            if not sep or not name.isidentifier(): raise re.error("expected NAME=REGEX")
+            re.compile(regex); srs_log_events[name] = regex
+        except re.error as e: print(f"Warning: Ignoring --srs-log-event '{spec}': {e}", file=sys.stderr)
+    for name in args.srs_log_trigger:
+        if name not in srs_log_events: print(f"Warning: Unknown --srs-log-trigger event '{name}' (events: {', '.join(srs_log_events)})", file=sys.stderr)
+    burst_capture = None
+    if args.burst_trigger or (args.srs_log and args.srs_log_trigger):
+        burst_cpus = parse_cpu_list(args.burst_cpus) if args.burst_cpus else sorted(rt_cpus)
+        try:
+            triggers = [parse_burst_trigger(expr, cpu_roles, burst_cpus) for expr in args.burst_trigger]
+            burst_capture = BurstCapture(burst_cpus, args.burst_rate, args.burst_window, triggers, args.burst_dir, args.burst_holdoff)
+            print(f"Burst capture on CPUs {','.join(map(str, burst_cpus))} at {args.burst_rate:.0f} Hz, +/-{args.burst_window:.0f} ms -> {args.burst_dir}", flush=True)
+        except (OSError, ValueError) as e: print(f"Warning: Burst capture disabled: {e}", file=sys.stderr)
+    srs_log_tail = None
+    if args.srs_log:
+        try: srs_log_tail = SrsLogTail(args.srs_log, srs_log_events, args.srs_log_csv, burst_capture, args.srs_log_trigger,
+                                       tz=None if args.srs_log_local_time else timezone.utc)
+        except OSError as e: print(f"Warning: Cannot write {args.srs_log_csv}: {e}", file=sys.stderr)
+    sample_clock = None
+    if args.sample_clock:
+        try:
+            sample_clock = SampleClock(args.sample_clock, args.interval)
+            print(f"Aligning samples to {sample_clock.interval_ns / 1e6:.0f} ms frame-grid boundaries on {sample_clock.name}", flush=True)
+        except OSError as e: print(f"Warning: Cannot use sample clock {args.sample_clock}: {e}", file=sys.stderr)
+    pmc_standin = None
+    if args.ptp and args.ptp_standin:
+        try:
+            pmc_standin = PmcStandIn()
+            print(f"Serving a stand-in ptp4l on {pmc_standin.path}", flush=True)
+        except OSError as e: print(f"Warning: Cannot start the stand-in ptp4l: {e}", file=sys.stderr)
+    pmc_client = None
+    if args.ptp:
+        try: pmc_client = PmcClient(pmc_standin.path if pmc_standin else args.ptp_socket, args.ptp_domain)
+        except OSError as e: print(f"Warning: Cannot open PTP management socket: {e}", file=sys.stderr)
+    ptp_log_tail = PtpLogTail(args.ptp_log) if args.ptp_log else None
+    metrics_ingest = None
+    if args.metrics_listen:
+        try:
+            metrics_ingest = MetricsIngest(args.metrics_listen, args.metrics_forward)
+            print(f"Receiving srsRAN metrics on {args.metrics_listen}{f', forwarding to {args.metrics_forward}' if args.metrics_forward else ''}", flush=True)
+        except OSError as e: print(f"Warning: Cannot receive srsRAN metrics: {e}", file=sys.stderr)
+    sched_tracer = None
+    if args.sched_trace:
+        try:
+            sched_tracer = SchedTracer(parse_cpu_list(args.sched_trace))
+            srsran_tids = srsran_thread_ids()
+            print(f"Tracing scheduler events on CPUs {args.sched_trace} ({len(srsran_tids)} srsRAN threads)", flush=True)
+        except (OSError, ValueError) as e: print(f"Warning: Cannot start scheduler tracing: {e}", file=sys.stderr)
+    noise_tracer = None
+    if args.noise_tracer:
+        noise_cpus = parse_cpu_list(args.noise_cpus) if args.noise_cpus else []
+        clash = sorted(set(noise_cpus) & rt_cpus)
+        if not noise_cpus: print("Warning: --noise-tracer needs --noise-cpus; tracer disabled.", file=sys.stderr)
+        elif clash and not args.noise_allow_rt:
+            print(f"Warning: --noise-cpus includes srsRAN RT CPUs {','.join(map(str, clash))}; tracer disabled (use --noise-allow-rt).", file=sys.stderr)
+        else:
+            try:
+                noise_tracer = NoiseTracer(args.noise_tracer, noise_cpus)
+                print(f"Running {args.noise_tracer} tracer on CPUs {','.join(map(str, noise_cpus))}", flush=True)
+            except OSError as e: print(f"Warning: Cannot start {args.noise_tracer} tracer: {e}", file=sys.stderr)
+    kernel_stat_reader = KernelStatReader() if args.kernel_time else None
+    prev_kernel_stat_data = kernel_stat_reader.sample() if kernel_stat_reader else None
+    pod_cgroups = find_pod_cgroups(gnb_configs) if args.cgroups or args.psi else {}
+    if args.cgroups:
+        print(f"Pod cgroups: {', '.join(f'{l}={p}' for l, p in sorted(pod_cgroups.items())) or 'none found yet'}", flush=True)
+    prev_cgroup_data = get_cgroup_counters(pod_cgroups) if args.cgroups else {}
+    pressure_reader = PressureReader() if args.psi else None
+    if pressure_reader: pressure_reader.set_sources(pressure_sources(pod_cgroups))
+    prev_pressure_data = pressure_reader.sample() if pressure_reader else None
+    intrusion_scanner = None
+    if args.intrusions:
+        intrusion_cpus = parse_cpu_list(args.intrusion_cpus) if args.intrusion_cpus else sorted(rt_cpus)
+        if intrusion_cpus:
+            print(f"Watching CPUs {','.join(map(str, intrusion_cpus))} for foreign threads", flush=True)
+            intrusion_scanner = IntrusionScanner(intrusion_cpus, args.intrusion_allow)
+            srsran_pids = set(find_processes(SRSRAN_PROCESS_NAMES))
+            intrusion_scanner.scan(srsran_pids)
+        else:
+            print("Warning: --intrusions needs --intrusion-cpus or a gnb config with RT CPUs.", file=sys.stderr)
     if not any(prev_cpu_data.values()):
         print("Error: Failed to collect initial counter data. Check permissions and sysfs paths.", file=sys.stderr)
         if is_root and counters_enabled_by_script: disable_fixed_counter0(target_cpus) # Clean up if we enabled
@@ -568,25 +3195,56 @@ def main():
     time.sleep(0.1)
 
     # --- Header Setup ---
-    # (Header format and string remain the same)
+    # Extra columns are appended after the turbostat-like base set as (name, width)
+    extra_columns = []
+    if args.uncore: extra_columns += [("UncMHz", 6), ("UncMin", 6), ("UncMax", 6)]
+    if args.turbo: extra_columns += [("ActCor", 6), ("TrbMHz", 6), ("TrbCap", 6)]
+    if args.sst: extra_columns += [("SST", 3), ("CLOS", 4)]
+    if args.topology: extra_columns += [("Node", 4), ("LLC", 4), ("SMTCon", 6)]
+    if args.smi: extra_columns.append(("SMI", 4))
     header_fmt = "{:<4}\t{:<3}\t{:>7}\t{:>7}\t{:>5}\t{:>7}\t{:>7}\t{:>10}\t{:>5}\t{:>5}\t{:>5}\t{:>5}\t{:>7}\t{:>7}\t{:>7}\t{:>4}\t{:>4}\t{:>11}\t{:>3}\t{:>7}\t{:>7}"
+    if gnb_configs: extra_columns += [("Tenant", 10), ("Role", 14)]
+    if args.threads: extra_columns.append(("Thread", 20))
+    if args.intrusions: extra_columns.append(("Intr/ms", 10))
+    if args.power_model: extra_columns += [("CoreW", 6), ("nJ/Ins", 6), ("PwrR2", 5)]
+    if args.softirqs == 'types': extra_columns += [(f"{name}/s", 8) for name in SOFTIRQ_TYPES] + [("Other/s", 8)]
+    elif args.softirqs == 'total': extra_columns.append(("SoftIRQ/s", 9))
+    if args.kernel_time: extra_columns += [("Usr%", 5), ("Sys%", 5), ("Irq%", 5), ("SIrq%", 5), ("Stl%", 5), ("IOw%", 5), ("KBusy%", 6), ("Run%", 6), ("RunQms", 6), ("Slc/s", 6)]
+    if srs_log_tail: extra_columns += [(SRS_LOG_COLUMNS.get(name, name[:8]), 6) for name in srs_log_tail.events] # Last, so summary rows can fill them too
+    header_fmt += "".join("\t{:>" + str(width) + "}" for _, width in extra_columns)
     header_str = header_fmt.format(
         "Core", "CPU", "ActMHz", "Avg_MHz", "Busy%", "Bzy_MHz", "TSC_MHz",
         "IRQ", "POLL%", "C1%", "C1E%", "C6%",
         # "CoreTmp", "CoreThr", "PkgTmp", "MinP%", "MaxP%",
         "CoreTmp", "CoreThr", "PkgTmp", "MinMHz", "MaxMHz",       
         "Governor", "EPB",
-        "PkgWatt", "RAMWatt"
+        "PkgWatt", "RAMWatt",
+        *[name for name, _ in extra_columns]
     )
 
+    row_groups = topology_groups(target_cpus, topology, args.group_by)
+
     iteration = 0
     rows_since_header = 0
     max_rows_before_header = args.header_interval * num_target_cpus if args.header_interval > 0 else float('inf')
 
     try: # Main loop wrapped in try for finally cleanup
         while True:
-            time.sleep(args.interval)
-            current_cpu_data, current_pkg_data = get_all_counters(target_cpus, topology, tjmax, rapl_domains_info, cpuidle_state_info, pstate_info)
+            if sample_clock: target_ns, sample_ns = sample_clock.wait_next()
+            else: time.sleep(args.interval)
+            current_cpu_data, current_pkg_data = get_all_counters(target_cpus, topology, tjmax, rapl_domains_info, cpuidle_state_info, pstate_info, uncore_info, args.summary, args.smi)
+            current_numa_data = get_numa_counters() if args.numa else None
+            current_task_data = task_reader.sample() if task_reader else {}
+            current_softirq_data = softirq_reader.sample() if softirq_reader else None
+            current_kernel_stat_data = kernel_stat_reader.sample() if kernel_stat_reader else None
+            current_cgroup_data = get_cgroup_counters(pod_cgroups) if args.cgroups else {}
+            current_pressure_data = pressure_reader.sample() if pressure_reader else None
+            sample_ts = time.time()
+            srs_stats = srs_log_tail.take() if srs_log_tail else {}
+            srs_counts = [str(srs_stats[name]['n'] if name in srs_stats else 0) for name in srs_log_tail.events] if srs_log_tail else []
+            if intrusion_scanner and iteration % PID_REFRESH_INTERVALS == 0:
+                srsran_pids = set(find_processes(SRSRAN_PROCESS_NAMES))
+            intruders = intrusion_scanner.scan(srsran_pids) if intrusion_scanner else {}
 
             delta_cpu_data = {}
             delta_pkg_data = {}
@@ -611,15 +3269,23 @@ def main():
                     print(f"\n--- {utc_now} ---", flush=True)
                     print(header_str, flush=True)
 
-                # (Printing loop remains the same, IPC calculation is correct)
+                active_cores = count_active_cores(delta_cpu_data, topology) if args.turbo else {}
+                contended_cpus = smt_contention(delta_cpu_data, topology, rt_cpus)
+                per_cpu_tasks = attribute_tasks(task_deltas(current_task_data, prev_task_data)) if task_reader else {}
+                softirqs = softirq_rates(current_softirq_data, prev_softirq_data) if softirq_reader else {}
+                kernel_stats = kernel_time_stats(current_kernel_stat_data, prev_kernel_stat_data) if kernel_stat_reader else {}
+                row_metrics = {}
+                row_lines = {}
                 for cpu_id in target_cpus:
                     delta = delta_cpu_data[cpu_id]
-                    interval_sec = delta.timestamp
+                    # With a probed TSC frequency the per-CPU TSC delta is the exact elapsed time,
+                    # free of the skew between the shared timestamp and each CPU's MSR read.
+                    interval_sec = delta.tsc / platform_info['tsc_hz'] if platform_info['tsc_hz'] and delta.tsc > 0 else delta.timestamp
                     core_id_val = topology[cpu_id]['core_id']
                     pkg_id = topology[cpu_id]['pkg_id']
                     avg_mhz = delta.aperf / interval_sec / 1_000_000 if interval_sec > 0 else 0.0
                     busy_pct = 100.0 * delta.mperf / delta.tsc if delta.tsc > 0 else 0.0
-                    tsc_mhz = delta.tsc / interval_sec / 1_000_000 if interval_sec > 0 else 0.0
+                    tsc_mhz = delta.tsc / delta.timestamp / 1_000_000 if delta.timestamp > 0 else 0.0 # Wall clock, so a skewed TSC still shows
                     bzy_mhz = avg_mhz / (busy_pct / 100.0) if busy_pct > 0.01 else 0.0
                     ipc = delta.instr_retired / delta.aperf if delta.aperf > 0 else 0.0 # Correct IPC calc
                     interval_us = interval_sec * 1_000_000
@@ -634,7 +3300,67 @@ def main():
                     d_pkg = delta_pkg_data.get(pkg_id)
                     pkg_watt_val = (d_pkg.energy_pkg_uj / 1_000_000) / interval_sec if d_pkg and interval_sec > 0 else 0.0
                     ram_watt_val = (d_pkg.energy_dram_uj / 1_000_000) / interval_sec if d_pkg and interval_sec > 0 else 0.0
-                    print(header_fmt.format(
+                    extra_vals = []
+                    if args.uncore:
+                        unc_cur, unc_min, unc_max = d_pkg.uncore_for_die(topology[cpu_id]['die_id']) if d_pkg else (None, None, None)
+                        extra_vals += [
+                            f"{unc_cur:.0f}" if unc_cur is not None else "-",
+                            f"{unc_min:.0f}" if unc_min is not None else "-",
+                            f"{unc_max:.0f}" if unc_max is not None else "-",
+                        ]
+                    if args.turbo:
+                        pkg_active = active_cores.get(pkg_id, 0)
+                        trb_mhz = turbo_limit_mhz(platform_info, max(pkg_active, 1))
+                        # Capped: running at the bin limit while fewer active cores would allow more
+                        trb_cap = (trb_mhz is not None and platform_info['max_turbo_mhz'] is not None
+                                   and trb_mhz < platform_info['max_turbo_mhz'] and busy_pct > ACTIVE_CORE_BUSY_PCT
+                                   and bzy_mhz >= trb_mhz - BCLK_MHZ)
+                        extra_vals += [pkg_active, trb_mhz if trb_mhz is not None else "-", "Y" if trb_cap else "N"]
+                    if args.sst:
+                        extra_vals += [
+                            sst_info['cpus'][cpu_id]['class'] or "-",
+                            sst_info['cpus'][cpu_id]['clos'] if sst_info['cpus'][cpu_id]['clos'] is not None else "-",
+                        ]
+                    if args.topology:
+                        extra_vals += [
+                            topology[cpu_id]['node_id'] if topology[cpu_id]['node_id'] != -1 else "-",
+                            topology[cpu_id]['llc_id'] if topology[cpu_id]['llc_id'] != -1 else "-",
+                            "Y" if cpu_id in contended_cpus else "-",
+                        ]
+                    if args.smi: extra_vals.append(delta.smi_count if delta.smi_count is not None else "-")
+                    if gnb_configs:
+                        assignments = cpu_roles.get(cpu_id, [])
+                        extra_vals += ["+".join(sorted({t for t, _ in assignments})) or "-",
+                                       "+".join(r for _, r in assignments) or "-"]
+                    if task_reader:
+                        top = per_cpu_tasks.get(cpu_id)
+                        extra_vals.append(f"{top[0][1].comm[:13]}:{top[0][0]:.0f}%" if top else "-")
+                    if args.intrusions:
+                        cpu_intruders = intruders.get(cpu_id, [])
+                        extra_vals.append(f"{len(cpu_intruders)}/{sum(i[0] for i in cpu_intruders) / 1e6:.2f}" if cpu_intruders else "-")
+                    row_metrics[cpu_id] = {'busy': busy_pct, 'avg_mhz': avg_mhz, 'bzy_mhz': bzy_mhz, 'ipc': ipc,
+                                           'aperf': delta.aperf, 'instr': delta.instr_retired, 'interval': interval_sec, 'c6': c6_pct / 100.0,
+                                           'pkg_watt': pkg_watt_val, 'ram_watt': ram_watt_val, 'irq': delta.irq_count,
+                                           'act_mhz': delta.actual_mhz, 'tsc_mhz': tsc_mhz, 'poll': poll_pct, 'c1': c1_pct, 'c1e': c1e_pct,
+                                           'core_temp': delta.core_temp, 'core_thr': delta.core_throttled,
+                                           'pkg_temp': d_pkg.pkg_temp if d_pkg else None}
+                    if power_model: # Fit from earlier intervals, so the estimate is out of sample
+                        est = power_model.estimate(cpu_id, row_metrics[cpu_id], topology)
+                        extra_vals += [f"{est[0]:.2f}", f"{est[1]:.2f}" if est[1] is not None else "-", f"{est[2]:.2f}"] if est else ["-", "-", "-"]
+                    if softirq_reader:
+                        cpu_softirqs = softirqs.get(cpu_id, {})
+                        if args.softirqs == 'types':
+                            extra_vals += [f"{cpu_softirqs.get(name, 0):.0f}" for name in SOFTIRQ_TYPES]
+                            extra_vals.append(f"{sum(r for n, r in cpu_softirqs.items() if n not in SOFTIRQ_TYPES):.0f}")
+                        else: extra_vals.append(f"{sum(cpu_softirqs.values()):.0f}")
+                    if kernel_stat_reader:
+                        ks = kernel_stats.get(cpu_id)
+                        if ks:
+                            extra_vals += [f"{ks[k]:.1f}" for k in ('usr', 'sys', 'irq', 'sirq', 'steal', 'iowait', 'busy')]
+                            extra_vals += [f"{ks['run']:.1f}", f"{ks['runq_ms']:.1f}", f"{ks['slices']:.0f}"] if 'runq_ms' in ks else ["-", "-", "-"]
+                        else: extra_vals += ["-"] * 9
+                    extra_vals += srs_counts # Interval event counts repeated on each row for row-wise correlation
+                    row_lines[cpu_id] = header_fmt.format(
                         str(core_id_val) if core_id_val != -1 else "-", cpu_id,
                         f"{delta.actual_mhz:.1f}" if delta.actual_mhz is not None else "-",
                         f"{avg_mhz:.1f}", f"{busy_pct:.2f}", f"{bzy_mhz:.1f}", f"{tsc_mhz:.1f}",
@@ -649,14 +3375,108 @@ def main():
                         f"{delta.scaling_max_mhz:.0f}" if delta.scaling_max_mhz is not None else "", # MaxMHz
                         str(delta.governor)[:11] if delta.governor else "-",
                         str(delta.epb) if delta.epb is not None else "-",
-                        f"{pkg_watt_val:.2f}", f"{ram_watt_val:.2f}"
-                    ), flush=True)
-                    rows_since_header += 1
+                        f"{pkg_watt_val:.2f}", f"{ram_watt_val:.2f}",
+                        *extra_vals
+                    )
+                if power_model: power_model.update(row_metrics, topology)
+                if args.summary:
+                    pkg_cpus = defaultdict(list)
+                    for cpu_id in target_cpus: pkg_cpus[topology[cpu_id]['pkg_id']].append(cpu_id)
+                    summary_sets = [("Sys", target_cpus, list(delta_pkg_data.values()))]
+                    if len(pkg_cpus) > 1:
+                        summary_sets += [(f"Pkg{pkg_id}" if pkg_id != -1 else "Pkg-", cpus, [delta_pkg_data[pkg_id]] if pkg_id in delta_pkg_data else [])
+                                         for pkg_id, cpus in sorted(pkg_cpus.items())]
+                    for label, cpus, pkg_deltas in summary_sets:
+                        print(summary_row(header_fmt, label, cpus, row_metrics, topology, len(extra_columns), srs_counts), flush=True)
+                    for label, cpus, pkg_deltas in summary_sets:
+                        print(summary_stats(label, cpus, row_metrics, pkg_deltas), flush=True)
+                for label, group_cpus in row_groups:
+                    for cpu_id in group_cpus:
+                        rows_since_header += 1 # Counted even when filtered, so the header keeps its per-interval cadence
+                        if args.busy_threshold is not None and row_metrics[cpu_id]['busy'] < args.busy_threshold: continue
+                        print(row_lines[cpu_id], flush=True)
+                    if args.group_by != 'cpu':
+                        print(group_summary(label, group_cpus, row_metrics), flush=True)
+                for cpu_id in sorted(contended_cpus):
+                    rt_siblings = [sib for sib in topology[cpu_id]['siblings'] if sib in rt_cpus and sib != cpu_id]
+                    print(f"Warning: CPU {cpu_id} (Busy% {row_metrics[cpu_id]['busy']:.2f}) shares a physical core with RT CPU {','.join(map(str, rt_siblings))}", flush=True)
+                smi_total = max((delta_cpu_data[c].smi_count or 0 for c in target_cpus), default=0) # SMIs hit all CPUs at once
+                active_rt = sorted(c for c in rt_cpus if c in row_metrics and row_metrics[c]['busy'] > ACTIVE_CORE_BUSY_PCT)
+                if smi_total and active_rt: # smi_count is only read with --smi
+                    print(f"Warning: {smi_total} SMI(s) during the interval while RT CPUs {','.join(map(str, active_rt))} were active", file=sys.stderr, flush=True)
+                for line in role_summaries(cpu_roles, row_metrics):
+                    print(line, flush=True)
+                if args.sst:
+                    for line in sst_class_summaries(sst_info, row_metrics, topology):
+                        print(line, flush=True)
+                if energy_attributor:
+                    for line in energy_summaries(energy_attributor, energy_attributor.attribute(row_metrics, topology)):
+                        print(line, flush=True)
+                if task_reader:
+                    for line in thread_table(per_cpu_tasks, task_reader.pids, target_cpus):
+                        print(line, flush=True)
+                for line in intrusion_lines(intruders, target_cpus):
+                    print(line, flush=True)
+                cgroup_lines, cgroup_warnings = cgroup_summaries(current_cgroup_data, prev_cgroup_data)
+                for line in cgroup_lines:
+                    print(line, flush=True)
+                for line in cgroup_warnings:
+                    print(line, file=sys.stderr, flush=True)
+                if sample_clock:
+                    frame, sfn = SampleClock.frame_and_sfn(target_ns)
+                    print(format_summary("Sample", [
+                        ("Clock", sample_clock.name), ("Time_ns", target_ns), ("Frame", frame), ("SFN", sfn),
+                        ("Slip_us", f"{(sample_ns - target_ns) / 1000:.1f}"),
+                    ]), flush=True)
+                if metrics_ingest:
+                    for line in metrics_join_lines(metrics_ingest.take(), row_metrics, topology, cpu_roles, args.metrics_period):
+                        print(line, flush=True)
+                for line in srs_log_lines(srs_stats, sample_ts): print(line, flush=True)
+                if pmc_client or ptp_log_tail:
+                    hk_cpus = [c for c in target_cpus if c not in rt_cpus]
+                    hk_top = max(hk_cpus, key=lambda c: row_metrics[c]['busy'], default=None)
+                    lines, warnings = ptp_lines(pmc_client.poll() if pmc_client else None, ptp_log_tail.collect() if ptp_log_tail else {},
+                                                (hk_top, row_metrics[hk_top]['busy']) if hk_top is not None else None)
+                    for line in lines:
+                        print(line, flush=True)
+                    for line in warnings:
+                        print(line, file=sys.stderr, flush=True)
+                if burst_capture:
+                    for line in burst_capture.report():
+                        print(line, flush=True)
+                if sched_tracer:
+                    if iteration % PID_REFRESH_INTERVALS == 0: srsran_tids = srsran_thread_ids()
+                    for line in sched_trace_lines(sched_tracer.collect(srsran_tids)):
+                        print(line, flush=True)
+                if noise_tracer:
+                    for line in noise_lines(noise_tracer.tracer, noise_tracer.collect()):
+                        print(line, flush=True)
+                pressure_delta = current_pressure_data.delta(prev_pressure_data) if pressure_reader else None
+                if pressure_delta is not None:
+                    for line in pressure_summaries(pressure_delta):
+                        print(line, flush=True)
+                numa_delta = current_numa_data.delta(prev_numa_data) if args.numa else None
+                if numa_delta is not None:
+                    if gnb_configs and iteration % PID_REFRESH_INTERVALS == 0: # DUs restart; keep the pid->tenant map fresh
+                        du_pids = {pid: match_pid_tenant(pid, gnb_configs) for pid in find_processes(DU_PROCESS_NAMES)}
+                    for line in numa_summaries(numa_delta, du_locality(gnb_configs, numa_node_map, numa_delta, du_pids)):
+                        print(line, flush=True)
                 if rows_since_header >= max_rows_before_header:
                     rows_since_header = 0
 
             prev_cpu_data = current_cpu_data
             prev_pkg_data = current_pkg_data
+            prev_numa_data = current_numa_data
+            prev_task_data = current_task_data
+            prev_softirq_data = current_softirq_data
+            prev_kernel_stat_data = current_kernel_stat_data
+            prev_cgroup_data = current_cgroup_data
+            prev_pressure_data = current_pressure_data
+            if (args.cgroups or args.psi) and (not pod_cgroups or iteration % PID_REFRESH_INTERVALS == 0):
+                pod_cgroups = find_pod_cgroups(gnb_configs)
+                if pressure_reader: pressure_reader.set_sources(pressure_sources(pod_cgroups))
+            if task_reader and (not task_reader.pids or iteration % PID_REFRESH_INTERVALS == 0):
+                task_reader.set_pids({pid: match_pid_tenant(pid, gnb_configs) for pid in find_processes(SRSRAN_PROCESS_NAMES)})
             iteration += 1
 
     except KeyboardInterrupt:
@@ -669,6 +3489,20 @@ def main():
         # --- Cleanup: Disable counter if we enabled it ---
         if is_root and counters_enabled_by_script:
             disable_fixed_counter0(target_cpus)
+        if task_reader: task_reader.close()
+        if intrusion_scanner: intrusion_scanner.close()
+        if pressure_reader: pressure_reader.close()
+        if softirq_reader: softirq_reader.close()
+        if noise_tracer: noise_tracer.close()
+        if sched_tracer: sched_tracer.close()
+        if burst_capture: burst_capture.close()
+        if sample_clock: sample_clock.close()
+        if pmc_client: pmc_client.close()
+        if metrics_ingest: metrics_ingest.close()
+        if srs_log_tail: srs_log_tail.close()
+        if pmc_standin: pmc_standin.close()
+        if ptp_log_tail: ptp_log_tail.close()
+        if kernel_stat_reader: kernel_stat_reader.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,22 @@
+import importlib.util
+import os
+
+import pytest
+
+MONITORING_PATH = os.path.join(os.path.dirname(__file__), '..', 'charts', 'srsran-5g-du', 'resources', 'monitoring.py')
+
+def load(name, path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+@pytest.fixture(scope='session')
+def monitoring():
+    """The DU chart's monitoring.py (every other chart carries a synced copy)."""
+    return load('monitoring', MONITORING_PATH)
+
+@pytest.fixture(scope='session')
+def monitoring_ipc():
+    """The variant with an IPC column after TSC_MHz."""
+    return load('monitoring_ipc', MONITORING_PATH.replace('monitoring.py', 'monitoring-ipc.py'))
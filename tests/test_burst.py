@@ -0,0 +1,68 @@
+import time
+
+import pytest
+
+CPU_ROLES = {4: [('du-1', 'l1_ul')], 5: [('du-1', 'l1_ul')], 6: [('du-1', 'l1_dl'), ('du-2', 'l1_dl')], 8: [('du-1', 'ru_timing')]}
+
+@pytest.mark.parametrize('expr, parsed', [
+    ('busy@l1_ul>95', ('busy', [4, 5], '>', 95.0)),
+    ('busy @ l1_ul_cpus >= 95', ('busy', [4, 5], '>=', 95.0)), # Spaces and the config's role key are accepted
+    ('ipc@4-5<0.5', ('ipc', [4, 5], '<', 0.5)),
+    ('bzy_mhz@6,8,12==2100', ('bzy_mhz', [6, 8], '==', 2100.0)), # CPU 12 is not sampled
+    ('throttle', ('throttle', [4, 5, 6, 8], '>', 0.0)),
+    ('smi>0', ('smi', [4, 5, 6, 8], '>', 0.0)),
+])
+def test_parse_burst_trigger(monitoring, expr, parsed):
+    assert monitoring.parse_burst_trigger(expr, CPU_ROLES, [4, 5, 6, 8]) == (expr,) + parsed
+
+@pytest.mark.parametrize('expr', ['temp>90', 'busy>>95', 'busy>-1', 'busy@l2_cell>50', 'busy@12>50', ''])
+def test_parse_burst_trigger_rejects(monitoring, expr):
+    with pytest.raises(ValueError): monitoring.parse_burst_trigger(expr, CPU_ROLES, [4, 5, 6, 8])
+
+def test_metrics(monitoring):
+    burst = object.__new__(monitoring.BurstCapture)
+    prev = (1_000_000, 500, 400, 1000, 0x88000000, 7)
+    now = (3_000_000, 1_900_500, 1_800_400, 2_801_000, 0x88000001, 8) # TSC, APERF, MPERF, instructions, THERM_STATUS, SMI
+    m = burst._metrics(now, prev, 0.001)
+    assert m == pytest.approx({'busy': 90.0, 'bzy_mhz': 2111.111, 'ipc': 1.473684, 'throttle': 1, 'smi': 1}, rel=1e-5)
+
+def test_refuses_empty_cpu_list(monitoring, tmp_path):
+    with pytest.raises(ValueError, match='no CPUs'): monitoring.BurstCapture([], 1000, 5, [], str(tmp_path))
+
+class BusySampler:
+    """Stands in for MsrSampler: every CPU is 100% busy at 2 GHz with IPC 1."""
+    def __init__(self, cpus, regs):
+        self.cpus, self.n = cpus, 0
+
+    def sample(self):
+        self.n += 1
+
+    def values(self, buf=None):
+        return {cpu: (self.n * 2_000_000,) * 4 + (0, 0) for cpu in self.cpus}
+
+    def close(self):
+        pass
+
+def run_capture(monitoring, tmp_path, holdoff, fire_after=None):
+    burst = monitoring.BurstCapture([4], 1000, 5, [monitoring.parse_burst_trigger('busy>95', {}, [4])], str(tmp_path), holdoff)
+    try:
+        time.sleep(0.1)
+        if fire_after is not None: time.sleep(fire_after); burst.fire('log:late_dl')
+        time.sleep(0.1)
+    finally: burst.close()
+    return sorted(p.name for p in tmp_path.iterdir())
+
+def test_condition_that_stays_true_fires_once(monitoring, tmp_path, monkeypatch):
+    monkeypatch.setattr(monitoring, 'MsrSampler', BusySampler)
+    files = run_capture(monitoring, tmp_path, holdoff=0.01)
+    assert len(files) == 1 and files[0].endswith('-busy_95.csv')
+    lines = (tmp_path / files[0]).read_text().splitlines()
+    assert lines[0].startswith('# trigger=busy>95 at ') and lines[1] == 't_ms,cpu,busy,bzy_mhz,ipc,throttle,smi'
+    assert len(lines) - 2 == 6 # The trigger sample plus the 5 post-trigger samples (no history before the first one)
+    cpu, busy, _, ipc = lines[-1].split(',')[1:5] # Bzy_MHz depends on the real sample spacing
+    assert (cpu, busy, ipc) == ('4', '100.00', '1.000')
+
+def test_external_fire_respects_holdoff(monitoring, tmp_path, monkeypatch):
+    monkeypatch.setattr(monitoring, 'MsrSampler', BusySampler)
+    assert len(run_capture(monitoring, tmp_path / 'short', holdoff=0.01, fire_after=0)) == 2
+    assert len(run_capture(monitoring, tmp_path / 'long', holdoff=10.0, fire_after=0)) == 1
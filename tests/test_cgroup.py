@@ -0,0 +1,41 @@
+import builtins
+
+POD_CGROUP = "kubepods.slice/kubepods-pod3f2a9c1e_77b4_4a51_9e0b_2c6d1f8e4a10.slice"
+PROC_CGROUP = f"0::/{POD_CGROUP}/crio-5b1e0d4c9a7f.scope\n"
+def cpu_stat(usage=981234567, user=901234567, system=80000000, throttled=12, throttled_usec=45210):
+    """cpu.stat as a 6.x kernel writes it, including fields the monitor ignores."""
+    return (f"usage_usec {usage}\nuser_usec {user}\nsystem_usec {system}\ncore_sched.force_idle_usec 0\n"
+            f"nr_periods 120345\nnr_throttled {throttled}\nthrottled_usec {throttled_usec}\nnr_bursts 0\nburst_usec 0\n")
+
+def write_cgroup(path, cpu_stat, cpu_max="max 100000"):
+    path.mkdir(parents=True, exist_ok=True)
+    (path / 'cpu.stat').write_text(cpu_stat)
+    (path / 'cpu.max').write_text(cpu_max + "\n")
+
+def test_find_pod_cgroup(monitoring, tmp_path, monkeypatch):
+    (tmp_path / 'cgroup').write_text(PROC_CGROUP)
+    write_cgroup(tmp_path / 'fs' / POD_CGROUP, cpu_stat())
+    monkeypatch.setattr(monitoring, 'CGROUP_ROOT', str(tmp_path / 'fs'))
+    proc = {'/proc/4242/cgroup': str(tmp_path / 'cgroup')}
+    monkeypatch.setattr(monitoring, 'open', lambda path, *a, **k: builtins.open(proc.get(path, path), *a, **k), raising=False)
+    assert monitoring.find_pod_cgroup(4242) == str(tmp_path / 'fs' / POD_CGROUP) # The pod, not the container scope
+    assert monitoring.find_pod_cgroup(4243) is None
+
+def test_counters_and_summary(monitoring, tmp_path):
+    pod = tmp_path / 'pod'
+    write_cgroup(pod, cpu_stat(), "400000 100000")
+    prev = monitoring.get_cgroup_counters({'du-1': str(pod), 'gone': str(tmp_path / 'missing')})
+    assert set(prev) == {'du-1'}
+    assert prev['du-1'].stat == {'usage_usec': 981234567, 'user_usec': 901234567, 'system_usec': 80000000,
+                                 'nr_periods': 120345, 'nr_throttled': 12, 'throttled_usec': 45210}
+    write_cgroup(pod, cpu_stat(usage=985234567, user=904234567, system=81000000, throttled=15, throttled_usec=57710), "400000 100000")
+    current = monitoring.get_cgroup_counters({'du-1': str(pod)})
+    prev['du-1'].timestamp = current['du-1'].timestamp - 2.0
+    lines, warnings = monitoring.cgroup_summaries(current, prev)
+    assert lines == ["Cgroup du-1:\tCPUs=2.00\tUser%=75.0\tSys%=25.0\tnr_throttled=3\tThrtl_ms=12.5\tcpu.max=400000/100000"]
+    assert len(warnings) == 1 and "throttled 3 times (12.5 ms); cpu.max is '400000 100000'" in warnings[0]
+
+def test_summary_skips_new_pods(monitoring, tmp_path):
+    write_cgroup(tmp_path / 'pod', cpu_stat())
+    current = monitoring.get_cgroup_counters({'upf-77': str(tmp_path / 'pod')})
+    assert monitoring.cgroup_summaries(current, {}) == ([], [])
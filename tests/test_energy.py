@@ -0,0 +1,35 @@
+import pytest
+
+CPU_ROLES = {0: [('du-1', 'l1_dl_cpus')], 1: [('du-1', 'l1_dl_cpus'), ('du-2', 'l1_dl_cpus')]} # CPU 2 is unassigned
+TOPOLOGY = {cpu: {'pkg_id': 0} for cpu in range(3)}
+
+def rows(pkg_watt, ram_watt, interval, aperf, instr=(0, 0, 0)):
+    return {cpu: {'pkg_watt': pkg_watt, 'ram_watt': ram_watt, 'interval': interval, 'aperf': a, 'instr': i}
+            for cpu, (a, i) in enumerate(zip(aperf, instr))}
+
+def test_attribute_splits_by_activity_and_tracks_idle_floor(monitoring):
+    attributor = monitoring.EnergyAttributor(CPU_ROLES)
+    interval, shares = attributor.attribute(rows(100.0, 10.0, 2.0, (2e9, 1e9, 1e9)), TOPOLOGY)
+    assert interval == 2.0
+    assert shares == pytest.approx({ # No floor yet: 200 J package and 20 J DRAM are all active
+        'idle': (0.0, 0.0), 'du-1': (125.0, 12.5), 'du-1/l1_dl': (125.0, 12.5),
+        'du-2': (25.0, 2.5), 'du-2/l1_dl': (25.0, 2.5), 'other': (50.0, 5.0)})
+    _, shares = attributor.attribute(rows(80.0, 10.0, 1.0, (1e9, 1e9, 2e9)), TOPOLOGY)
+    assert shares['idle'] == pytest.approx((80.0, 10.0)) and shares['other'] == pytest.approx((0.0, 0.0))
+    _, shares = attributor.attribute(rows(120.0, 10.0, 1.0, (1e9, 1e9, 2e9), instr=(3e9, 1e9, 0)), TOPOLOGY)
+    # 40 J above the 80 W floor; weights average the APERF (1/4, 1/4, 1/2) and instruction (3/4, 1/4, 0) shares
+    assert shares['idle'] == pytest.approx((80.0, 10.0))
+    assert shares['du-1'] == pytest.approx((20.0 + 5.0, 0.0))
+    assert shares['du-2'] == pytest.approx((5.0, 0.0))
+    assert shares['other'] == pytest.approx((10.0, 0.0))
+    assert attributor.total_j['idle'] == pytest.approx(180.0)
+    assert attributor.total_j['du-1'] == pytest.approx(137.5 + 25.0)
+
+def test_energy_summaries(monitoring):
+    attributor = monitoring.EnergyAttributor(CPU_ROLES)
+    energy = attributor.attribute(rows(100.0, 10.0, 2.0, (2e9, 1e9, 1e9)), TOPOLOGY)
+    lines = monitoring.energy_summaries(attributor, energy)
+    assert [line.split(':\t')[0] for line in lines] == [
+        "Energy du-1", "Energy du-1/l1_dl", "Energy du-2", "Energy du-2/l1_dl", "Energy other", "Energy idle"]
+    assert lines[0] == "Energy du-1:\tPkg_J=125.00\tRAM_J=12.50\tWatt=68.75\tShare%=62.5\tTotal_J=138"
+    assert lines[-1] == "Energy idle:\tPkg_J=0.00\tRAM_J=0.00\tWatt=0.00\tShare%=0.0\tTotal_J=0"
@@ -0,0 +1,49 @@
+T0 = 1_760_868_000 * 1_000_000_000 # A whole second, so also a TDD period boundary
+PERIOD_NS = 500_000
+
+class RingSampler:
+    """Stands in for MsrSampler over a ring of one (TSC, APERF, MPERF, instructions) dict per sample."""
+    buf = [None]
+
+    def values(self, chunk):
+        return chunk[0]
+
+def fields(line):
+    label, _, rest = line.partition(':\t')
+    return label, dict(kv.split('=', 1) for kv in rest.split('\t'))
+
+def ramp(n):
+    """n samples 500 us apart; in TDD slot s the CPU is (s+1)*10% busy at 3 GHz, with IPC 2 in slot 0 and 1 elsewhere."""
+    times, ring, counters = [], [], (0, 0, 0, 0)
+    for i in range(n):
+        times.append(T0 + i * PERIOD_NS)
+        if i:
+            slot = (i - 1) % 10 # The interval ending at sample i is centred in slot i-1
+            mperf = 100_000 * (slot + 1)
+            aperf = mperf * 3 // 2
+            counters = tuple(c + d for c, d in zip(counters, (1_000_000, aperf, mperf, aperf * (2 if slot == 0 else 1))))
+        ring.append({2: counters})
+    return times, ring
+
+def test_phase_profile_and_histogram(monitoring):
+    times, ring = ramp(41)
+    lines = monitoring.fast_sample_report([2], 500, times, ring, RingSampler(), 5, 10)
+    assert fields(lines[0]) == ('FastSample', {'CPUs': '2', 'Target_us': '500', 'Samples': '41', 'Rate_Hz': '2000',
+                                               'Gap_p50_us': '500.0', 'Gap_p99_us': '500.0', 'Gap_max_us': '500.0', 'Late%': '0.00'})
+    assert fields(lines[1]) == ('Phase Busy% CPU 2', {f"S{s}": f"{(s + 1) * 10:.1f}" for s in range(10)})
+    assert fields(lines[2])[1] == dict({'S0': '2.00'}, **{f"S{s}": '1.00' for s in range(1, 10)})
+    assert fields(lines[3]) == ('Bzy_MHz hist CPU 2', {'3000': '100.0%'})
+
+def test_late_gaps(monitoring):
+    times, ring = ramp(5)
+    times[3] += 400_000 # A 900 us gap, above 1.5x the target
+    _, stats = fields(monitoring.fast_sample_report([2], 500, times, ring, RingSampler(), 5, 10)[0])
+    assert (stats['Gap_max_us'], stats['Late%']) == ('900.0', '25.00')
+
+def test_single_sample(monitoring):
+    times, ring = ramp(1)
+    lines = monitoring.fast_sample_report([2], 500, times, ring, RingSampler(), 5, 10)
+    _, stats = fields(lines[0])
+    assert (stats['Rate_Hz'], stats['Gap_p50_us'], stats['Late%']) == ('-', '-', '-')
+    assert fields(lines[1])[1]['S0'] == '-'
+    assert fields(lines[3]) == ('Bzy_MHz hist CPU 2', {'samples': '0'})
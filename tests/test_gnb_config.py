@@ -0,0 +1,54 @@
+import os
+
+import pytest
+
+from conftest import MONITORING_PATH
+
+GNB_TEMPLATE = os.path.join(os.path.dirname(MONITORING_PATH), 'gnb-template.yml')
+
+@pytest.mark.parametrize('eal_args, cpus', [
+    ('--lcores (0-1)@(9) -a 0000:51:11.0', [9]),
+    ('--lcores "0@(2,4-5),1@7" --allow 0000:51:11.0', [2, 4, 5, 7]),
+    ('--lcores=0@3,1@3', [3]),
+    ('--lcores 2-3', [2, 3]),
+    ('-l 4,6-7 -a 0000:51:11.1', [4, 6, 7]),
+    ('--file-prefix du -a 0000:51:11.0', []),
+])
+def test_parse_eal_lcores(monitoring, eal_args, cpus):
+    assert monitoring.parse_eal_lcores(eal_args) == cpus
+
+def test_parse_gnb_template(monitoring):
+    config = monitoring.parse_gnb_config(GNB_TEMPLATE)
+    assert dict(config['roles']) == {
+        'eal_lcores': [9], 'low_priority_cpus': [32], 'ru_timing_cpu': [8], 'ru_txrx_cpus': [41],
+        'l1_dl_cpus': [10], 'l1_ul_cpus': [11], 'l2_cell_cpus': [12], 'ru_cpus': [42],
+    }
+    assert config['nics'] == ['0000:51:11.0']
+    assert config['eal_args'] == '--lcores (0-1)@(9) -a 0000:51:11.0'
+
+def test_parse_gnb_config_merges_cells_and_skips_comments(monitoring, tmp_path, capsys):
+    path = tmp_path / 'gnb.yml'
+    path.write_text(
+        'ru_ofh:\n'
+        '  cells:\n'
+        '    - network_interface: 0000:51:11.0     # Ethernet interface name used to communicate with the RU.\n'
+        '    - network_interface: 0000:51:11.1\n'
+        'hal:\n'
+        '   eal_args: "--lcores (0-1)@(9) -a 0000:51:11.0 -a 0000:51:11.1"\n'
+        'expert_execution:\n'
+        '  affinities:\n'
+        '    # low_priority_cpus: 0-7\n'
+        '    low_priority_cpus: 30-31 # housekeeping\n'
+        '    ofh:\n'
+        '      - ru_txrx_cpus: 41\n'
+        '      - ru_txrx_cpus: 43,41\n'
+        '  cell_affinities:\n'
+        '    -\n'
+        '       l1_dl_cpus: bogus\n'
+    )
+    config = monitoring.parse_gnb_config(str(path))
+    assert config['roles']['low_priority_cpus'] == [30, 31]
+    assert config['roles']['ru_txrx_cpus'] == [41, 43]
+    assert 'l1_dl_cpus' not in config['roles']
+    assert "Could not parse 'l1_dl_cpus: bogus'" in capsys.readouterr().err
+    assert config['nics'] == ['0000:51:11.0', '0000:51:11.1']
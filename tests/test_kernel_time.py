@@ -0,0 +1,50 @@
+import os
+
+import pytest
+
+PROC_STAT = """\
+cpu  2255 34 2290 22625563 6290 127 456 0 0 0
+cpu0 1132 34 1441 11311718 3675 127 438 0 0 0
+cpu1 1123 0 849 11313845 2614 0 18 0 0 0
+intr 114930548 113199788 3 0 5 263 0 4 [... 1 more]
+ctxt 1990473
+"""
+PROC_SCHEDSTAT = """\
+version 15
+timestamp 4297299139
+cpu0 0 0 0 0 0 0 1431584425478 140710254021 1207390
+domain0 00000000,00000003 212 206 2 0 4 0 0 206 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0
+cpu1 0 0 0 0 0 0 880045893327 65348126114 735120
+"""
+
+def test_sample_parses_proc_stat_and_schedstat(monitoring, tmp_path):
+    (tmp_path / 'stat').write_text(PROC_STAT)
+    (tmp_path / 'schedstat').write_text(PROC_SCHEDSTAT)
+    reader = object.__new__(monitoring.KernelStatReader) # Reads the captured files instead of /proc
+    reader.stat_fd = os.open(tmp_path / 'stat', os.O_RDONLY)
+    reader.schedstat_fd = os.open(tmp_path / 'schedstat', os.O_RDONLY)
+    try: _, ticks, sched = reader.sample()
+    finally: reader.close()
+    assert ticks == {0: (1132, 34, 1441, 11311718, 3675, 127, 438, 0), 1: (1123, 0, 849, 11313845, 2614, 0, 18, 0)}
+    assert sched == {0: (1431584425478, 140710254021, 1207390), 1: (880045893327, 65348126114, 735120)}
+
+def test_kernel_time_stats_deltas(monitoring):
+    prev = (10.0, {0: (1000, 0, 200, 5000, 10, 5, 5, 0), 1: (0,) * 8},
+            {0: (1_000_000_000, 50_000_000, 1000)})
+    current = (12.0, {0: (1150, 10, 220, 5000, 10, 15, 15, 0), 1: (0, 0, 0, 200, 0, 0, 0, 0), 2: (1,) * 8},
+               {0: (2_900_000_000, 53_000_000, 1500), 1: (10, 0, 1)})
+    stats = monitoring.kernel_time_stats(current, prev)
+    assert set(stats) == {0, 1} # cpu2 has no previous sample
+    s = stats[0] # 200 ticks: 160 user+nice, 20 system, 10 irq, 10 softirq, none idle
+    assert (s['usr'], s['sys'], s['irq'], s['sirq']) == pytest.approx((80.0, 10.0, 5.0, 5.0))
+    assert s['busy'] == pytest.approx(100.0)
+    assert s['run'] == pytest.approx(95.0) # 1.9 s of run time over 2 s
+    assert s['runq_ms'] == pytest.approx(3.0)
+    assert s['slices'] == pytest.approx(250.0)
+    assert stats[1]['busy'] == 0.0 and 'run' not in stats[1]
+
+def test_kernel_time_stats_clamps_counter_resets(monitoring):
+    prev = (0.0, {0: (500, 0, 0, 500, 0, 0, 0, 0)}, {0: (5, 5, 5)})
+    current = (1.0, {0: (100, 0, 0, 600, 0, 0, 0, 0)}, {0: (1, 1, 1)})
+    s = monitoring.kernel_time_stats(current, prev)[0]
+    assert (s['usr'], s['busy'], s['run'], s['slices']) == (0.0, 0.0, 0.0, 0.0)
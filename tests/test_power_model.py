@@ -0,0 +1,39 @@
+import pytest
+
+# Per-package feature sums (APERF GHz, instructions G/s, C6 fraction) from a 16-core
+# package ramping up, with PkgWatt = 35 + 4*GHz + 1.5*Gips - 12*C6
+FEATURES = [(3.2, 1.1, 12.5), (8.0, 6.3, 10.1), (14.7, 9.8, 8.2), (22.1, 19.6, 5.0),
+            (27.5, 20.4, 3.3), (30.9, 31.2, 1.9), (33.0, 28.7, 1.0), (12.4, 3.9, 9.6),
+            (19.8, 15.5, 6.4), (25.6, 24.0, 4.1)]
+
+def watts(f):
+    return 35.0 + 4.0 * f[0] + 1.5 * f[1] - 12.0 * f[2]
+
+def test_fit_recovers_linear_model(monitoring):
+    intercept, weights, r2 = monitoring.PowerModel()._fit([(f, watts(f)) for f in FEATURES])
+    # APERF and C6 are strongly collinear here, so the ridge term trades weight between them
+    assert weights == pytest.approx([4.0, 1.5, -12.0], rel=0.1)
+    for f in FEATURES: assert intercept + sum(w * v for w, v in zip(weights, f)) == pytest.approx(watts(f), abs=0.5)
+    assert r2 > 0.999
+
+def test_fit_ignores_constant_feature(monitoring):
+    samples = [((f[0], f[1], 0.0), 35.0 + 4.0 * f[0] + 1.5 * f[1]) for f in FEATURES]
+    intercept, weights, r2 = monitoring.PowerModel()._fit(samples)
+    assert weights[2] == 0.0
+    assert weights[:2] == pytest.approx([4.0, 1.5], rel=0.05)
+    assert r2 > 0.999
+
+def test_fit_constant_power_has_no_explained_variance(monitoring):
+    intercept, weights, r2 = monitoring.PowerModel()._fit([(f, 80.0) for f in FEATURES])
+    assert intercept == pytest.approx(80.0)
+    assert weights == pytest.approx([0.0, 0.0, 0.0], abs=1e-9)
+    assert r2 == 0.0
+
+def test_estimate_shares_intercept_across_cpus(monitoring):
+    model = monitoring.PowerModel()
+    model.fits[0] = (32.0, [4.0, 1.5, -12.0], 0.99, 16)
+    metrics = {'interval': 1.0, 'aperf': 2.0e9, 'instr': 1.0e9, 'c6': 0.5}
+    watts, nj_per_instr, r2 = model.estimate(3, metrics, {3: {'pkg_id': 0}})
+    assert watts == pytest.approx(2.0 + 8.0 + 1.5 - 6.0)
+    assert nj_per_instr == pytest.approx(watts)
+    assert r2 == 0.99
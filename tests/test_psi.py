@@ -0,0 +1,39 @@
+def psi(some_total, full_total=None):
+    """A PSI file as the kernel writes it (the avg fields are ignored)."""
+    text = f"some avg10=1.52 avg60=0.87 avg300=0.31 total={some_total}\n"
+    if full_total is not None: text += f"full avg10=0.00 avg60=0.00 avg300=0.00 total={full_total}\n"
+    return text
+
+def test_pressure_sources(monitoring):
+    sources = monitoring.pressure_sources({'du-1': '/sys/fs/cgroup/kubepods.slice/pod1'})
+    assert sources['system'] == {'cpu': '/proc/pressure/cpu', 'memory': '/proc/pressure/memory', 'io': '/proc/pressure/io'}
+    assert sources['du-1'] == {'cpu': '/sys/fs/cgroup/kubepods.slice/pod1/cpu.pressure',
+                               'memory': '/sys/fs/cgroup/kubepods.slice/pod1/memory.pressure'}
+
+def test_reader_deltas_and_summary(monitoring, tmp_path):
+    files = {('system', 'cpu'): psi(1_000_000, 0), ('system', 'io'): psi(500, 100), ('du-1', 'cpu'): psi(20_000, 10_000)}
+    for (label, resource), text in files.items(): (tmp_path / f"{label}.{resource}").write_text(text)
+    sources = {'system': {r: str(tmp_path / f"system.{r}") for r in ('cpu', 'memory', 'io')}, # No memory file: skipped
+               'du-1': {'cpu': str(tmp_path / 'du-1.cpu')}}
+    reader = monitoring.PressureReader()
+    try:
+        reader.set_sources(sources)
+        assert set(reader.fds) == set(files)
+        prev = reader.sample()
+        assert prev.totals['system'] == {'cpu': {'some': 1_000_000, 'full': 0}, 'io': {'some': 500, 'full': 100}}
+        (tmp_path / 'system.cpu').write_text(psi(1_050_000, 0)) # Same inode: pread sees the new totals
+        (tmp_path / 'system.io').write_text(psi(500, 100))
+        (tmp_path / 'du-1.cpu').write_text(psi(45_000, 12_000))
+        current = reader.sample()
+        reader.set_sources({'system': sources['system']}) # Pod gone: its fd is closed
+        assert ('du-1', 'cpu') not in reader.fds
+    finally: reader.close()
+    current.timestamp = prev.timestamp + 0.5
+    assert monitoring.pressure_summaries(current.delta(prev)) == [
+        "PSI system:\tcpu_some%=10.00\tcpu_some_ms=50.0\tio_some%=0.00\tio_some_ms=0.0\tio_full%=0.00\tio_full_ms=0.0",
+        "PSI du-1:\tcpu_some%=5.00\tcpu_some_ms=25.0\tcpu_full%=0.40\tcpu_full_ms=2.0",
+    ]
+
+def test_delta_needs_a_later_sample(monitoring):
+    data = monitoring.PressureData(); data.timestamp = 5.0
+    assert data.delta(None) is None and data.delta(data) is None
@@ -0,0 +1,100 @@
+import os
+import time
+
+import pytest
+
+def test_mgmt_message_round_trip(monitoring):
+    m = monitoring
+    source = bytes(range(10))
+    msg = m.ptp_mgmt_message(m.PTP_ACTION_RESPONSE, m.PTP_MID_PORT_DATA_SET, 4242, 0, source, b'\x01\x02\x03\x04')
+    assert m.parse_ptp_mgmt(msg) == (4242, m.PTP_ACTION_RESPONSE, m.PTP_MID_PORT_DATA_SET, b'\x01\x02\x03\x04')
+
+def test_parse_rejects_short_and_non_management(monitoring):
+    m = monitoring
+    msg = m.ptp_mgmt_message(m.PTP_ACTION_GET, m.PTP_MID_CURRENT_DATA_SET, 1, 0, bytes(10))
+    assert m.parse_ptp_mgmt(msg[:20]) is None
+    assert m.parse_ptp_mgmt(bytes([0x00]) + msg[1:]) is None # Sync message type
+
+def test_poll_against_standin(monitoring, tmp_path):
+    m = monitoring
+    standin = m.PmcStandIn(str(tmp_path / 'ptp4l'))
+    client = m.PmcClient(standin.path)
+    try: status = client.poll()
+    finally:
+        client.close(); standin.close()
+    assert status['port_state'] == 'SLAVE'
+    assert status['steps_removed'] == 1
+    assert status['path_delay_ns'] == 750.0
+    assert -160.0 <= status['offset_ns'] <= 160.0 and status['offset_ns'].is_integer()
+    assert -160 <= status['master_offset_ns'] <= 160
+    assert status['gm_present'] is True
+    assert not (tmp_path / 'ptp4l').exists()
+
+def test_standin_refuses_existing_path(monitoring, tmp_path):
+    path = tmp_path / 'ptp4lro'
+    path.write_text('')
+    with pytest.raises(FileExistsError): monitoring.PmcStandIn(str(path))
+    assert path.exists()
+
+def test_standin_default_path_is_temporary(monitoring):
+    standin = monitoring.PmcStandIn()
+    tmp_dir = standin.tmp_dir
+    standin.close()
+    assert not os.path.exists(tmp_dir)
+
+PTP4L = "ptp4l[5374.118]: master offset         -9 s2 freq   -2400 path delay       525"
+PHC2SYS = "phc2sys[5374.168]: CLOCK_REALTIME phc offset       -12 s2 freq  -32766 delay    596"
+TS2PHC = "ts2phc[5375.001]: /dev/ptp0 offset       -131 s1 freq     +91"
+
+def wait_for_lines(tail, daemon, count, timeout=3.0):
+    """(lines, max |offset|) of daemon collected until count lines arrived or the timeout."""
+    deadline, n, max_abs = time.monotonic() + timeout, 0, 0
+    while time.monotonic() < deadline and n < count:
+        s = tail.collect().get(daemon)
+        if s: n, max_abs = n + s['n'], max(max_abs, s['max_abs_ns'])
+        time.sleep(0.01)
+    return n, max_abs
+
+def test_log_servo_lines(monitoring):
+    tail = monitoring.PtpLogTail([])
+    for line in (PTP4L, PHC2SYS, TS2PHC, "ptp4l[5374.2]: selected best master clock 001122.fffe.334455"):
+        tail._line(line, 'ptp4l.log')
+    stats = tail.collect()
+    assert stats['ptp4l'] == {'n': 1, 'offset_ns': -9, 'max_abs_ns': 9, 'servo': 's2', 'freq_ppb': -2400, 'delay_ns': 525}
+    assert (stats['phc2sys']['offset_ns'], stats['phc2sys']['delay_ns']) == (-12, 596)
+    assert (stats['ts2phc']['servo'], stats['ts2phc']['freq_ppb'], 'delay_ns' in stats['ts2phc']) == ('s1', 91, False)
+    assert tail.collect() == {}
+    tail.close()
+
+def test_log_partial_line_and_rotation(monitoring, tmp_path, monkeypatch):
+    monkeypatch.setattr(monitoring, 'LOG_REOPEN_SEC', 0.05)
+    path = tmp_path / 'ts2phc.stdout'
+    path.write_text(PTP4L + "\n") # Present at startup: skipped
+    tail = monitoring.PtpLogTail([str(path)])
+    try:
+        time.sleep(0.1)
+        with open(path, 'a') as f:
+            f.write(PTP4L[:30]); f.flush() # Partly written line is held back, not matched and dropped
+            time.sleep(0.1)
+            f.write(PTP4L[30:] + "\n")
+        assert wait_for_lines(tail, 'ptp4l', 1) == (1, 9)
+        os.rename(path, tmp_path / 'ts2phc.stdout.1')
+        path.write_text(TS2PHC + "\n")
+        assert wait_for_lines(tail, 'ts2phc', 1) == (1, 131)
+    finally:
+        tail.close()
+
+def test_log_fifo_does_not_block_startup(monitoring, tmp_path):
+    path = tmp_path / 'ptp4l.fifo'
+    os.mkfifo(path)
+    start = time.monotonic()
+    tail = monitoring.PtpLogTail([str(path)]) # No writer yet
+    try:
+        assert time.monotonic() - start < 0.5
+        for _ in range(2):
+            with open(path, 'w') as f: f.write(PTP4L + "\n")
+        assert wait_for_lines(tail, 'ptp4l', 2) == (2, 9)
+    finally:
+        tail.close()
+        try: os.close(os.open(path, os.O_WRONLY | os.O_NONBLOCK)) # Unblocks the reader waiting for the next writer
+        except OSError: pass # No reader left
@@ -0,0 +1,50 @@
+import pytest
+
+HEADER = "Core\tCPU\t ActMHz\tAvg_MHz\tBusy%\tBzy_MHz\tTSC_MHz\t IRQ\tPOLL%\t C1%\t C1E%\t C6%\tIPC"
+BUSY = {0: 10.0, 1: 90.0, 2: 5.0, 3: 60.0, 4: 2.0, 5: 85.0, 6: 3.0, 7: 4.0}
+
+def recorded_log(scale):
+    lines = ["--- 2026-10-19 10:00:00 UTC ---", HEADER]
+    for cpu, busy in BUSY.items():
+        lines.append(f"{cpu % 4}\t{cpu}\t 2900.0\t 1000.0\t{busy * scale:.2f}\t 2900.0\t 2200.0\t 1000\t0.00\t 0.00\t 0.00\t 1.00\t1.50")
+    lines.append("Thread 1:\tcomm=l1_dl#0\tpid/tid=4242/4250\ttenant=du-1\tCPU%=80.00\tvcsw=10\tnvcsw=0\tRunDly_ms=0.010")
+    lines.append("NUMA:\tnode=0\tother=0.0%")
+    return "\n".join(lines) + "\n"
+
+def topology():
+    return {cpu: {'siblings': [cpu % 4, cpu % 4 + 4], 'node_id': 0} for cpu in range(8)}
+
+CONFIG = {'du-1': {'roles': {'l1_dl_cpus': [1], 'l1_ul_cpus': [5], 'low_priority_cpus': [0]}, 'nics': [], 'eal_args': None}}
+
+def test_parse_recorded_run(monitoring, tmp_path):
+    (tmp_path / 'a.log').write_text(recorded_log(1.0))
+    (tmp_path / 'b.log').write_text(recorded_log(0.5).replace(HEADER, HEADER.replace("\tIPC", ""), 1).replace("\t1.50\n", "\n"))
+    stats, threads = monitoring.parse_recorded_run([str(tmp_path / 'a.log'), str(tmp_path / 'b.log')])
+    assert stats[1] == pytest.approx({'Busy%': 67.5, 'IPC': 0.75, 'IRQ': 1000.0, 'C6%': 1.0}) # IPC only in the first log
+    assert sorted(stats) == list(range(8))
+    assert threads == {(1, 'du-1'): 80.0} # Summed over both logs, averaged over the CPU's rows
+
+def test_role_demands(monitoring):
+    stats = {cpu: {'Busy%': busy} for cpu, busy in BUSY.items()}
+    demands = monitoring.role_demands(CONFIG, monitoring.gnb_cpu_roles(CONFIG), stats, {(1, 'du-1'): 80.0})
+    assert {d['role']: (d['cpu'], d['demand'], d['rt']) for d in demands} == {
+        'l1_dl_cpus': (1, 80.0, True), 'l1_ul_cpus': (5, 85.0, True), 'low_priority_cpus': (0, 10.0, False)}
+
+def test_recommend_placement_splits_smt_siblings(monitoring):
+    stats = {cpu: {'Busy%': busy} for cpu, busy in BUSY.items()}
+    placement, predicted = monitoring.recommend_placement(CONFIG, stats, {}, topology(), list(range(8)))
+    # l1_dl keeps CPU 1; l1_ul leaves its sibling 5 for CPU 0, whose sibling 4 is idle;
+    # CPU 3 (60% background load) is left to the OS
+    assert dict(placement) == {('du-1', 'l1_dl_cpus'): [1], ('du-1', 'l1_ul_cpus'): [0], ('du-1', 'low_priority_cpus'): [6]}
+    assert (predicted[1], predicted[0], predicted[6], predicted[3]) == (90.0, 85.0, 13.0, 60.0)
+
+def test_format_expert_execution(monitoring):
+    config = dict(CONFIG['du-1'], eal_args="--lcores (0-1)@(9) -a 0000:51:11.0")
+    placement = {('du-1', 'eal_lcores'): [2], ('du-1', 'l1_dl_cpus'): [1], ('du-1', 'low_priority_cpus'): [6]}
+    text = monitoring.format_expert_execution('du-1', config, placement, {1: 90.0, 2: 40.0, 6: 13.0})
+    assert text.splitlines() == [
+        "# du-1: recommended pinning (predicted Busy% per core after the move)",
+        "hal:", '   eal_args: "--lcores (0-1)@(2) -a 0000:51:11.0"   # 2:40%',
+        "expert_execution:", "  affinities:", "    low_priority_cpus: 6   # 6:13%",
+        "  cell_affinities:", "    -", "       l1_dl_cpus: 1   # 1:90%",
+    ]
@@ -0,0 +1,38 @@
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+LEAP_SECONDS_SINCE_GPS_EPOCH = 18 # TAI-UTC is 37 s now and was 19 s at the GPS epoch
+
+def tai_ns(utc):
+    return (int(utc.timestamp()) + 37) * 1_000_000_000 + utc.microsecond * 1000
+
+@pytest.mark.parametrize('offset_ns, frame, sfn', [
+    (0, 0, 0), (9_999_999, 0, 0), (10_000_000, 1, 1),
+    (1023 * 10_000_000, 1023, 1023), (1024 * 10_000_000, 1024, 0), (10_245_000_000, 1024, 0),
+])
+def test_frame_and_sfn_from_gps_epoch(monitoring, offset_ns, frame, sfn):
+    assert monitoring.SampleClock.frame_and_sfn(monitoring.GPS_EPOCH_TAI_NS + offset_ns) == (frame, sfn)
+
+def test_gps_epoch_on_tai_timescale(monitoring):
+    assert monitoring.GPS_EPOCH_TAI_NS == tai_ns(datetime(1980, 1, 6, tzinfo=timezone.utc)) - LEAP_SECONDS_SINCE_GPS_EPOCH * 1_000_000_000
+
+def test_frame_and_sfn_today(monitoring):
+    utc = datetime(2026, 10, 19, 10, 0, 0, 125_000, tzinfo=timezone.utc)
+    gps_seconds = int(utc.timestamp()) - 315_964_800 + LEAP_SECONDS_SINCE_GPS_EPOCH
+    frame = gps_seconds * 100 + 12 # 125 ms into the second is frame 12
+    assert monitoring.SampleClock.frame_and_sfn(tai_ns(utc)) == (frame, frame % 1024)
+
+@pytest.mark.parametrize('interval_sec, interval_ns', [(1.0, 1_000_000_000), (1.234, 1_230_000_000), (0.004, 10_000_000)])
+def test_interval_rounds_to_frames(monitoring, interval_sec, interval_ns):
+    assert monitoring.SampleClock('tai', interval_sec).interval_ns == interval_ns
+
+def test_wait_next_lands_on_frame_boundaries(monitoring):
+    clock = monitoring.SampleClock('tai', 0.01)
+    target, actual = clock.wait_next()
+    assert (target - monitoring.GPS_EPOCH_TAI_NS) % monitoring.FRAME_NS == 0
+    assert 0 <= actual - target < monitoring.FRAME_NS
+    assert clock.wait_next()[0] == target + monitoring.FRAME_NS
+    time.sleep(0.025) # Overrun: skips to the next boundary instead of catching up
+    assert clock.wait_next()[0] >= target + 4 * monitoring.FRAME_NS
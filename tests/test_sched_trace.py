@@ -0,0 +1,98 @@
+import os
+import struct
+
+import pytest
+
+# tracefs header_page and sched_switch format as laid out by 6.x x86_64 kernels
+HEADER_PAGE = """\
+\tfield: u64 timestamp;\toffset:0;\tsize:8;\tsigned:0;
+\tfield: local_t commit;\toffset:8;\tsize:8;\tsigned:1;
+\tfield: int overwrite;\toffset:8;\tsize:1;\tsigned:1;
+\tfield: char data;\toffset:16;\tsize:4080;\tsigned:1;
+"""
+SCHED_SWITCH_FORMAT = """\
+name: sched_switch
+ID: 316
+format:
+\tfield:unsigned short common_type;\toffset:0;\tsize:2;\tsigned:0;
+\tfield:unsigned char common_flags;\toffset:2;\tsize:1;\tsigned:0;
+\tfield:unsigned char common_preempt_count;\toffset:3;\tsize:1;\tsigned:0;
+\tfield:int common_pid;\toffset:4;\tsize:4;\tsigned:1;
+
+\tfield:char prev_comm[16];\toffset:8;\tsize:16;\tsigned:0;
+\tfield:pid_t prev_pid;\toffset:24;\tsize:4;\tsigned:1;
+\tfield:int prev_prio;\toffset:28;\tsize:4;\tsigned:1;
+\tfield:long prev_state;\toffset:32;\tsize:8;\tsigned:1;
+\tfield:char next_comm[16];\toffset:40;\tsize:16;\tsigned:0;
+\tfield:pid_t next_pid;\toffset:56;\tsize:4;\tsigned:1;
+\tfield:int next_prio;\toffset:60;\tsize:4;\tsigned:1;
+
+print fmt: "prev_comm=%s prev_pid=%d prev_prio=%d prev_state=%s%s ==> next_comm=%s next_pid=%d next_prio=%d"
+"""
+SCHED_WAKEUP_ID = 317
+PAGE_TS = 5_000_000_000
+
+def sched_switch(prev_comm, prev_pid, prev_state, next_comm, next_pid):
+    return struct.pack('<HBBi16siiq16sii', 316, 0, 0, prev_pid, prev_comm.encode(), prev_pid, 120,
+                       prev_state, next_comm.encode(), next_pid, 120)
+
+def data_event(delta, payload):
+    """A ring-buffer event with the length in type_len, or in the next word when it does not fit."""
+    if len(payload) <= 28 * 4: return struct.pack('<I', len(payload) // 4 | delta << 5) + payload
+    return struct.pack('<II', delta << 5, len(payload) + 4) + payload
+
+def time_extend(delta):
+    return struct.pack('<II', 30 | (delta & 0x7FFFFFF) << 5, delta >> 27)
+
+def page(*events, missed=False):
+    data = b''.join(events)
+    return struct.pack('<Qq', PAGE_TS, len(data) | (1 << 31 if missed else 0)) + data + struct.pack('<I', 29) + bytes(64)
+
+@pytest.fixture
+def tracer(monitoring, tmp_path):
+    (tmp_path / 'header_page').write_text(HEADER_PAGE)
+    (tmp_path / 'sched_switch').write_text(SCHED_SWITCH_FORMAT)
+    header = monitoring.parse_event_format(str(tmp_path / 'header_page'))[1]
+    event_id, fields = monitoring.parse_event_format(str(tmp_path / 'sched_switch'))
+    tracer = object.__new__(monitoring.SchedTracer) # Skips the tracefs setup in __init__
+    tracer.commit_off, tracer.commit_size, tracer.data_off = header['commit'][0], header['commit'][1], header['data'][0]
+    tracer.formats = {event_id: ('sched_switch', fields), SCHED_WAKEUP_ID: ('sched_wakeup', {})}
+    tracer.cpus, tracer.page_size, tracer.switched_out, tracer.fds = [3], 4096, {}, {}
+    tracer.buffers = {3: bytearray(tracer.page_size)}
+    yield tracer
+    for fd in tracer.fds.values(): os.close(fd)
+
+def test_parse_event_format(monitoring, tmp_path):
+    (tmp_path / 'format').write_text(SCHED_SWITCH_FORMAT)
+    event_id, fields = monitoring.parse_event_format(str(tmp_path / 'format'))
+    assert event_id == 316
+    assert fields['prev_comm'] == (8, 16, False, 'str')
+    assert fields['prev_state'] == (32, 8, True, 'int')
+    assert fields['next_pid'] == (56, 4, True, 'int')
+
+def test_events_decodes_timestamps_and_lengths(monitoring, tracer):
+    buf = page(data_event(100, sched_switch('ru_tx_0', 1200, 0, 'ksoftirqd/3', 31)),
+               time_extend(3 << 27 | 5),
+               data_event(7, struct.pack('<H', SCHED_WAKEUP_ID) + bytes(150)),
+               data_event(9, struct.pack('<H', 999) + bytes(6))) # Unknown event id: skipped
+    events = [(ts, name) for ts, (name, _), _ in tracer._events(buf, len(buf))]
+    assert events == [(PAGE_TS + 100, 'sched_switch'), (PAGE_TS + 100 + (3 << 27) + 5 + 7, 'sched_wakeup')]
+
+def test_events_stops_at_commit(monitoring, tracer):
+    buf = bytearray(page(data_event(10, sched_switch('a', 1, 1, 'b', 2))))
+    buf[8:16] = struct.pack('<q', 32) # Commit ends inside the first event's payload
+    assert list(tracer._events(buf, len(buf))) == []
+
+def test_collect_reports_preemption_gap(monitoring, tracer):
+    read_fd, write_fd = os.pipe()
+    os.set_blocking(read_fd, False)
+    tracer.fds = {3: read_fd}
+    os.write(write_fd, page(data_event(100, sched_switch('ru_tx_0', 1200, 0, 'ksoftirqd/3', 31)),
+                            data_event(2500, sched_switch('ksoftirqd/3', 31, 1, 'ru_tx_0', 1200)),
+                            data_event(50, sched_switch('ru_tx_0', 1200, 1, 'swapper/3', 0)), missed=True))
+    os.close(write_fd)
+    s = tracer.collect({1200})[3]
+    assert (s['switches'], s['preempts'], s['pages'], s['lost_pages']) == (3, 1, 1, 1)
+    assert dict(s['preemptors']) == {'ksoftirqd/3': 1}
+    assert (s['max_gap_ns'], s['max_gap_task']) == (2500, 'ru_tx_0/1200')
+    assert tracer.switched_out == {1200: (PAGE_TS + 2650, False)}
@@ -0,0 +1,55 @@
+import os
+
+import pytest
+
+PROC_SOFTIRQS = """\
+                    CPU0       CPU1       CPU2       CPU3
+          HI:          0          1          0          0
+       TIMER:     405237     271842    1201930      90210
+      NET_TX:         12          3          0          1
+      NET_RX:      10051       2014    8810446          7
+       BLOCK:      30120       1102          0          0
+    IRQ_POLL:          0          0          0          0
+     TASKLET:         41          2          0          0
+       SCHED:     512034     301120     100230      60021
+     HRTIMER:          0          0          0          0
+         RCU:     280411     190120      50010      40003
+"""
+# After CPU1 went offline: the columns shift
+PROC_SOFTIRQS_HOTPLUG = """\
+                    CPU0       CPU2       CPU3
+       TIMER:     405300    1202930      90211
+      NET_RX:      10051    8811446          7
+"""
+
+def reader(monitoring, tmp_path, text, target_cpus):
+    (tmp_path / 'softirqs').write_text(text)
+    r = object.__new__(monitoring.SoftirqReader) # Reads the captured file instead of /proc/softirqs
+    r.target_cpus, r.header, r.positions = target_cpus, None, []
+    r.fd = os.open(tmp_path / 'softirqs', os.O_RDONLY)
+    return r
+
+def test_sample_reads_target_columns(monitoring, tmp_path):
+    r = reader(monitoring, tmp_path, PROC_SOFTIRQS, [1, 2])
+    try: _, counts = r.sample()
+    finally: r.close()
+    assert counts['NET_RX'] == {1: 2014, 2: 8810446}
+    assert counts['TIMER'] == {1: 271842, 2: 1201930}
+    assert set(counts) == {'HI', 'TIMER', 'NET_TX', 'NET_RX', 'BLOCK', 'IRQ_POLL', 'TASKLET', 'SCHED', 'HRTIMER', 'RCU'}
+
+def test_sample_follows_header_change(monitoring, tmp_path):
+    r = reader(monitoring, tmp_path, PROC_SOFTIRQS, [1, 2])
+    try:
+        r.sample()
+        (tmp_path / 'softirqs').write_text(PROC_SOFTIRQS_HOTPLUG) # Same inode, new content
+        _, counts = r.sample()
+    finally: r.close()
+    assert counts == {'TIMER': {2: 1202930}, 'NET_RX': {2: 8811446}}
+
+def test_softirq_rates(monitoring):
+    prev = (10.0, {'NET_RX': {2: 1000, 3: 50}, 'TIMER': {2: 400}})
+    current = (12.0, {'NET_RX': {2: 5000, 3: 10}, 'TIMER': {2: 600}, 'RCU': {2: 70}})
+    rates = monitoring.softirq_rates(current, prev)
+    assert rates[2] == pytest.approx({'NET_RX': 2000.0, 'TIMER': 100.0, 'RCU': 0.0}) # RCU has no previous count
+    assert rates[3] == {'NET_RX': 0.0} # Counter went backwards (CPU hotplug)
+    assert monitoring.softirq_rates(prev, prev) == {}
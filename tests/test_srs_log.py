@@ -0,0 +1,93 @@
+import csv
+import os
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+# srsdu log lines (srslog format: UTC timestamp, padded layer tag, level)
+LATE_DL = "2026-10-19T10:00:00.250000 [RU      ] [W] Real-time failure in RU: received late downlink request from slot 412.3. This is probably caused by the processing taking too long"
+LATE_UL = "2026-10-19T10:00:00.500000 [RU      ] [W] Real-time failure in RU: received late uplink request from slot 412.5"
+RF_UNDERFLOW = "2026-10-19T10:00:00.750000 [RF      ] [W] Real-time failure in RF: underflow"
+OFH_RX_WINDOW = "2026-10-19T10:00:01.000000 [OFH     ] [W] Sector#0: received 3 late and 0 early uplink messages outside the reception window"
+MISSED = "2026-10-19T10:00:01.250000 [OFH     ] [I] Missed incoming User-Plane uplink messages for slot 413.0"
+OTHER_UNDERFLOW = "2026-10-19T10:00:01.500000 [RLC     ] [W] ue=0 DRB1 DL: tx buffer underflow, late uplink grant"
+NO_MATCH = "2026-10-19T10:00:01.750000 [MAC     ] [I] ue=0 rnti=0x4601 created"
+
+@pytest.fixture
+def tail(monitoring, tmp_path):
+    tail = monitoring.SrsLogTail([], monitoring.SRS_LOG_EVENTS, csv_path=str(tmp_path / 'events.csv'))
+    yield tail
+    tail.close()
+
+@pytest.mark.parametrize('line, event', [
+    (LATE_DL, 'late_dl'), (LATE_UL, 'ul_underflow'), (RF_UNDERFLOW, 'ul_underflow'),
+    (OFH_RX_WINDOW, 'ofh_rx_window'), (MISSED, 'ofh_rx_window'), (OTHER_UNDERFLOW, None), (NO_MATCH, None),
+])
+def test_event_patterns(tail, line, event):
+    m = tail.pattern.search(line)
+    assert (m.lastgroup if m else None) == event
+
+def test_event_uses_log_timestamp_as_utc(tail, tmp_path):
+    for line in (LATE_DL, RF_UNDERFLOW, LATE_UL):
+        tail._event(tail.pattern.search(line).lastgroup, line, 'du.log')
+    stats = tail.take()
+    start = datetime(2026, 10, 19, 10, 0, 0, tzinfo=timezone.utc).timestamp()
+    assert stats['late_dl']['n'] == 1 and stats['late_dl']['first'] == start + 0.25
+    assert (stats['ul_underflow']['n'], stats['ul_underflow']['first'], stats['ul_underflow']['last']) == (2, start + 0.75, start + 0.5)
+    assert tail.take() == {}
+    tail.csv.flush()
+    with open(tmp_path / 'events.csv') as f: rows = list(csv.DictReader(f))
+    assert [(float(r['time']), r['event'], r['source'], r['line']) for r in rows][0] == (start + 0.25, 'late_dl', 'du.log', LATE_DL)
+
+def test_event_local_time_and_missing_timestamp(monitoring, monkeypatch):
+    monkeypatch.setenv('TZ', 'Europe/Rome'); time.tzset()
+    try:
+        tail = monitoring.SrsLogTail([], monitoring.SRS_LOG_EVENTS, tz=None)
+        tail._event('late_dl', LATE_DL, 'du.log')
+        before = time.time()
+        tail._event('ul_underflow', "Real-time failure in RF: underflow", 'du.log')
+        stats = tail.take()
+    finally:
+        monkeypatch.delenv('TZ'); time.tzset()
+    assert stats['late_dl']['first'] == datetime(2026, 10, 19, 8, 0, 0, 250000, tzinfo=timezone.utc).timestamp() # CEST is UTC+2
+    assert before <= stats['ul_underflow']['first'] <= time.time() # Falls back to the read time
+
+def wait_for_count(tail, name, count, timeout=3.0):
+    deadline, total = time.monotonic() + timeout, 0
+    while time.monotonic() < deadline and total < count:
+        total += tail.take().get(name, {}).get('n', 0)
+        time.sleep(0.01)
+    return total
+
+def test_follow_rotated_and_truncated_file(monitoring, tmp_path, monkeypatch):
+    monkeypatch.setattr(monitoring, 'LOG_REOPEN_SEC', 0.05)
+    path = tmp_path / 'du.log'
+    path.write_text(LATE_DL + "\n") # Present at startup: skipped
+    tail = monitoring.SrsLogTail([str(path)], monitoring.SRS_LOG_EVENTS)
+    try:
+        time.sleep(0.1)
+        with open(path, 'a') as f: f.write(LATE_DL + "\n")
+        assert wait_for_count(tail, 'late_dl', 1) == 1
+        os.rename(path, tmp_path / 'du.log.1')
+        path.write_text(LATE_DL + "\n" + LATE_DL + "\n") # Rotated: read from the start
+        assert wait_for_count(tail, 'late_dl', 2) == 2
+        path.write_text("") # Truncated (copytruncate)
+        time.sleep(0.2)
+        with open(path, 'a') as f: f.write(LATE_DL + "\n")
+        assert wait_for_count(tail, 'late_dl', 1) == 1
+    finally:
+        tail.close()
+
+def test_follow_fifo_across_writers(monitoring, tmp_path):
+    path = tmp_path / 'du.fifo'
+    os.mkfifo(path)
+    tail = monitoring.SrsLogTail([str(path)], monitoring.SRS_LOG_EVENTS)
+    try:
+        for _ in range(3): # Each writer closing the FIFO, as on a DU restart
+            with open(path, 'w') as f: f.write(RF_UNDERFLOW + "\n")
+        assert wait_for_count(tail, 'ul_underflow', 3) == 3
+    finally:
+        tail.close()
+        try: os.close(os.open(path, os.O_WRONLY | os.O_NONBLOCK)) # Unblocks the reader waiting for the next writer
+        except OSError: pass # No reader left
@@ -0,0 +1,43 @@
+import json
+from collections import defaultdict
+
+# Trimmed srsRAN Project JSON metrics datagrams: a per-cell scheduler report and an RLC report
+CELL_REPORT = json.loads("""
+{"timestamp": 1760868000.123, "cells": [
+  {"cell_metrics": {"pci": 1, "average_latency": 45, "nof_failed_pdcch_allocs": 0, "max_dl_prb_usage": 96, "ul_nof_prbs": 51},
+   "ue_list": [
+     {"ue_container": {"pci": 1, "rnti": 17921, "cqi": 15, "dl_mcs": 27, "dl_brate": 120000000.0, "dl_nof_ok": 400,
+                       "ul_mcs": 28, "ul_brate": 30000000.0, "ul_nof_ok": 200, "bsr": 0}},
+     {"ue_container": {"pci": 1, "rnti": 17922, "cqi": 9, "dl_brate": 5000000.0, "ul_brate": null}}]},
+  {"cell_metrics": {"pci": 2, "average_latency": 51, "max_dl_prb_usage": 12},
+   "ue_list": []}]}
+""")
+RLC_REPORT = json.loads("""
+{"timestamp": 1760868000.125, "rlc_metrics": {"du_id": 0, "ue_id": 0, "drb_id": 1,
+  "tx": {"num_sdus": 1200, "num_sdu_bytes": 1500000, "num_pdus": 1300, "num_pdu_bytes": 1560000},
+  "rx": {"num_sdus": 300, "num_sdu_bytes": 400000, "num_pdus": 300, "num_pdu_bytes": 410000}}}
+""")
+
+def new_acc():
+    return {'cells': {}, 'rlc_bytes': defaultdict(float)}
+
+def test_cell_report(monitoring):
+    acc = new_acc()
+    monitoring.walk_srsran_metrics(CELL_REPORT, acc)
+    assert set(acc['cells']) == {1, 2}
+    cell = acc['cells'][1]
+    assert (cell['dl_bps'], cell['ul_bps'], cell['ues']) == (125e6, 30e6, 2)
+    assert dict(cell['prb']) == {'max_dl_prb_usage': 96, 'ul_nof_prbs': 51}
+    assert (acc['cells'][2]['ues'], dict(acc['cells'][2]['prb'])) == (0, {'max_dl_prb_usage': 12})
+    assert not acc['rlc_bytes']
+
+def test_rlc_report(monitoring):
+    acc = new_acc()
+    for _ in range(2): monitoring.walk_srsran_metrics(RLC_REPORT, acc)
+    assert dict(acc['rlc_bytes']) == {'tx': 3000000.0, 'rx': 800000.0}
+    assert acc['cells'] == {}
+
+def test_ue_without_pci_goes_to_unknown_cell(monitoring):
+    acc = new_acc()
+    monitoring.walk_srsran_metrics({'ue_list': [{'rnti': 1, 'dl_brate': 1000, 'ul_brate': 10}]}, acc)
+    assert (acc['cells'][None]['dl_bps'], acc['cells'][None]['ues']) == (1000.0, 1)
@@ -0,0 +1,37 @@
+from types import SimpleNamespace
+
+import pytest
+
+BASE_FIELDS = 21 # Core .. RAMWatt
+
+def metrics(busy, avg_mhz, bzy_mhz, ipc, c6=0.5, act_mhz=3000.0, core_temp=50, pkg_temp=55, pkg_watt=100.0, ram_watt=10.0, irq=1000):
+    return {'busy': busy, 'avg_mhz': avg_mhz, 'bzy_mhz': bzy_mhz, 'ipc': ipc, 'act_mhz': act_mhz, 'tsc_mhz': 2200.0,
+            'irq': irq, 'poll': 0.0, 'c1': 1.0, 'c1e': 2.0, 'c6': c6, 'core_temp': core_temp,
+            'core_thr': False, 'pkg_temp': pkg_temp, 'pkg_watt': pkg_watt, 'ram_watt': ram_watt}
+
+ROWS = {0: metrics(90.0, 2700.0, 3000.0, 2.0), 1: metrics(10.0, 300.0, 3000.0, 1.0, act_mhz=None, core_temp=61),
+        2: metrics(0.0, 0.0, 0.0, 0.0, c6=0.9, pkg_temp=70, pkg_watt=80.0, ram_watt=8.0, irq=None)}
+TOPOLOGY = {0: {'pkg_id': 0}, 1: {'pkg_id': 0}, 2: {'pkg_id': 1}}
+
+def row_fields(module, n_extra, tail=(), n_base=BASE_FIELDS):
+    header_fmt = "\t".join(["{}"] * (n_base + n_extra))
+    return module.summary_row(header_fmt, "Sys", [0, 1, 2], ROWS, TOPOLOGY, n_extra, tail).split("\t")
+
+def test_summary_row(monitoring):
+    fields = row_fields(monitoring, 3, tail=("7",))
+    assert fields[:8] == ["Sys", "-", "3000.0", "1000.0", "33.33", "3000.0", "2200.0", "2000"] # Idle CPU 2 left out of Bzy_MHz
+    assert fields[8:12] == ["0.00", "1.00", "2.00", "63.33"]
+    assert fields[12:15] == ["61", "N", "70"]
+    assert fields[19:21] == ["180.00", "18.00"] # Each package's watts once
+    assert fields[21:] == ["-", "-", "7"] # srsRAN log counts fill the last extra columns
+
+def test_summary_row_ipc_variant(monitoring_ipc):
+    fields = row_fields(monitoring_ipc, 0, n_base=BASE_FIELDS + 1)
+    assert fields[6:8] == ["2200.0", "1.00"] # IPC follows TSC_MHz
+    assert fields[-2:] == ["180.00", "18.00"]
+
+def test_summary_stats(monitoring):
+    pkg_deltas = [SimpleNamespace(pkg_c2=100, pkg_c6=300, tsc=1000), SimpleNamespace(pkg_c2=None, pkg_c6=100, tsc=1000)]
+    line = monitoring.summary_stats("Sys", [0, 1, 2], ROWS, pkg_deltas)
+    assert line == "Sys:\tMaxBusy%=90.00\tMaxBzy_MHz=3000.0\tMaxIPC=2.00\tBusyCPUs=1.00\tPkg%pc2=10.00\tPkg%pc6=20.00"
+    assert monitoring.summary_stats("Pkg0", [0], ROWS, []).endswith("\tPkg%pc2=-\tPkg%pc6=-")